@@ -0,0 +1,20 @@
+'''
+Micro-benchmarks for parampy.
+
+Run all benchmarks, saving the results and comparing them against a previously
+saved baseline using:
+
+$ python2 -m benchmarks --save results.json --baseline baseline.json
+
+Benchmarks are registered in :mod:`benchmarks.cases` using the :func:`benchmark`
+decorator. Each result records the best and median time per call, and where
+applicable the time relative to a trivial baseline (such as a dictionary lookup),
+which can be compared using `--relative` when baselines were recorded on a
+different machine.
+
+Scaling and memory benchmarks for the sweep backends of :class:`RangesIterator`
+are provided separately in :mod:`benchmarks.sweeps` (`python2 -m benchmarks.sweeps`).
+'''
+from __future__ import absolute_import
+
+from .runner import benchmark, measure, run, save, load, compare, format_comparison, main
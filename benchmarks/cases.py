@@ -0,0 +1,285 @@
+from __future__ import absolute_import
+
+import cPickle as pickle
+
+import numpy as np
+
+from parampy import Parameters, SIUnitDispenser, SIQuantity, Units
+
+from .runner import benchmark
+
+# Dispensers are expensive to construct, and so are shared between benchmarks
+# where their caches do not affect the result.
+ud = SIUnitDispenser()
+
+
+def parameters(**kwargs):
+	p = Parameters(dispenser=ud)
+	p(x=1e23, y=2, z=3, a=1, b=2, c=3, d=2, **kwargs)
+	return p
+
+
+################ BASELINES #####################################################
+
+@benchmark('baseline.lookup', baseline=None)
+def baseline_lookup():
+	q = {'x': 1e23}
+	return lambda: q['x']
+
+
+@benchmark('baseline.function', baseline=None)
+def baseline_function():
+	q = {'x': 1e23}
+	square = lambda x: x ** 2
+	return lambda: square(q['x'])
+
+
+################ EXTRACTION ####################################################
+
+@benchmark('extraction.call')
+def extraction_call():
+	p = parameters()
+	return lambda: p('x')
+
+
+@benchmark('extraction.attr')
+def extraction_attr():
+	p = parameters()
+	return lambda: p.x
+
+
+@benchmark('extraction.scaled')
+def extraction_scaled():
+	p = parameters()
+	return lambda: p._x
+
+
+@benchmark('extraction.united')
+def extraction_united():
+	p = parameters(w=(1, 'nm'))
+	return lambda: p('w')
+
+
+################ OVERRIDES #####################################################
+
+@benchmark('overrides.single')
+def overrides_single():
+	p = parameters()
+	return lambda: p('x', x=1)
+
+
+@benchmark('overrides.many')
+def overrides_many():
+	p = parameters()
+	return lambda: p('x', x=1, y=2, z=3, a=1, b=2, c=3, d=2)
+
+
+@benchmark('overrides.invert')
+def overrides_invert():
+	p = parameters()
+	p << {'w': lambda x, w=None: x ** 2 if w is None else [w ** 0.5]}
+	return lambda: p('x', w=4)
+
+
+################ FUNCTIONS #####################################################
+
+@benchmark('functions.lambda', baseline='baseline.function')
+def functions_lambda():
+	p = parameters()
+	p << {'w': lambda x: x ** 2}
+	return lambda: p('w')
+
+
+@benchmark('functions.override', baseline='baseline.function')
+def functions_override():
+	p = parameters()
+	p << {'w': lambda x: x ** 2}
+	return lambda: p('w', x=10)
+
+
+@benchmark('functions.nested', baseline='baseline.function')
+def functions_nested():
+	p = parameters()
+	p << {'w': lambda x: x ** 2, 'v': lambda w, y: w + y}
+	return lambda: p('v')
+
+
+@benchmark('functions.tabulated', baseline='baseline.function')
+def functions_tabulated():
+	p = parameters(t=0.5)
+	p << {'w': lambda t, y: y * np.sin(t)}
+	p.tabulate('w', t=(0, 1, 1001))
+	return lambda: p('w')
+
+
+@benchmark('functions.argument', baseline='baseline.function')
+def functions_argument():
+	p = parameters()
+	f = p.optimise('x^2')
+	return lambda: p(f)
+
+
+################ SYMPY #########################################################
+
+@benchmark('sympy.parameter', baseline='baseline.function')
+def sympy_parameter():
+	p = parameters()
+	p << {'w': 'x^2'}
+	return lambda: p('w')
+
+
+@benchmark('sympy.expression', baseline='baseline.function')
+def sympy_expression():
+	p = parameters()
+	return lambda: p('x^2 + y')
+
+
+################ BOUNDS ########################################################
+
+@benchmark('bounds.set')
+def bounds_set():
+	p = parameters()
+	p.bounds(x=(0, 10))
+	return lambda: p(x=5)
+
+
+@benchmark('bounds.function')
+def bounds_function():
+	p = parameters()
+	p << {'w': lambda x: x ** 2}
+	p.bounds(x=(0, 10))
+	return lambda: p('w', x=5)
+
+
+################ VALIDATION ####################################################
+
+@benchmark('validation.set')
+def validation_set():
+	p = parameters()
+	return lambda: p(x=5)
+
+
+@benchmark('validation.set_fast', baseline='validation.set')
+def validation_set_fast():
+	p = parameters()
+	p.set_validation('fast')
+	return lambda: p(x=5)
+
+
+@benchmark('validation.unchecked')
+def validation_unchecked():
+	p = parameters()
+	p << {'w': lambda x, t: x * t}
+	p.bounds(w=(0, 10))
+	return lambda: p('x')
+
+
+@benchmark('validation.unchecked_fast', baseline='validation.unchecked')
+def validation_unchecked_fast():
+	p = parameters()
+	p << {'w': lambda x, t: x * t}
+	p.bounds(w=(0, 10))
+	p.set_validation('fast')
+	return lambda: p('x')
+
+
+################ RANGES ########################################################
+
+@benchmark('range.linear')
+def range_linear():
+	p = parameters()
+	return lambda: p.range('x', x=(0, 1, 100))
+
+
+@benchmark('range.function')
+def range_function():
+	p = parameters()
+	p << {'w': lambda x: x ** 2}
+	return lambda: p.range('w', x=(0, 1, 100))
+
+
+################ UNITS #########################################################
+
+@benchmark('units.parse')
+def units_parse():
+	return lambda: Units('kg*m^2/s^2', dispenser=ud)
+
+
+@benchmark('units.parse_cached')
+def units_parse_cached():
+	return lambda: ud('kg*m^2/s^2')
+
+
+@benchmark('units.scale')
+def units_scale():
+	joule, ev = ud('J'), ud('eV')
+	return lambda: joule.scale(ev)
+
+
+@benchmark('units.convert')
+def units_convert():
+	p = parameters()
+	return lambda: p.convert(1.0, 'mT', 'T')
+
+
+@benchmark('units.convert_scaled')
+def units_convert_scaled():
+	p = parameters()
+	p.scaling(length=(1, 'nm'))
+	return lambda: p.convert(1.0, 'nm/s')
+
+
+################ QUANTITIES ####################################################
+
+@benchmark('quantity.add')
+def quantity_add():
+	a, b = SIQuantity(1, 'm'), SIQuantity(1, 'nm')
+	return lambda: a + b
+
+
+@benchmark('quantity.mul')
+def quantity_mul():
+	a, b = SIQuantity(1, 'm'), SIQuantity(2, 's')
+	return lambda: a * b
+
+
+@benchmark('quantity.div')
+def quantity_div():
+	a, b = SIQuantity(1, 'm'), SIQuantity(2, 's')
+	return lambda: a / b
+
+
+@benchmark('quantity.ufunc')
+def quantity_ufunc():
+	a = SIQuantity(4, 'm^2')
+	return lambda: np.sqrt(a)
+
+
+@benchmark('quantity.pickle')
+def quantity_pickle():
+	a = SIQuantity(1, 'nm/s', dispenser=ud)
+	return lambda: pickle.loads(pickle.dumps(a, 2))
+
+
+@benchmark('quantity.ufunc_array')
+def quantity_ufunc_array():
+	a = SIQuantity(np.linspace(0, 1, 1000), 'rad')
+	return lambda: np.cos(a)
+
+
+################ CONSTRUCTION ##################################################
+
+@benchmark('construction.parameters')
+def construction_parameters():
+	return lambda: Parameters(dispenser=ud)
+
+
+@benchmark('construction.dispenser')
+def construction_dispenser():
+	return lambda: SIUnitDispenser()
+
+
+@benchmark('construction.fork')
+def construction_fork():
+	p = parameters()
+	return lambda: p.fork(x=1)
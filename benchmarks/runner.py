@@ -0,0 +1,205 @@
+from __future__ import absolute_import
+
+import datetime
+import fnmatch
+import json
+import platform
+import sys
+from timeit import default_timer as timer
+
+BENCHMARKS = {}
+
+
+def benchmark(name, baseline='baseline.lookup'):
+	'''
+	benchmark(name, baseline='baseline.lookup')
+
+	:param name: The name of the benchmark (conventionally "<group>.<case>").
+	:type name: str
+	:param baseline: The name of the benchmark relative to which this benchmark's time
+		should also be reported (or None).
+	:type baseline: str or None
+
+	A decorator which registers a benchmark. The decorated function is called once to
+	set up the benchmark, and should return a callable (taking no arguments) which is
+	then timed:
+
+	>>> @benchmark('extraction.call')
+		def extraction_call():
+			p = Parameters()
+			p(x=1)
+			return lambda: p('x')
+	'''
+	def register(setup):
+		BENCHMARKS[name] = (setup, baseline)
+		return setup
+	return register
+
+
+def measure(f, repeat=5, min_time=0.1):
+	'''
+	measure(f, repeat=5, min_time=0.1)
+
+	:param f: The callable to time.
+	:type f: callable
+	:param repeat: The number of times to repeat the measurement.
+	:type repeat: int
+	:param min_time: The minimum duration in seconds of each measurement.
+	:type min_time: float
+
+	:returns: A dictionary with the best (`time`) and median (`median`) time per call in seconds
+		across the repeats, along with the number of calls per repeat (`number`) and `repeat`.
+	'''
+	# Calibrate the number of calls per repeat
+	number = 1
+	while True:
+		start = timer()
+		for _ in xrange(number):
+			f()
+		elapsed = timer() - start
+		if elapsed >= min_time or number >= 10 ** 7:
+			break
+		number *= 10 if elapsed < min_time / 10. else 2
+
+	times = []
+	for _ in range(repeat):
+		start = timer()
+		for _ in xrange(number):
+			f()
+		times.append((timer() - start) / number)
+	times.sort()
+
+	return {'time': times[0], 'median': times[len(times) // 2], 'number': number, 'repeat': repeat}
+
+
+def run(patterns=None, repeat=5, min_time=0.1, stream=None):
+	'''
+	run(patterns=None, repeat=5, min_time=0.1, stream=None)
+
+	:param patterns: A list of glob patterns of benchmark names to run (all benchmarks are run if not specified).
+	:type patterns: list of str
+	:param repeat: The number of repeats for each benchmark (see :func:`measure`).
+	:type repeat: int
+	:param min_time: The minimum duration of each repeat (see :func:`measure`).
+	:type min_time: float
+	:param stream: A stream to which progress should be written (or None).
+	:type stream: file
+
+	:returns: A dictionary of results, suitable for saving as JSON.
+	'''
+	from . import cases  # Register benchmarks
+
+	names = sorted(name for name in BENCHMARKS if patterns is None or any(fnmatch.fnmatch(name, pattern) for pattern in patterns))
+
+	results = {}
+	for name in names:
+		setup, _ = BENCHMARKS[name]
+		results[name] = measure(setup(), repeat=repeat, min_time=min_time)
+		if stream is not None:
+			stream.write("%-40s %12.3f us\n" % (name, results[name]['time'] * 1e6))
+			stream.flush()
+
+	for name in names:
+		baseline = BENCHMARKS[name][1]
+		if baseline is not None and baseline in results and baseline != name:
+			results[name]['relative'] = results[name]['time'] / results[baseline]['time']
+
+	return {
+		'meta': {
+			'timestamp': datetime.datetime.now().isoformat(),
+			'python': platform.python_version(),
+			'platform': platform.platform(),
+			'machine': platform.node(),
+		},
+		'benchmarks': results,
+	}
+
+
+def save(results, filename):
+	with open(filename, 'w') as f:
+		json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load(filename):
+	with open(filename) as f:
+		return json.load(f)
+
+
+def compare(results, baseline, tolerance=0.2, key='time', tolerances=None):
+	'''
+	compare(results, baseline, tolerance=0.2, key='time', tolerances=None)
+
+	:param results: The results of :func:`run`.
+	:type results: dict
+	:param baseline: Previously saved results of :func:`run`.
+	:type baseline: dict
+	:param tolerance: The fractional slowdown beyond which a benchmark is considered to have regressed.
+	:type tolerance: float
+	:param key: The statistic to compare; 'time' for absolute times, or 'relative' for times relative
+		to each benchmark's baseline (which is more robust when comparing results from different machines).
+	:type key: str
+	:param tolerances: A dictionary of per-benchmark tolerances (with glob patterns as keys) which
+		take precedence over `tolerance`.
+	:type tolerances: dict
+
+	:returns: A list of dictionaries, one for each benchmark present in both `results` and
+		`baseline`, with keys `name`, `baseline`, `current`, `ratio` and `status` (one of 'ok',
+		'faster' and 'regressed').
+	'''
+	comparisons = []
+	for name in sorted(results['benchmarks']):
+		current = results['benchmarks'][name].get(key)
+		previous = baseline['benchmarks'].get(name, {}).get(key)
+		if current is None or previous is None:
+			continue
+
+		limit = tolerance
+		for pattern, value in (tolerances or {}).items():
+			if fnmatch.fnmatch(name, pattern):
+				limit = value
+
+		ratio = current / previous
+		status = 'regressed' if ratio > 1 + limit else ('faster' if ratio < 1 / (1 + limit) else 'ok')
+		comparisons.append({'name': name, 'baseline': previous, 'current': current, 'ratio': ratio, 'status': status})
+	return comparisons
+
+
+def format_comparison(comparisons, key='time'):
+	scale, unit = (1e6, 'us') if key == 'time' else (1, 'x')
+	lines = ["%-40s %14s %14s %8s  %s" % ("Benchmark", "Baseline (%s)" % unit, "Current (%s)" % unit, "Ratio", "Status")]
+	for c in comparisons:
+		lines.append("%-40s %14.3f %14.3f %8.2f  %s" % (c['name'], c['baseline'] * scale, c['current'] * scale, c['ratio'], c['status'].upper() if c['status'] == 'regressed' else c['status']))
+	return '\n'.join(lines)
+
+
+def main(argv=None):
+	'''
+	Run the benchmarks from the command line. Use `--help` for usage information.
+	Returns an exit code which is non-zero if any benchmark regressed relative to
+	the provided baseline.
+	'''
+	import argparse
+
+	parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Run the parampy micro-benchmarks.')
+	parser.add_argument('patterns', nargs='*', help='Glob patterns of benchmarks to run (default: all).')
+	parser.add_argument('--save', metavar='FILE', help='Save the results as JSON to FILE.')
+	parser.add_argument('--baseline', metavar='FILE', help='Compare the results against the JSON results in FILE.')
+	parser.add_argument('--tolerance', type=float, default=0.2, help='The fractional slowdown considered a regression (default: 0.2).')
+	parser.add_argument('--relative', action='store_true', help='Compare times relative to each benchmark\'s baseline rather than absolute times.')
+	parser.add_argument('--repeat', type=int, default=5, help='The number of repeats of each benchmark (default: 5).')
+	parser.add_argument('--min-time', type=float, default=0.1, help='The minimum duration in seconds of each repeat (default: 0.1).')
+	args = parser.parse_args(argv)
+
+	results = run(args.patterns or None, repeat=args.repeat, min_time=args.min_time, stream=sys.stdout)
+
+	if args.save:
+		save(results, args.save)
+
+	if args.baseline:
+		key = 'relative' if args.relative else 'time'
+		comparisons = compare(results, load(args.baseline), tolerance=args.tolerance, key=key)
+		print
+		print format_comparison(comparisons, key=key)
+		if any(c['status'] == 'regressed' for c in comparisons):
+			return 1
+	return 0
@@ -0,0 +1,200 @@
+'''
+Scaling and memory benchmarks for the parameter sweep backends.
+
+Synthetic workloads are run through each backend of :class:`RangesIterator`
+for every combination of the requested numbers of processes, grid sizes, task
+durations and result sizes, using:
+
+$ python2 -m benchmarks.sweeps --nprocs 1 2 4 --grid 256 --duration 0 0.001 --size 1 10000
+
+Each configuration is run in a freshly forked process, so that the reported peak
+resident set sizes (of the coordinating process, and of all the worker processes
+it spawned) are not polluted by earlier runs. The 'cluster' backend, with local
+worker daemons, stands in for distributed computing using dispy; which is not run
+since it requires dispynode servers.
+'''
+from __future__ import absolute_import
+
+import itertools
+import multiprocessing
+import resource
+import sys
+import time
+from timeit import default_timer as timer
+
+import numpy as np
+
+from .runner import save, load, compare, format_comparison
+
+BACKENDS = ['serial', 'thread', 'process', 'async_once', 'async_pool', 'cluster']
+
+
+def workload(params, duration=0., size=1, sleep=False):
+	'''
+	A synthetic task which takes `duration` seconds (spinning the CPU, or sleeping if
+	`sleep` is `True`), and returns an array of `size` floats.
+	'''
+	if duration > 0:
+		if sleep:
+			time.sleep(duration)
+		else:
+			end = timer() + duration
+			while timer() < end:
+				pass
+	return np.ones(size) * params['x']
+
+
+def get_executor(backend, nprocs):
+	from parampy.utility.executors import SerialExecutor, ThreadExecutor, ProcessExecutor, AsyncExecutor, ClusterExecutor
+	return {
+		'serial': lambda: SerialExecutor(),
+		'thread': lambda: ThreadExecutor(nthreads=nprocs),
+		'process': lambda: ProcessExecutor(nprocs=nprocs),
+		'async_once': lambda: AsyncExecutor(nprocs=nprocs, spawnonce=True),
+		'async_pool': lambda: AsyncExecutor(nprocs=nprocs, spawnonce=False),
+		'cluster': lambda: ClusterExecutor(workers=nprocs),
+	}[backend]()
+
+
+def _in_subprocess(f, *args):
+	'''
+	Run `f(*args)` in a forked process, and return its result along with the peak
+	resident set size (in KB) of the process and of its children.
+	'''
+	def target(queue):
+		try:
+			result = f(*args)
+		except Exception as e:
+			queue.put((False, repr(e), None, None))
+			return
+		queue.put((True, result, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss))
+
+	queue = multiprocessing.Queue()
+	proc = multiprocessing.Process(target=target, args=(queue,))
+	proc.start()
+	success, result, maxrss, maxrss_children = queue.get()
+	proc.join()
+	if not success:
+		raise RuntimeError(result)
+	return result, maxrss, maxrss_children
+
+
+def _sweep(backend, nprocs, grid, duration, size, sleep):
+	from parampy import Parameters
+	from parampy.iteration import RangesIterator
+
+	p = Parameters()
+	p(x=0)
+
+	start = timer()
+	executor = get_executor(backend, nprocs)
+	try:
+		iterator = RangesIterator(p, {'x': (0, 1, grid)}, function=workload, function_kwargs={'duration': duration, 'size': size, 'sleep': sleep}, executor=executor, progress=False)
+		count = 0
+		for _ in iterator:
+			count += 1
+	finally:
+		executor.shutdown()
+	if count != grid:
+		raise RuntimeError("Expected %d results, but received %d." % (grid, count))
+	return timer() - start
+
+
+def _expand(grid):
+	from parampy import Parameters
+	from parampy.iteration import RangesIterator
+
+	p = Parameters()
+	p(x=0, y=0)
+	before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	start = timer()
+	RangesIterator(p, [{'x': (0, 1, grid)}, {'y': (0, 1, grid)}], progress=False).ranges_expand()
+	return timer() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+
+
+def run_sweeps(backends=BACKENDS, nprocs=(1, 2, 4), grids=(256,), durations=(0., 0.001), sizes=(1,), sleep=False, stream=None):
+	'''
+	run_sweeps(backends=BACKENDS, nprocs=(1, 2, 4), grids=(256,), durations=(0., 0.001), sizes=(1,), sleep=False, stream=None)
+
+	:returns: A dictionary of results in the format used by :func:`benchmarks.run`, where
+		for each configuration, `time` is the wall time per task in seconds, `throughput` is the
+		number of tasks completed per second, `efficiency` is the ideal wall time (assuming
+		perfect parallelism and no overhead) divided by the actual wall time, `overhead` is
+		the dispatch overhead per task in seconds (the worker time not spent evaluating the
+		task), and `maxrss`/`maxrss_workers` are the peak resident set sizes in KB of the
+		coordinating process and of the largest worker process.
+	'''
+	results = {}
+	for backend, n, grid, duration, size in itertools.product(backends, nprocs, grids, durations, sizes):
+		if backend == 'serial' and n != nprocs[0]:
+			continue
+		workers = 1 if backend == 'serial' else n
+		wall, maxrss, maxrss_workers = _in_subprocess(_sweep, backend, n, grid, duration, size, sleep)
+		name = 'sweep.%s.n%d.g%d.d%g.s%d' % (backend, workers, grid, duration * 1e3, size)
+		results[name] = {
+			'time': wall / grid,
+			'throughput': grid / wall,
+			'efficiency': grid * duration / workers / wall if duration > 0 else None,
+			'overhead': max(0., wall * workers - grid * duration) / grid,
+			'maxrss': maxrss,
+			'maxrss_workers': maxrss_workers,
+		}
+		if stream is not None:
+			stream.write(format_row(name, results[name]) + '\n')
+			stream.flush()
+
+	for grid in grids:
+		(elapsed, delta), _, _ = _in_subprocess(_expand, grid)
+		name = 'expand.g%dx%d' % (grid, grid)
+		results[name] = {'time': elapsed, 'maxrss_delta': delta}
+		if stream is not None:
+			stream.write("%-44s %12.3f ms %10s %10s %12s %10s MB\n" % (name, elapsed * 1e3, '', '', '', '%.2f' % (delta / 1024.)))
+			stream.flush()
+
+	return {'meta': {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'cpus': multiprocessing.cpu_count()}, 'benchmarks': results}
+
+
+def format_header():
+	return "%-44s %15s %10s %10s %12s %13s %13s" % ("Configuration", "Time/task", "Tasks/s", "Efficiency", "Overhead", "Parent RSS", "Worker RSS")
+
+
+def format_row(name, r):
+	return "%-44s %12.3f ms %10.1f %10s %9.3f ms %10.2f MB %10.2f MB" % (
+		name, r['time'] * 1e3, r['throughput'],
+		'-' if r['efficiency'] is None else '%.1f%%' % (r['efficiency'] * 100),
+		r['overhead'] * 1e3, r['maxrss'] / 1024., r['maxrss_workers'] / 1024.
+	)
+
+
+def main(argv=None):
+	import argparse
+
+	parser = argparse.ArgumentParser(prog='python -m benchmarks.sweeps', description='Run the parampy sweep scaling benchmarks.')
+	parser.add_argument('--backends', nargs='+', default=BACKENDS, choices=BACKENDS, help='The backends to benchmark (default: all).')
+	parser.add_argument('--nprocs', nargs='+', type=int, default=[1, 2, 4], help='The numbers of workers (default: 1 2 4).')
+	parser.add_argument('--grid', nargs='+', type=int, default=[256], help='The numbers of tasks (default: 256).')
+	parser.add_argument('--duration', nargs='+', type=float, default=[0., 0.001], help='The task durations in seconds (default: 0 0.001).')
+	parser.add_argument('--size', nargs='+', type=int, default=[1], help='The numbers of floats returned by each task (default: 1).')
+	parser.add_argument('--sleep', action='store_true', help='Sleep rather than spin for the task duration (simulating I/O bound tasks).')
+	parser.add_argument('--save', metavar='FILE', help='Save the results as JSON to FILE.')
+	parser.add_argument('--baseline', metavar='FILE', help='Compare the results against the JSON results in FILE.')
+	parser.add_argument('--tolerance', type=float, default=0.2, help='The fractional slowdown considered a regression (default: 0.2).')
+	args = parser.parse_args(argv)
+
+	print format_header()
+	results = run_sweeps(args.backends, args.nprocs, args.grid, args.duration, args.size, sleep=args.sleep, stream=sys.stdout)
+
+	if args.save:
+		save(results, args.save)
+
+	if args.baseline:
+		comparisons = compare(results, load(args.baseline), tolerance=args.tolerance)
+		print
+		print format_comparison(comparisons)
+		if any(c['status'] == 'regressed' for c in comparisons):
+			return 1
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -85,3 +85,16 @@ class ScalingUnitInvalidError(ParametersException):
 
 class ScalingDimensionInvalidError(ParametersException):
 	pass
+
+
+# Iteration Errors
+class TaskExecutionError(ParametersException):
+	'''
+	Raised when tasks evaluated by an executor fail. The `failures` attribute is a
+	dictionary mapping the indices of each failed task to a description of its failure
+	(such as the formatted traceback, or a note that the task timed out).
+	'''
+
+	def __init__(self, message, failures=None):
+		ParametersException.__init__(self, message)
+		self.failures = failures if failures is not None else {}
@@ -1,14 +1,11 @@
-import sys
-import resource
-import datetime
-import types
+import itertools
 
 import numpy as np
 
 
 class RangesIterator(object):
 	'''
-	RangesIterator(parameters, ranges, params={}, masks=None, function=None, function_args=(), function_kwargs={}, nprocs=None, distributed=False, ranges_eval=None, progress=True)
+	RangesIterator(parameters, ranges, params={}, masks=None, function=None, function_args=(), function_kwargs={}, nprocs=None, distributed=False, ranges_eval=None, progress=True, checkpoint=None, cache=None, executor=None, telemetry=None, batch=None, cost_model=None)
 
 	:class:`RangesIterator` is a python iterable object, which allows one to easily
 	iterate over a potentially multidimensional space of parameters. It also has
@@ -39,8 +36,28 @@ class RangesIterator(object):
 	:param progress: `True` if progress should be shown, and `False` otherwise. This can also
 		be a callable object taking arguments `total`, `completed` and `start_time`, which
 		are the total number of indices to compute, the number completed computations,
-		and the start time computed using `datetime.datetime.now()`.
+		and the start time computed using `datetime.datetime.now()`. Progress is reported
+		at most once a second.
 	:type progress: bool or callable
+	:param checkpoint: An (optional) directory name or :class:`SweepCheckpoint` instance in which
+		to store the results of the sweep as they are computed, and from which to resume the sweep.
+	:type checkpoint: None, str or SweepCheckpoint
+	:param cache: `None` if results should not be cached, and otherwise `True`, a directory name or a
+		:class:`ResultCache` instance in which results should be cached across sweeps.
+	:type cache: None, bool, str or ResultCache
+	:param executor: The (optional) name of the backend to use to evaluate :func:`function`, or an
+		:class:`Executor` instance. If not specified, the backend is chosen based on `nprocs` and `distributed`.
+	:type executor: None, str or Executor
+	:param telemetry: An (optional) :class:`Telemetry` instance in which to collect statistics
+		about the evaluation of each task.
+	:type telemetry: None or Telemetry
+	:param batch: The (optional) number of parameter configurations to pass to :func:`function` at
+		once, as arrays, for functions which are vectorised over the parameters being swept.
+	:type batch: None or int
+	:param cost_model: `None` if tasks should be dispatched in the order of their indices, and otherwise
+		`True` or a :class:`CostModel` instance which should learn the cost of each task, and be used
+		to dispatch the most expensive tasks first.
+	:type cost_model: None, bool or CostModel
 
 	Constructing a RangesIterator instance:
 		In its simplest form, initialising a :class:`RangesIterator` looks like:
@@ -66,6 +83,13 @@ class RangesIterator(object):
 		is also valid:
 		>>> ranges = [{'x':(0,10,11),'k':(1,2,11)},{'y':(0,10,11)}]
 
+		Parameters at the same level can also be sampled jointly from the box spanned by
+		their ranges, using a Latin hypercube ('lhs'), quasi-random ('sobol' or 'halton') or
+		random ('random') design (see :func:`Parameters.range`). For example, the following
+		explores a three dimensional box using 200 points, rather than a grid of 200^3:
+
+		>>> ranges = [{'x':(0,10,200,'sobol'),'k':(1,2,200,'sobol'),'y':(0,10,200,'sobol')}]
+
 	Iterating over a RangesIterator instance:
 		To iterate over the possible parameter configurations, you use the regular
 		iteration sytax:
@@ -100,6 +124,20 @@ class RangesIterator(object):
 		If :python:`function_kwargs` is specified, then the function provided
 		will be evaluated with the additional kwargs present in that dictionary.
 
+	Collecting results into an array:
+		If :func:`function` returns numpy data of a fixed shape, you can have the
+		results assembled directly into an array with shape `ranges_eval.shape + shape`
+		using :func:`collect`, rather than iterating over the results:
+
+		>>> results = iterator.collect(shape=(3,))
+
+	Adaptive refinement:
+		Rather than evaluating the function on a dense grid, it is possible to
+		evaluate it on a coarse grid, and to then only refine the grid where the function
+		changes rapidly, using :func:`refine`:
+
+		>>> ranges_eval, results = iterator.refine(tolerance=0.1, levels=4)
+
 	Multithreading:
 		By default, if :python:`function` is provided, :python:`RangesIterator`
 		will spawn up to *N* parallel subprocesses to evaluate the function in different
@@ -117,11 +155,93 @@ class RangesIterator(object):
 		servers. To enable this (which takes precedence over the above multithreading), simply
 		set `distributed` to `True` or a dictionary of arguments to pass on to `dispy.JobCluster`. 
 
+	Executors:
+		The backend used to evaluate :func:`function` can be chosen explicitly using
+		`executor`, which can be one of:
+			- 'serial': Evaluate the function in the current process.
+			- 'thread': Evaluate the function in `nprocs` threads.
+			- 'process': Evaluate the function in `nprocs` persistent forked processes.
+			- 'async': Evaluate the function in a newly forked process for every index (the default when `nprocs` is not `0` or `1`).
+			- 'dispy': Evaluate the function on dispynode servers (the default when `distributed` is set).
+			- 'cluster': Evaluate the function in worker daemons connected over TCP (`nprocs` of which are spawned locally).
+
+		Alternatively, an :class:`Executor` instance can be passed, which allows the backend
+		to be configured, and to be reused across multiple sweeps. For example, to distribute
+		tasks to worker daemons on other hosts (see :class:`ClusterExecutor`):
+
+		>>> executor = ClusterExecutor(address=('0.0.0.0', 6000), authkey='secret')
+		>>> RangesIterator(p, ranges, function=f, executor=executor)
+
+		Executors passed in this way are not shut down after iteration.
+
+	I/O bound functions:
+		If the function spends most of its time waiting (for example, on a solver run
+		in a subprocess, or on file or network I/O), there is no need for a process per
+		task. Using the 'thread' executor, a single process can keep many evaluations in
+		flight at once, with :python:`nprocs` acting as the concurrency limit:
+
+		>>> for indices, result in RangesIterator(p, ranges, function=run_solver, executor='thread', nprocs=200):
+				# Results are yielded as the evaluations finish.
+
+		Note that the function is then called concurrently from multiple threads, and so
+		must be threadsafe.
+
+	Telemetry:
+		Statistics about every task (wall time, queue wait, worker and worker memory usage),
+		along with rate-limited summaries of the sweep (throughput and estimated time remaining),
+		can be delivered to pluggable sinks by passing a :class:`Telemetry` instance:
+
+		>>> histogram = HistogramSink()
+		>>> iterator = RangesIterator(p, ranges, function=f, telemetry=Telemetry(sinks=[histogram, JSONLinesSink('sweep.jsonl')]))
+		>>> results = iterator.collect()
+		>>> histogram.percentile(95)
+		0.0125
+
+		See :class:`Telemetry` for more details.
+
+	Batched evaluation:
+		If :func:`function` is vectorised over the parameters being swept, the overhead of
+		calling it (and of dispatching it to a worker) once per parameter configuration can
+		be avoided by setting `batch` to the number of configurations to evaluate per call.
+		The function is then passed :python:`params` in which the values of the swept
+		parameters are arrays of length (at most) `batch`, and the parameters of the
+		background context are unchanged. It must return a sequence (such as an array)
+		of results, the first axis of which corresponds to the configurations.
+
+		>>> def f(params):
+				return params['x'] * params['y']
+		>>> for indices, result in RangesIterator(p, ranges, function=f, batch=1000):
+				# Results are still yielded one configuration at a time.
+
+		Batches are evaluated by every executor in the same way as individual tasks, and so
+		telemetry (and progress) then counts batches rather than configurations.
+
+	Cost-aware scheduling:
+		When the cost of evaluating :func:`function` varies across the parameter space (for
+		example, with the size of a system), dispatching tasks in the order of their indices
+		clusters the expensive tasks together, and the sweep ends with a few workers busy on
+		them while the rest are idle. If `cost_model` is `True` (or a :class:`CostModel`
+		instance), the duration of every task is recorded, and a model of the cost of a task
+		as a function of the swept parameters is learned. Subsequent sweeps dispatch the tasks
+		predicted to be most expensive first (longest-processing-time first), and when
+		`batch` is set, cheap configurations are grouped into larger batches than
+		expensive ones. The model can be seeded, and the wall time of the sweep estimated,
+		by evaluating a small pilot sample of the configurations:
+
+		>>> iterator = RangesIterator(p, ranges, function=f, nprocs=8, cost_model=True)
+		>>> iterator.estimate(samples=20)
+		{'tasks': 10000, 'samples': 20, 'workers': 8, 'cost': 5012.3, 'wall_time': 627.1}
+		>>> results = iterator.collect()
+
+		Durations are only reported by the 'serial', 'thread', 'process' and 'cluster'
+		executors, and so the model is only refined by sweeps which use them (though it is
+		used for scheduling by all executors).
+
 	Masking:
 		If you do not want the parameters or evaluated function at all possible
 		cartesian products of the input ranges, then it is possible to use
 		boolean masking functions. This is useful, for example, when wanting continue
-		a previously started sweep.
+		a previously started sweep (though see also the section on checkpointing below).
 
 		Masks should be callable objects with a signature of:
 		:code:`<mask_name>(indices, ranges=None, params={})`
@@ -133,9 +253,41 @@ class RangesIterator(object):
 
 		At runtime, the current indices in question are passed as indices, along
 		with the range specifications and current parameter context.
+
+	Checkpointing:
+		Long sweeps can be made resumable by passing a directory name (or a
+		:class:`SweepCheckpoint` instance) as `checkpoint`:
+
+		>>> iterator = RangesIterator(p, ranges, function=f, checkpoint='sweep_results')
+
+		Each result is then appended to an on-disk store as soon as it is received,
+		along with the :func:`ranges_eval` of the sweep. If the sweep is interrupted and
+		restarted with the same checkpoint, the stored :func:`ranges_eval` is reused and
+		indices which have already been computed are skipped; such that iterating
+		yields only the newly computed results. A `ValueError` is raised if the ranges or
+		parameter context differ from those of the stored sweep (masks may differ). Previously computed results can be streamed
+		from disk using:
+
+		>>> for indices, result in iterator.checkpoint.results():
+				# Do something here
+
+		:func:`collect` takes both previously and newly computed results into account.
+
+	Result caching:
+		When sweeps overlap (for example, when a grid is refined), it is wasteful to
+		recompute the function at the points which have already been evaluated.
+		If `cache` is `True`, a directory name, or a :class:`ResultCache` instance, then
+		the result of every evaluation is stored in a content-addressed on-disk cache,
+		keyed on the function and the arguments passed to it. Before dispatching a task,
+		the cache is consulted, and if a result is found it is returned immediately without
+		the function being evaluated.
+
+		>>> iterator = RangesIterator(p, ranges, function=f, cache=True)
+
+		See :class:`ResultCache` for more details (including how to invalidate results).
 	'''
 
-	def __init__(self, parameters, ranges, params={}, masks=None, function=None, function_args=(), function_kwargs={}, nprocs=None, distributed=False, ranges_eval=None, progress=True):
+	def __init__(self, parameters, ranges, params={}, masks=None, function=None, function_args=(), function_kwargs={}, nprocs=None, distributed=False, ranges_eval=None, progress=True, checkpoint=None, cache=None, executor=None, telemetry=None, batch=None, cost_model=None):
 		self.p = parameters
 		self.ranges = ranges
 		self.function = function
@@ -147,6 +299,12 @@ class RangesIterator(object):
 		self.distributed = distributed
 		self.ranges_eval = ranges_eval
 		self.progress = progress
+		self.checkpoint = checkpoint
+		self.cache = cache
+		self.executor = executor
+		self.telemetry = telemetry
+		self.batch = batch
+		self.cost_model = cost_model
 
 	@property
 	def p(self):
@@ -193,8 +351,8 @@ class RangesIterator(object):
 		return self.__function
 	@function.setter
 	def function(self, function):
-		if not isinstance(function, (types.NoneType, types.FunctionType, types.MethodType)):
-			raise ValueError("`function` must be a function or a method.")
+		if function is not None and not callable(function):
+			raise ValueError("`function` must be a callable object (such as a function or a method).")
 		self.__function = function
 
 	@property
@@ -296,7 +454,12 @@ class RangesIterator(object):
 		        [(1.0, 3.0), (1.0, 4.0)]],
 		       dtype=[('x', '<f8'), ('y', '<f8')]), [(0, 0), (0, 1), (1, 0), (1, 1)])
 		'''
-		return self.__ranges_expand(masks=self.masks, params=self.params.copy(), ranges_eval=self.__ranges_eval)
+		ranges_eval = self.__ranges_eval
+		if ranges_eval is None and self.checkpoint is not None:
+			ranges_eval = self.checkpoint.ranges_eval
+			if ranges_eval is not None:
+				self.__checkpoint_check(ranges_eval)
+		return self.__ranges_expand(masks=self.masks, params=self.params.copy(), ranges_eval=ranges_eval)
 
 	@property
 	def progress(self):
@@ -316,6 +479,175 @@ class RangesIterator(object):
 	def progress(self, progress):
 		self.__progress = progress
 
+	@property
+	def checkpoint(self):
+		'''
+		The :class:`SweepCheckpoint` instance used to store the results of the sweep
+		(or None if checkpointing is disabled).
+
+		You can change the checkpoint using:
+
+		>>> iterator.checkpoint = <None, directory name or SweepCheckpoint instance>
+		'''
+		return self.__checkpoint
+	@checkpoint.setter
+	def checkpoint(self, checkpoint):
+		if isinstance(checkpoint, str):
+			from .utility.checkpoint import SweepCheckpoint
+			checkpoint = SweepCheckpoint(checkpoint)
+		self.__checkpoint = checkpoint
+
+	@property
+	def cache(self):
+		'''
+		The :class:`ResultCache` instance used to cache the results of :func:`function`
+		(or None if caching is disabled).
+
+		You can change the cache using:
+
+		>>> iterator.cache = <None, True, directory name or ResultCache instance>
+		'''
+		return self.__cache
+	@cache.setter
+	def cache(self, cache):
+		if cache is True or isinstance(cache, str):
+			from .utility.cache import ResultCache
+			cache = ResultCache(None if cache is True else cache)
+		self.__cache = cache if cache is not False else None
+
+	@property
+	def executor(self):
+		'''
+		The name of the backend used to evaluate :func:`function`, an :class:`Executor`
+		instance, or None if the backend should be chosen based on :func:`nprocs` and
+		:func:`distributed`.
+
+		You can change the executor using:
+
+		>>> iterator.executor = <None, executor name or Executor instance>
+		'''
+		return self.__executor
+	@executor.setter
+	def executor(self, executor):
+		from .utility.executors import Executor, EXECUTORS
+		if not (executor is None or isinstance(executor, Executor) or executor in EXECUTORS):
+			raise ValueError("`executor` must be None, an Executor instance or one of: %s." % ', '.join(sorted(EXECUTORS)))
+		self.__executor = executor
+
+	@property
+	def telemetry(self):
+		'''
+		The :class:`Telemetry` instance in which statistics about the sweep are collected
+		(or None).
+
+		You can change the telemetry using:
+
+		>>> iterator.telemetry = <None or Telemetry instance>
+		'''
+		return self.__telemetry
+	@telemetry.setter
+	def telemetry(self, telemetry):
+		self.__telemetry = telemetry
+
+	@property
+	def batch(self):
+		'''
+		The number of parameter configurations passed to :func:`function` per call (or None,
+		if the function is called once per configuration). See "Batched evaluation" above.
+
+		You can change the batch size using:
+
+		>>> iterator.batch = <None or int>
+		'''
+		return self.__batch
+	@batch.setter
+	def batch(self, batch):
+		if batch is not None and (int(batch) != batch or batch < 1):
+			raise ValueError("`batch` must be None or a positive integer.")
+		self.__batch = None if batch is None else int(batch)
+
+	@property
+	def cost_model(self):
+		'''
+		The :class:`CostModel` instance used to learn the cost of tasks and schedule them (or
+		None if tasks are dispatched in the order of their indices). See "Cost-aware
+		scheduling" above.
+
+		You can change the cost model using:
+
+		>>> iterator.cost_model = <None, True or CostModel instance>
+		'''
+		return self.__cost_model
+	@cost_model.setter
+	def cost_model(self, cost_model):
+		if cost_model is True:
+			from .utility.costs import CostModel
+			cost_model = CostModel()
+		self.__cost_model = cost_model if cost_model is not False else None
+
+	def __get_telemetry(self, total, sinks=()):
+		'''
+		Return the :class:`Telemetry` instance to use for a run of `total` tasks (including
+		a sink for progress reporting if required, and any additional `sinks`), or None if
+		no telemetry is required.
+		'''
+		from .utility.telemetry import Telemetry, ProgressSink, CallbackSink
+
+		progress = self.progress
+		sinks = list(sinks)
+		if progress is True:
+			sinks.append(ProgressSink())
+		elif progress is not False and progress is not None:
+			sinks.append(CallbackSink(lambda summary: progress(summary['total'], summary['completed'], summary['start_time'])))
+
+		telemetry = self.telemetry
+		if telemetry is None:
+			if len(sinks) == 0:
+				return None
+			telemetry = Telemetry()
+		telemetry.start(total, sinks=sinks)
+		return telemetry
+
+	def __get_executor(self):
+		'''
+		Return a two-tuple of the executor to use, and whether it was created for
+		this iteration (in which case it should be shut down after use).
+		'''
+		from .utility.executors import Executor, EXECUTORS, worker_count
+
+		executor = self.executor
+		if isinstance(executor, Executor):
+			return executor, False
+		if executor is None:
+			if self.distributed not in (None, False):
+				executor = 'dispy'
+			elif self.nprocs not in [0, 1]:
+				executor = 'async'
+			else:
+				executor = 'serial'
+
+		kwargs = {
+			'thread': {'nthreads': self.nprocs},
+			'process': {'nprocs': self.nprocs},
+			'async': {'nprocs': self.nprocs},
+			'dispy': {} if self.distributed in (None, False, True) else self.distributed,
+			'cluster': {'workers': worker_count(self.nprocs)},
+		}.get(executor, {})
+		return EXECUTORS[executor](**kwargs), True
+
+	def __shared_memory(self):
+		'''
+		Return `True` if the function is evaluated in threads or forked processes of the
+		current process, such that shared memory allocated beforehand is visible to it.
+		'''
+		executor = self.executor
+		if executor is None:
+			return self.distributed in (None, False)
+		if isinstance(executor, str):
+			from .utility.executors import EXECUTORS
+			executor = EXECUTORS[executor]
+		return executor.shared_memory
+
 	def __ranges_expand(self, level=0, iteration=tuple(), masks=None, indices=None, params=None, ranges_eval=None):
 		'''
 		This method generates a list of different parameter configurations
@@ -382,7 +714,10 @@ class RangesIterator(object):
 			ranges_eval.fill(np.nan)
 		else:
 			final_shape = ranges_eval.shape + (size,)
-			ranges_eval = np.array(np.repeat(ranges_eval, size).reshape(final_shape), dtype=ranges_eval.dtype.descr + dtype_delta)
+			extended = np.zeros(final_shape, dtype=ranges_eval.dtype.descr + dtype_delta)
+			for label in ranges_eval.dtype.names:
+				extended[label] = np.repeat(ranges_eval[label], size).reshape(final_shape)
+			ranges_eval = extended
 		for label in labels:
 			ranges_eval[label].fill(np.nan)
 		return ranges_eval
@@ -395,6 +730,13 @@ class RangesIterator(object):
 			params[param] = vs[i]
 		return params
 
+	def __batch_to_dict(self, batch, ranges_eval):
+		values = ranges_eval[tuple(np.array(batch).T)]
+		params = {}
+		for param in ranges_eval.dtype.names:
+			params[param] = values[param]
+		return params
+
 	def __get_params_for_index(self, index, ranges_eval):
 		params = self.params.copy()
 		params.update(self.__index_to_dict(index, ranges_eval))
@@ -402,60 +744,394 @@ class RangesIterator(object):
 
 	def __iter__(self):
 		ranges_eval, indices = self.ranges_expand()
+		return self.__results(ranges_eval, indices)
 
-		start_time = datetime.datetime.now()
-		if self.distributed not in (None, False) and  self.function is not None:
-			try:
-				from .utility.symmetric import DistributedParallelMap
-			except:
-				raise RuntimeError("The `dispy` module is required for distributed iteration.")
-			
-			cluster_kwargs = {} if self.distributed is True else self.distributed
-			dpm = DistributedParallelMap(self.function, progress=self.progress, **cluster_kwargs)
-			
-			for res in dpm.iterate([(i, self.function_args, {'params':self.__get_params_for_index(i, ranges_eval)}) for i in indices], count_offset=0, count_total=len(indices), start_time=start_time, base_kwargs=self.function_kwargs):
+	def __results(self, ranges_eval, indices):
+		'''
+		Yield two-tuples of indices and results for the provided indices, taking
+		into account the checkpoint and result cache (if any).
+		'''
+		if self.checkpoint is None:
+			for res in self.__iterate_cached(ranges_eval, indices):
 				yield res
-			
-		elif self.nprocs not in [0, 1] and self.function is not None:
-			from .utility.symmetric import AsyncParallelMap
-			apm = AsyncParallelMap(self.function, progress=self.progress, nprocs=self.nprocs, spawnonce=True)
+			return
+
+		try:
+			for index, result in self.__iterate_cached(ranges_eval, self.__checkpoint_pending(ranges_eval, indices)):
+				self.checkpoint.append(index, result)
+				yield (index, result)
+		finally:
+			self.checkpoint.close()
 
-			for res in apm.iterate([(i, self.function_args, {'params':self.__get_params_for_index(i, ranges_eval)}) for i in indices], count_offset=0, count_total=len(indices), start_time=start_time, base_kwargs=self.function_kwargs):
+	def __checkpoint_pending(self, ranges_eval, indices):
+		'''
+		Store ranges_eval in the checkpoint if it is not already present, and
+		return the indices which have not yet been computed.
+		'''
+		if self.checkpoint.ranges_eval is None:
+			self.checkpoint.ranges_eval = ranges_eval
+			self.checkpoint.sweep = self.__checkpoint_sweep()
+		completed = self.checkpoint.completed
+		return [index for index in indices if index not in completed]
+
+	def __checkpoint_sweep(self):
+		from .utility.checkpoint import describe
+		return describe({'ranges': self.ranges, 'params': self.params})
+
+	def __checkpoint_check(self, ranges_eval):
+		'''
+		Raise a ValueError if the ranges_eval (and description) of the sweep stored in
+		the checkpoint are inconsistent with the ranges and parameter context of this sweep.
+		'''
+		names = set(name for pam_ranges in self.ranges for name in pam_ranges)
+		if ranges_eval.ndim != len(self.ranges) or set(ranges_eval.dtype.names or ()) != names:
+			raise ValueError("The checkpoint at '%s' stores a sweep over %s with shape %s, which is inconsistent with the current ranges. Use a new checkpoint for a different sweep." % (self.checkpoint.path, ', '.join(sorted(ranges_eval.dtype.names or ())), ranges_eval.shape))
+		sweep = self.checkpoint.sweep
+		if sweep is not None and sweep != self.__checkpoint_sweep():
+			raise ValueError("The checkpoint at '%s' stores a sweep with different ranges or parameter context. Use a new checkpoint for a different sweep." % self.checkpoint.path)
+
+	def __iterate_cached(self, ranges_eval, indices):
+		'''
+		Yield results from the result cache where possible, and evaluate the
+		remaining indices; storing their results in the cache.
+		'''
+		if self.cache is None or self.function is None:
+			for res in self.__iterate(ranges_eval, indices):
 				yield res
+			return
+
+		keys = {}
+		pending = []
+		for index in indices:
+			key = self.cache.key(self.function, self.__get_params_for_index(index, ranges_eval), self.function_args, self.function_kwargs)
+			hit, result = self.cache.get(key)
+			if hit:
+				yield (index, result)
+			else:
+				keys[index] = key
+				pending.append(index)
+
+		for index, result in self.__iterate(ranges_eval, pending):
+			self.cache.set(keys[index], result)
+			yield (index, result)
+
+	def __schedule(self, ranges_eval, indices):
+		'''
+		Return the list of tasks (indices, or tuples of indices if batching) to submit for
+		the provided `indices`, in the order in which they should be dispatched.
+		'''
+		costs = None
+		if self.cost_model is not None and ranges_eval.ndim > 0:
+			costs = self.cost_model.predict(ranges_eval[tuple(np.array(indices).T)])
+
+		if costs is None:
+			if self.batch is None:
+				return list(indices)
+			return [tuple(indices[i:i + self.batch]) for i in range(0, len(indices), self.batch)]
+
+		from .utility.costs import lpt_order, cost_chunks
+		if self.batch is None:
+			return [indices[i] for i in lpt_order(costs)]
+		return [tuple(indices[i] for i in chunk) for chunk in cost_chunks(costs, self.batch)]
+
+	def __iterate(self, ranges_eval, indices, function=None, pass_indices=False, executor=None):
+		'''
+		Evaluate `function` (or :func:`function` if not specified) in the parameter
+		context of each of the provided `indices`, yielding two-tuples of the indices and
+		the result. If `pass_indices` is `True`, the indices are passed as the first
+		positional argument to the function. If `executor` is specified, it is used
+		instead of the executor of this iterator.
+		'''
+		if function is None:
+			function = self.function
+
+		if len(indices) == 0:
+			return
+
+		if function is None:
+			telemetry = self.__get_telemetry(len(indices))
+			for index in indices:
+				yield (index, self.__index_to_dict(index, ranges_eval))
+				if telemetry is not None:
+					telemetry.record(index)
+			return
+
+		tasks = self.__schedule(ranges_eval, indices)
+		get_params = self.__index_to_dict if self.batch is None else self.__batch_to_dict
+		sinks = [] if self.cost_model is None else [self.cost_model.sink(ranges_eval, batch=self.batch is not None)]
+		telemetry = self.__get_telemetry(len(tasks), sinks=sinks)
+
+		executor, owned = (executor, False) if executor is not None else self.__get_executor()
+		executor.function = function
+		executor.telemetry = telemetry
+		# The base parameter context is sent to the workers once, and so tasks need only
+		# carry the values of the parameters being swept.
+		executor.context = (tuple(self.function_args), dict(self.function_kwargs, params=self.params))
+		try:
+			for task in tasks:
+				executor.submit(task, (task,) if pass_indices else (), {'params': get_params(task, ranges_eval)})
+
+			for task, result in executor.iterate():
+				if self.batch is None:
+					yield (task, result)
+					continue
+				if result is None or len(result) != len(task):
+					raise ValueError("Batched functions must return a sequence with one result for each of the %d parameter configurations passed to them." % len(task))
+				for index, value in zip(task, result):
+					yield (index, value)
+		finally:
+			executor.telemetry = None
+			if owned:
+				executor.shutdown()
+
+	def collect(self, shape=(), dtype=float, filename=None, fill=None):
+		'''
+		collect(shape=(), dtype=float, filename=None, fill=None)
+
+		:param shape: The shape of the (numpy) result returned by :func:`function` at each index.
+		:type shape: tuple or int
+		:param dtype: The numpy dtype of the results.
+		:type dtype: numpy.dtype or type
+		:param filename: An (optional) filename at which to store the output using `numpy.memmap`.
+		:type filename: None or str
+		:param fill: The value used for indices which were not computed (due to masking). Defaults
+			to `nan` for floating point and complex types, and `0` otherwise.
+		:type fill: object
+
+		:returns: A numpy.ndarray (or numpy.memmap) of shape `ranges_eval.shape + shape` containing
+			the result of :func:`function` at each of the computed indices.
+
+		When :func:`function` returns fixed-shape numpy data, it is much more efficient
+		to have the results written directly into a preallocated output array than to
+		iterate over the results and copy them manually. The output array is allocated
+		in shared memory (or as a memory mapped file if `filename` is provided), and the
+		worker processes write their results directly into it; avoiding the need to send
+		the results back to the parent process.
+
+		For example:
+
+		>>> iterator = RangesIterator(p, [{'x':(0,1,11)},{'y':(0,1,11)}], function=lambda params: np.ones(3)*params['x'])
+		>>> iterator.collect(shape=3).shape
+		(11, 11, 3)
+
+		Note that when the executor does not share memory with the current process (such as
+		when distributed computing), or when checkpointing or result caching is enabled,
+		the results must be sent back to the parent process, and are then copied into the
+		output array.
+		'''
+		from .utility.symmetric import shared_array
+
+		if self.function is None:
+			raise ValueError("A `function` must be specified in order to collect its results.")
+
+		if isinstance(shape, int):
+			shape = (shape,)
+
+		ranges_eval, indices = self.ranges_expand()
+
+		output = shared_array(ranges_eval.shape + tuple(shape), dtype=dtype, filename=filename)
+		if fill is None:
+			fill = np.nan if np.issubdtype(output.dtype, np.inexact) else 0
+		output.fill(fill)
+
+		if self.checkpoint is not None:
+			self.checkpoint.assemble(output=output)
+
+		if self.checkpoint is not None or self.cache is not None or not self.__shared_memory():
+			for index, result in self.__results(ranges_eval, indices):
+				output[index] = result
+		else:
+			function = self.function
+
+			def assign(index, *args, **kwargs):
+				if self.batch is None:
+					output[index] = function(*args, **kwargs)
+				else:  # The index is then a batch of indices
+					output[tuple(np.array(index).T)] = function(*args, **kwargs)
+					return [None] * len(index)
+
+			for _ in self.__iterate(ranges_eval, indices, function=assign, pass_indices=True):
+				pass
+
+		if isinstance(output, np.memmap):
+			output.flush()
+
+		return output
+
+	def estimate(self, samples=10, workers=None, seed=None):
+		'''
+		estimate(samples=10, workers=None, seed=None)
+
+		:param samples: The number of parameter configurations to evaluate in the pilot sample.
+		:type samples: int
+		:param workers: The number of workers over which the sweep will be distributed. Defaults to
+			the number implied by :func:`nprocs`.
+		:type workers: None or int
+		:param seed: The (optional) seed used to choose the pilot sample.
+		:type seed: None or int
+
+		:returns: A dictionary with keys `tasks` (the number of configurations to be evaluated),
+			`samples` (the number of configurations in the pilot sample), `workers`, `cost` (the
+			predicted total duration of all tasks in seconds) and `wall_time` (the predicted
+			wall time of the sweep in seconds).
+
+		Evaluate :func:`function` serially in the current process for a random pilot sample of
+		the configurations of the sweep (excluding those already stored in the checkpoint),
+		record their durations in the :func:`cost_model` (which is created if necessary), and
+		estimate the total wall time of the sweep when dispatched using cost-aware scheduling.
+		The results of the pilot sample are discarded.
+		'''
+		from .utility.costs import lpt_makespan
+		from .utility.executors import SerialExecutor, worker_count
+
+		if self.function is None:
+			raise ValueError("A `function` must be specified in order to estimate the cost of a sweep.")
+		if self.cost_model is None:
+			self.cost_model = True
+		if workers is None:
+			workers = 1 if self.nprocs in [0, 1] else worker_count(self.nprocs)
+
+		ranges_eval, indices = self.ranges_expand()
+		if self.checkpoint is not None:
+			completed = self.checkpoint.completed
+			indices = [index for index in indices if index not in completed]
+
+		pilot = np.random.RandomState(seed).permutation(len(indices))[:samples]
+		for _ in self.__iterate(ranges_eval, [indices[i] for i in sorted(pilot)], executor=SerialExecutor()):
+			pass
+
+		costs = None
+		if len(indices) > 0 and ranges_eval.ndim > 0:
+			costs = self.cost_model.predict(ranges_eval[tuple(np.array(indices).T)])
+		if costs is None:
+			costs = np.zeros(len(indices))
+
+		if self.batch is None:
+			task_costs = costs
 		else:
-			for i, index in enumerate(indices):
-				if self.function is None:
-					yield (index, self.__index_to_dict(index, ranges_eval))
-				else:
-					yield (index, self.function(params=self.__index_to_dict(index, ranges_eval), **self.function_kwargs))
-				if self.progress is not False:
-					if self.progress is True:
-						self.__print_progress_fallback(len(indices), i + 1, start_time)
-					else:
-						self.progress(len(indices), i + 1, start_time)
-
-	def __print_progress_fallback(self, total, completed, start_time):
-		progress = float(completed) / total
-
-		sys.stderr.write("\r %3d%% | %d of %d | Memory usage: %.2f MB" % (
-								progress * 100,
-								completed,
-								total,
-								resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.)
-						)
-
-		if progress > 0:
-			delta = datetime.datetime.now() - start_time
-			delta = datetime.timedelta(delta.total_seconds() / 24 / 3600 * (1 - progress) / progress)
-			sys.stderr.write(" | Remaining: %02dd:%02dh:%02dm:%02ds" % (
-					delta.days,
-					delta.seconds / 3600,
-					delta.seconds / 60 % 60,
-					delta.seconds % 60
-				)
-			)
-
-		if total == completed:
-			sys.stderr.write('\n')
-
-		sys.stderr.flush()
+			positions = dict((index, i) for i, index in enumerate(indices))
+			task_costs = [sum(costs[positions[index]] for index in task) for task in self.__schedule(ranges_eval, indices)]
+		return {
+			'tasks': len(indices),
+			'samples': len(pilot),
+			'workers': workers,
+			'cost': float(np.sum(costs)),
+			'wall_time': float(lpt_makespan(task_costs, workers)),
+		}
+
+	def refine(self, tolerance, levels=3, distance=None):
+		'''
+		refine(tolerance, levels=3, distance=None)
+
+		:param tolerance: The maximum allowed change in the output of :func:`function` across a cell.
+		:type tolerance: float
+		:param levels: The maximum number of times a cell will be subdivided.
+		:type levels: int
+		:param distance: An (optional) callable taking two results and returning the magnitude of
+			their difference. Defaults to the maximum absolute difference of the results.
+		:type distance: callable
+
+		:returns: A two-tuple of the refined `ranges_eval`, and a dictionary of results with indices into
+			the refined `ranges_eval` as keys.
+
+		Rather than evaluating :func:`function` on a dense grid everywhere, this method
+		evaluates it on the grid described by :func:`ranges`, and then recursively subdivides
+		the cells of the grid (the hypercubes formed by adjacent indices) across which the
+		output changes by more than `tolerance`. At each level of refinement, the grid
+		spacing is halved; with the new coordinates being the midpoints of the non-dimensional
+		values in `ranges_eval`. Only the corners of the subdivided cells are evaluated, and so
+		features such as sharp steps can be resolved with a fraction of the evaluations required
+		for a uniformly dense grid.
+
+		For example:
+
+		>>> iterator = RangesIterator(p, {'x':(0,1,11)}, function=lambda params: float(params['x'] > 0.33))
+		>>> ranges_eval, results = iterator.refine(tolerance=0.5, levels=4)
+		>>> ranges_eval.shape
+		(161,)
+		>>> len(results)
+		15
+
+		Note that masks are only applied to the initial grid, and that checkpointing is
+		not supported (since the indices change as the grid is refined), though results
+		are cached if result caching is enabled.
+		'''
+		if self.function is None:
+			raise ValueError("A `function` must be specified in order to refine a sweep.")
+		if self.checkpoint is not None:
+			raise ValueError("Adaptive refinement does not support checkpointing.")
+
+		if distance is None:
+			distance = lambda a, b: np.max(np.abs(np.asarray(a) - np.asarray(b)))
+
+		ranges_eval, indices = self.ranges_expand()
+		results = dict(self.__results(ranges_eval, indices))
+
+		cells = list(itertools.product(*[range(max(n - 1, 1)) for n in ranges_eval.shape]))
+		for level in range(levels):
+			flagged = [cell for cell in cells if self.__cell_variation(cell, ranges_eval.shape, results, distance) > tolerance]
+			if len(flagged) == 0:
+				break
+
+			ranges_eval = self.__refine_ranges_eval(ranges_eval)
+			results = dict((tuple(2 * i for i in index), result) for index, result in results.items())
+
+			offsets = list(itertools.product(*[(0, 1) if n > 1 else (0,) for n in ranges_eval.shape]))
+			cells = [tuple(2 * c + o for c, o in zip(cell, offset)) for cell in flagged for offset in offsets]
+
+			pending = set()
+			for cell in cells:
+				for offset in offsets:
+					corner = tuple(c + o for c, o in zip(cell, offset))
+					if corner not in results:
+						pending.add(corner)
+
+			results.update(self.__results(ranges_eval, sorted(pending)))
+
+		return ranges_eval, results
+
+	def __cell_variation(self, cell, shape, results, distance):
+		'''
+		Return the maximum distance between the results at the corners of a cell that
+		share an edge, or `0` if any of the corners have not been evaluated.
+		'''
+		offsets = list(itertools.product(*[(0, 1) if n > 1 else (0,) for n in shape]))
+		corners = [tuple(c + o for c, o in zip(cell, offset)) for offset in offsets]
+		if any(corner not in results for corner in corners):
+			return 0
+
+		variation = 0
+		for corner in corners:
+			for axis in range(len(shape)):
+				if shape[axis] > 1 and corner[axis] == cell[axis]:
+					neighbour = corner[:axis] + (corner[axis] + 1,) + corner[axis + 1:]
+					variation = max(variation, distance(results[corner], results[neighbour]))
+		return variation
+
+	def __refine_ranges_eval(self, ranges_eval):
+		'''
+		Return a new ranges_eval with points inserted at the midpoints of all adjacent
+		points along all axes.
+		'''
+		for axis in range(ranges_eval.ndim):
+			n = ranges_eval.shape[axis]
+			if n < 2:
+				continue
+			shape = list(ranges_eval.shape)
+			shape[axis] = 2 * n - 1
+			refined = np.zeros(shape, dtype=ranges_eval.dtype)
+
+			even = [slice(None)] * ranges_eval.ndim
+			even[axis] = slice(0, None, 2)
+			odd = [slice(None)] * ranges_eval.ndim
+			odd[axis] = slice(1, None, 2)
+			lower = [slice(None)] * ranges_eval.ndim
+			lower[axis] = slice(0, -1)
+			upper = [slice(None)] * ranges_eval.ndim
+			upper[axis] = slice(1, None)
+
+			for label in ranges_eval.dtype.names:
+				refined[label][tuple(even)] = ranges_eval[label]
+				refined[label][tuple(odd)] = (ranges_eval[label][tuple(lower)] + ranges_eval[label][tuple(upper)]) / 2.
+			ranges_eval = refined
+		return ranges_eval
@@ -0,0 +1,127 @@
+import collections
+
+
+class LayeredDict(collections.MutableMapping):
+	'''
+	LayeredDict(parent)
+
+	:class:`LayeredDict` is a dictionary which stores only the differences between
+	itself and a parent dictionary, and which delegates the lookup of all other keys
+	to the parent. It is used by :func:`Parameters.fork` so that forked
+	:class:`Parameters` instances share the (potentially large) state of their parent.
+
+	:param parent: A callable which returns the current parent dictionary (or None if
+		the parent is empty). A callable is used, rather than the dictionary itself, so
+		that the parent dictionary can be replaced without invalidating its children.
+	:type parent: callable
+
+	Assigned keys are stored in a local layer, and deleted keys which exist in the
+	parent are masked; so that the parent is never modified. For example:
+
+	>>> parent = {'x': 1, 'y': 2}
+	>>> d = LayeredDict(lambda: parent)
+	>>> d['x'] = 3
+	>>> del d['y']
+	>>> dict(d), parent
+	({'x': 3}, {'x': 1, 'y': 2})
+	'''
+
+	def __init__(self, parent):
+		self.__parent = parent
+		self.__local = {}
+		self.__masked = set()
+
+	@property
+	def parent(self):
+		'''
+		The current parent dictionary.
+		'''
+		parent = self.__parent()
+		return parent if parent is not None else {}
+
+	def is_local(self, key):
+		'''
+		is_local(key)
+
+		:returns: `True` if `key` has been assigned or deleted in the local layer, and `False` if
+			its lookup is delegated to the parent.
+		'''
+		return key in self.__local or key in self.__masked
+
+	@property
+	def overrides(self):
+		'''
+		The set of keys which have been assigned or deleted in the local layer.
+		'''
+		return set(self.__local) | self.__masked
+
+	def mask(self, key):
+		'''
+		mask(key)
+
+		Remove `key` from the local layer, and hide any value for it in the parent (now
+		or in the future) until it is next assigned.
+		'''
+		self.__local.pop(key, None)
+		self.__masked.add(key)
+
+	def __getitem__(self, key):
+		local = self.__local
+		if key in local:
+			return local[key]
+		if key in self.__masked:
+			raise KeyError(key)
+		parent = self.__parent()
+		if parent is None:
+			raise KeyError(key)
+		return parent[key]
+
+	def get(self, key, default=None):
+		local = self.__local
+		if key in local:
+			return local[key]
+		if key in self.__masked:
+			return default
+		parent = self.__parent()
+		return default if parent is None else parent.get(key, default)
+
+	def __contains__(self, key):
+		if key in self.__local:
+			return True
+		return key not in self.__masked and key in self.parent
+
+	def __setitem__(self, key, value):
+		self.__local[key] = value
+
+	def __delitem__(self, key):
+		if key not in self:
+			raise KeyError(key)
+		self.__local.pop(key, None)
+		if key in self.parent:
+			self.__masked.add(key)
+
+	def __iter__(self):
+		for key in self.__local:
+			yield key
+		for key in self.parent:
+			if key not in self.__local and key not in self.__masked:
+				yield key
+
+	def __len__(self):
+		return sum(1 for _ in self)
+
+	def copy(self):
+		'''
+		copy()
+
+		:returns: A new :class:`LayeredDict` with the same parent, and a copy of the local layer.
+		'''
+		copied = LayeredDict(self.__parent)
+		copied.__local = self.__local.copy()
+		copied.__masked = self.__masked.copy()
+		return copied
+
+	__copy__ = copy
+
+	def __repr__(self):
+		return "LayeredDict(%r)" % dict(self)
@@ -2,6 +2,10 @@ from . import errors
 from . import physical_constants
 from .definitions import SIUnitDispenser
 from .iteration import RangesIterator
+from .layered import LayeredDict
+from .profiling import ParametersProfiler
+from .sampling import JOINT_SAMPLERS
+from .tabulation import TabulatedFunction
 from .quantities import Quantity
 from .text import colour_text
 from .units import Units, Unit
@@ -16,10 +20,13 @@ import sympy.abc
 import types
 import warnings
 
+# The attribute names of (subclasses of) Parameters, which cannot be used to access parameters
+RESERVED_NAMES = {}
+
 
 class Parameters(object):
 	"""
-	Parameters(dispenser=None, default_scaled=True, constants=False)
+	Parameters(dispenser=None, default_scaled=True, constants=False, validation='normal')
 
 	:class:`Parameters` is the main class in the :mod:`parameters` package, and
 	acts to organise and manage potentially interdependent physical quantities.
@@ -45,6 +52,9 @@ class Parameters(object):
 	:type default_scaled: bool
 	:param constants: :python:`True` when Parameters should import the physical constants when the internal :class:`UnitDispenser` is of type :class:`SIUnitDispenser`. :python:`False` otherwise.
 	:type constants: bool
+	:param validation: The level of validation performed when parameters are set and retrieved;
+		one of 'strict', 'normal' or 'fast'. See :func:`validation`.
+	:type validation: str
 
 	Initialising a Parameters Instance:
 		Initialising a :class:`Parameters` instance with the default configuration is simple:
@@ -284,6 +294,16 @@ class Parameters(object):
 		Note that parameters that are dependent on other parameters will not survive
 		this transition, and will be saved as static values.
 
+	Validation and Warnings:
+		By default, the names of parameters are validated whenever they are set, and
+		each distinct warning (such as a :class:`ParameterBoundsUncheckedWarning`) is only
+		issued the first time it occurs. Once a model has been validated, these checks can
+		be skipped in performance critical code using:
+
+		>>> p.set_validation('fast')
+
+		For more information, see the documentation for :func:`validation`.
+
 	Parameter Contexts:
 		Parameters objects support Python's "with" syntax. Upon exiting a "with"
 		environment, any changes made will be reset to before re-entering the
@@ -294,7 +314,7 @@ class Parameters(object):
 		>>> p('x') # Returns value of x before entering the with environment.
 	"""
 
-	def __init__(self, dispenser=None, default_scaled=True, constants=False):
+	def __init__(self, dispenser=None, default_scaled=True, constants=False, validation='normal'):
 		self.__parameters_spec = {}
 		self.__parameters = {}
 		self.__parameters_bounds = None
@@ -302,13 +322,24 @@ class Parameters(object):
 		self.__units = dispenser if dispenser is not None else SIUnitDispenser()
 		self.__units_custom = []
 		self.__default_scaled = default_scaled
+		self.set_validation(validation)
+		self.__warning_counts = {}
 
 		self.__cache_deps = {}
 		self.__cache_sups = {}
 		self.__cache_scaled = {}
+		self.__cache_united = {}
 		self.__cache_funcs = {}
+		self.__cache_views = {}
 
 		self.__scaling_cache = {}
+		self.__scaling_basis = None
+
+		self.__tables = {}
+
+		self.__parent = None
+		self.__parent_generation = None
+		self.__generation = 0
 
 		if constants and isinstance(self.__units, SIUnitDispenser):
 			self(**physical_constants.constants)
@@ -353,6 +384,7 @@ class Parameters(object):
 			unit = Unit(*args, **kwargs)
 		self.__units.add(unit)
 		self.__units_custom.append(unit)
+		self.__scaling_basis = None
 	
 	def set_units_context(self, *name, **params):
 		self.__units.set_context(*name,**params)
@@ -361,6 +393,78 @@ class Parameters(object):
 	def units_context(self):
 		return self.__units.context
 
+	VALIDATION_LEVELS = ('strict', 'normal', 'fast')
+
+	@property
+	def validation(self):
+		'''
+		The level of validation performed by this :class:`Parameters` instance, which is
+		one of:
+
+		- 'strict': The names of parameters are validated whenever they are set, parameter
+		  names which conflict with the attributes of :class:`Parameters` raise a
+		  :class:`ParameterInvalidError`, and every warning is issued (even if it has
+		  been issued before).
+		- 'normal': The names of parameters are validated whenever they are set, and each
+		  distinct warning is issued only once.
+		- 'fast': The names of parameters are not validated, and each distinct warning
+		  is issued only once.
+
+		Warnings that are not issued are nevertheless counted in :func:`warning_counts`.
+		To change the validation level, use :func:`set_validation`.
+		'''
+		return self.__validation
+
+	def set_validation(self, validation):
+		'''
+		set_validation(validation)
+
+		:param validation: The level of validation; one of 'strict', 'normal' or 'fast'.
+		:type validation: str
+
+		This method sets the level of validation (see :func:`validation`). For example,
+		once a model has been set up and checked, validation can be skipped using:
+
+		>>> p.set_validation('fast')
+		'''
+		if validation not in self.VALIDATION_LEVELS:
+			raise ValueError("Invalid validation level '%s'. Must be one of: %s." % (validation, ', '.join(self.VALIDATION_LEVELS)))
+		self.__validation = validation
+
+	@property
+	def warning_counts(self):
+		'''
+		A dictionary of the number of times that each distinct warning has occurred,
+		with (category, message) two-tuples as keys. For example:
+
+		>>> p.warning_counts
+		{(ParameterBoundsUncheckedWarning, "Parameter 'y' might be outside bounds. Insufficient parameters passed to check."): 1000}
+
+		The counts (and so also the record of which warnings have been issued) can be
+		reset using :func:`reset_warnings`.
+		'''
+		return self.__warning_counts.copy()
+
+	def reset_warnings(self):
+		'''
+		reset_warnings()
+
+		Forget all previously issued warnings, such that they will be issued again if
+		they occur.
+		'''
+		self.__warning_counts = {}
+
+	def __warn(self, category, message):
+		'''
+		Issue a warning of type `category`, unless (when the validation level is not
+		'strict') an identical warning has already been issued.
+		'''
+		key = (category, message)
+		count = self.__warning_counts.get(key, 0)
+		self.__warning_counts[key] = count + 1
+		if count == 0 or self.__validation == 'strict':
+			warnings.warn(category(message))
+
 	def scaling(self, *args, **kwargs):
 		'''
 		scaling(*args, **kwargs)
@@ -394,7 +498,11 @@ class Parameters(object):
 		>>> p._( (1,'s') )
 		1 s
 		'''
-		self.__scaling_cache = {}
+		if len(kwargs) > 0:  # Non-dimensional values depend upon the scaling
+			self.__scaling_cache = {}
+			self.__scaling_basis = None
+			self.__cache_scaled = {}
+			self.__generation += 1
 
 		for arg in kwargs:
 			if arg in self.__units.dimensions:
@@ -442,6 +550,48 @@ class Parameters(object):
 			return r[params[0]]
 		return r
 
+	def nondimensionalise(self, values, units=None):
+		'''
+		nondimensionalise(values, units=None)
+
+		:param values: A sequence of values, or (if :python:`units` is not specified) a sequence of (value, unit) pairs.
+		:type values: array-like
+		:param units: A unit for all of the values, or a sequence of units with one unit for each value.
+		:type units: None, str, Units or sequence of str/Units
+
+		:returns: A :class:`numpy.ndarray` of the non-dimensional values.
+
+		This method non-dimensionalises an entire table of values in one pass, which is
+		much faster than converting each value separately when rescaling large models
+		(for example, after changing the scaling using :func:`scaling`). The scalings of
+		the distinct units are computed together from the scale of each dimension, and
+		the values are then divided by their scalings in a single `numpy` operation.
+
+		>>> p.scaling(length=(1, 'nm'))
+		>>> p.nondimensionalise([(1, 'nm'), (2, 'm'), (3, 'm/s')])
+		array([  1.00000000e+00,   2.00000000e+09,   3.00000000e+09])
+		>>> p.nondimensionalise([1, 2, 3], 'nm')
+		array([ 1.,  2.,  3.])
+
+		The results are identical to those of :python:`p.convert(value, unit)` for each
+		value.
+		'''
+		if units is None:
+			if len(values) == 0:
+				return np.array([], dtype=float)
+			values, units = zip(*values)
+		values = np.asarray(values)
+
+		if isinstance(units, (str, Units)):
+			return values / self.__unit_scaling(units)
+		if len(units) != len(values):
+			raise ValueError("There must be exactly one unit for each value.")
+
+		distinct = {}
+		indices = np.array([distinct.setdefault(unit, len(distinct)) for unit in units], dtype=int)
+		distinct = sorted(distinct, key=distinct.get)
+		return values / self.__unit_scalings(distinct)[indices]
+
 	def __get_unit(self, unit):
 
 		if isinstance(unit, str):
@@ -491,7 +641,109 @@ class Parameters(object):
 		self.__cache_deps = {}
 		self.__cache_sups = {}
 		self.__cache_scaled = {}
+		self.__cache_united = {}
+		self.__cache_views = {}
+		self.__scaling_cache = {}
+		self.__scaling_basis = None
+		if self.__parent is not None:
+			self.__fork_caches()
+		self.__generation += 1
+
+	################## FORKING #############################################
+
+	def fork(self, **overrides):
+		'''
+		fork(**overrides)
+
+		:param overrides: Parameter values to set in the fork (as in :python:`p(**overrides)`).
+		:type overrides: dict
+
+		:returns: A new :class:`Parameters` instance which is a fork of this instance.
+
+		Forks are lightweight variants of a :class:`Parameters` instance, which store only
+		the changes made to them (such as the `overrides` passed to this method), and which
+		delegate everything else to their parent. This makes it cheap to maintain many
+		scenarios which differ from a base model in a handful of parameters:
+
+		>>> p = Parameters()
+		>>> p(x=1, y=(2, 'm'), z=lambda x, y: x * y)
+		>>> scenarios = [p.fork(x=x) for x in range(1000)]
+		>>> scenarios[10]('z')
+		20.0
+
+		The memory used by a fork is proportional to the number of changes made to it,
+		and the cached values of the parent are shared by its forks for the parameters
+		which have not been changed in them. Forks see subsequent changes made to
+		their parent (including those made to its scalings and bounds), unless the
+		same parameter has been changed in the fork; but changes made to a fork
+		never affect its parent. Forks can themselves be forked.
+
+		Note that forks share the unit dispenser of their parent, and so units added
+		using :func:`unit_add` are shared. Tabulated function parameters (see
+		:func:`tabulate`) are replaced with their original functions in forks, since
+		their inputs may differ from those of the parent.
+		'''
+		parent = self
+		forked = Parameters(dispenser=self.__units, default_scaled=self.__default_scaled, validation=self.__validation)
+		forked.__parent = self
+		forked.__parent_generation = self.__sync()
+		forked.__parameters = LayeredDict(lambda: parent.__parameters)
+		forked.__parameters_spec = LayeredDict(lambda: parent.__parameters_spec)
+		forked.__parameters_bounds = LayeredDict(lambda: parent.__parameters_bounds)
+		forked.__scalings = LayeredDict(lambda: parent.__scalings)
+		forked.__cache_funcs = dict.fromkeys(self.__cache_funcs)
+		forked.__fork_caches()
+
+		for param, (tabulated, lookup, _) in self.__tables.items():
+			if self.__parameters.get(param) is lookup:
+				forked.__parameters[param] = tabulated.function
+
+		if overrides:
+			forked(**overrides)
+		return forked
+
+	@property
+	def parent(self):
+		'''
+		The :class:`Parameters` instance from which this instance was forked (or None).
+		See :func:`fork`.
+		'''
+		return self.__parent
+
+	def __fork_caches(self):
+		'''
+		Reset the caches of a forked instance, such that the cached values of the parent
+		are used for parameters which have not been changed in this instance.
+		'''
+		parent = self.__parent
+		self.__cache_deps = {}
+		self.__cache_sups = {}
+		self.__cache_united = LayeredDict(lambda: parent.__cache_united)
+		self.__cache_views = LayeredDict(lambda: parent.__cache_views)
+		if len(self.__scalings.overrides) == 0:
+			self.__cache_scaled = LayeredDict(lambda: parent.__cache_scaled)
+		else:  # Non-dimensional values differ from those of the parent
+			self.__cache_scaled = {}
 		self.__scaling_cache = {}
+		self.__scaling_basis = None
+		for cached in self.__cache_funcs:
+			self.__cache_funcs[cached] = None
+		for param in self.__parameters.overrides | self.__parameters_spec.overrides:
+			self.__clear_cache(param)
+
+	def __sync(self):
+		'''
+		Return the generation of this instance, which changes whenever values cached
+		by forks of this instance may have become stale; after first resetting the caches
+		of this instance if it is a fork whose parent has changed.
+		'''
+		if self.__parent is not None:
+			generation = self.__parent.__sync()
+			if generation != self.__parent_generation:
+				self.__parent_generation = generation
+				self.__fork_caches()
+				self.__generation += 1
+		return self.__generation
 
 	############# PARAMETER RESOLUTION #########################################
 	def __get_pam_name(self, param):
@@ -548,6 +800,9 @@ class Parameters(object):
 		Retrieve the parameters specified in args, with temporary values overriding
 		defaults as in kwargs. Parameters are returned as Quantity's.
 		'''
+		if self.__parent is not None:
+			self.__sync()
+
 		self.__process_override(kwargs)
 
 		arg_islist = type(args[0]) == list
@@ -588,7 +843,7 @@ class Parameters(object):
 						if check:
 							self.__get_param(pam, kwargs)
 						else:
-							warnings.warn(errors.ParameterBoundsUncheckedWarning("Parameter '%s' might be outside bounds. Insufficient parameters passed to check." % pam))
+							self.__warn(errors.ParameterBoundsUncheckedWarning, "Parameter '%s' might be outside bounds. Insufficient parameters passed to check." % pam)
 
 	def __get_params(self, args, kwargs={}, default_scaled=None):
 		rv = {}
@@ -623,15 +878,17 @@ class Parameters(object):
 			elif type(self.__parameters[arg]) is types.FunctionType:
 				return self.__get_quantity(self.__eval_function(arg, kwargs)[arg], param=arg, scaled=scaled)
 
-			# Otherwise, return the value currently stored in the parameters
+			# Otherwise, return the value currently stored in the parameters (from cache if possible)
 			else:
-				if scaled:
-					try:
-						return self.__cache_scaled[arg]
-					except:
-						self.__cache_scaled[arg] = self.__get_quantity(self.__parameters[arg], param=arg, scaled=scaled)
-						return self.__cache_scaled[arg]
-				return self.__get_quantity(self.__parameters[arg], param=arg, scaled=scaled)
+				cache = self.__cache_scaled if scaled else self.__cache_united
+				try:
+					return cache[arg]
+				except:
+					value = self.__get_quantity(self.__parameters[arg], param=arg, scaled=scaled)
+					if isinstance(value, np.ndarray):  # Cached arrays are shared, and so must not be modified
+						value.flags.writeable = False
+					cache[arg] = value
+					return cache[arg]
 
 	def __process_override(self, kwargs, restrict=None):
 		'''
@@ -722,7 +979,7 @@ class Parameters(object):
 							raise errors.ParameterOverSpecifiedError("Parameter %s is overspecified, with contradictory values. (%s vs. %s)" % (key,vals[key],kwargs[key] if key in kwargs else new[key]) )
 					new.update(vals)
 				else:
-					warnings.warn(errors.ParameterInconsistentWarning("Parameters are possibly inconsistent! The function representing '%s' was overridden because it was not invertable, and so the underlying variables (%s) have not been updated." % (pam, ','.join(self.__function_getargs(self.__parameters[pam])))))
+					self.__warn(errors.ParameterInconsistentWarning, "Parameters are possibly inconsistent! The function representing '%s' was overridden because it was not invertable, and so the underlying variables (%s) have not been updated." % (pam, ','.join(self.__function_getargs(self.__parameters[pam]))))
 
 		if len(new) != 0:
 			kwargs.update(new)
@@ -754,6 +1011,12 @@ class Parameters(object):
 		params = self.__get_params(deps_, kwargs)
 		args = [val for val in [params[self.__get_pam_name(x)] for x in deps_]]
 
+		# Tables are only valid for the stored values of inputs other than the independent parameter
+		if param in self.__tables and len(kwargs) > 0:
+			tabulated, lookup, inputs = self.__tables[param]
+			if f is lookup and not inputs.isdisjoint(kwargs):
+				f = tabulated.function
+
 		if param in kwargs: # Invert and return updated parameter values
 			r = f(*args)
 			if type(r) not in (list,tuple):
@@ -821,6 +1084,28 @@ class Parameters(object):
 			if kwarg not in self.__cache_funcs and cache_on:
 				self.__cache_funcs[kwarg] = None
 
+	def profile(self):
+		'''
+		profile()
+
+		:returns: A :class:`ParametersProfiler` context manager.
+
+		A utility function to find out where time is spent when parameters are
+		resolved. Within the returned context, calls to the internal phases of
+		parameter resolution (Quantity construction, unit scaling, function evaluation,
+		override processing, bounds checking, sympy parsing, etc.) are counted and timed,
+		along with the time spent resolving each parameter, and the hit rates of
+		the internal caches. The results are available upon exiting the context:
+
+		>>> with p.profile() as profiler:
+				p('z', x=2)
+		>>> print profiler.report.table(sort='self')
+
+		Profiling is implemented by temporarily wrapping internal methods, and so
+		there is no overhead when the context is not active.
+		'''
+		return ParametersProfiler(self)
+
 	def __get_quantity(self, value, param=None, unit=None, scaled=False):
 		'''
 		Return a Quantity or scaled float associated with the value provided
@@ -842,10 +1127,10 @@ class Parameters(object):
 						raise errors.QuantityCoercionError("Tuple specifications of quantities must be of form (<value>,<unit>). Was provided with %s ." % str(value))
 					else:
 						q = Quantity(value[0], value[1], dispenser=self.__units)
-						q = q.value / self.__unit_scaling(q.units)
+						q = self.__scale_value(q.value, self.__unit_scaling(q.units), inverse=True)
 
 				elif isinstance(value, Quantity):
-					q = value.value / self.__unit_scaling(value.units)
+					q = self.__scale_value(value.value, self.__unit_scaling(value.units), inverse=True)
 
 				else:  # if t in (float,complex,long,int,np.ndarray):
 					q = value
@@ -871,7 +1156,7 @@ class Parameters(object):
 						unit = self.__get_unit(''  if self.__parameters_spec.get(param) is None else self.__parameters_spec.get(param))
 					if isinstance(value, list):
 						value = np.array(value)
-					q = Quantity(value * self.__unit_scaling(unit), unit, dispenser=self.__units)
+					q = Quantity(self.__scale_value(value, self.__unit_scaling(unit)), unit, dispenser=self.__units)
 
 		if q is None:
 			raise errors.QuantityValueError("Unknown value type '%s' with value: '%s'" % (t, value))
@@ -881,6 +1166,15 @@ class Parameters(object):
 
 		return q
 
+	def __scale_value(self, value, scaling, inverse=False):
+		'''
+		Return `value` multiplied (or divided, if `inverse` is `True`) by `scaling`,
+		avoiding a copy of floating point arrays when the scaling is trivial.
+		'''
+		if scaling == 1 and isinstance(value, np.ndarray) and value.dtype.kind in 'fc':
+			return value
+		return value / scaling if inverse else value * scaling
+
 	def __eval(self, arg, kwargs={}, default_scaled=None):
 
 		if default_scaled is None:
@@ -925,37 +1219,98 @@ class Parameters(object):
 		return re.match("^[%sA-Za-z][_a-zA-Z0-9]*$" % ('_' if allow_leading_underscore else ''), param)
 
 	def __check_valid_params(self, params, allow_leading_underscore=True):
+		if self.__validation == 'fast':
+			return
+		pattern = re.compile("^[%sA-Za-z][_a-zA-Z0-9]*$" % ('_' if allow_leading_underscore else ''))
 		bad = []
 		for param in params:
-			if not self.__is_valid_param(param, allow_leading_underscore=allow_leading_underscore):
+			if not pattern.match(param):
 				bad.append(param)
 		if len(bad) > 0:
 			raise errors.ParameterInvalidError("Attempt to set invalid parameters: %s . Parameters must be valid python identifiers matching ^[%sA-Za-z][_a-zA-Z0-9]*$." % (','.join(bad), '_' if allow_leading_underscore else ''))
 
-	def __set(self, kwargs):
+	def __set(self, kwargs, validate='each'):
+
+		if self.__parent is not None:
+			self.__sync()
 
 		self.__cache_deps = {}
 		self.__cache_sups = {}
 
 		self.__check_valid_params(kwargs, allow_leading_underscore=False)
 
+		# If `validate` is 'once', all new functions are validated (with a single check for recursion
+		# over the graph of function parameters) before any parameters are set.
+		functions = {}
+		if validate == 'once':
+			for param, val in kwargs.items():
+				if isinstance(val, (types.FunctionType, str)):
+					functions[param] = self.__check_function(param, self.__get_function(val), recurse=False)
+				elif isinstance(val, (list, tuple)) and isinstance(val[0], (types.FunctionType, str)):
+					functions[param] = self.__check_function(param, self.__get_function(val[0]), recurse=False)
+			self.__check_function_graph(functions, kwargs)
+
+		reserved = self.__reserved_names()
+		if self.__validation == 'strict':
+			conflicts = [param for param in kwargs if param in reserved]
+			if len(conflicts) > 0:
+				raise errors.ParameterInvalidError("Parameters %s conflict with method names of Parameters, and so would not be accessible using attribute notation." % ','.join(conflicts))
+
 		for param, val in kwargs.items():
 			if param in self.__cache_funcs:
 				self.__cache_funcs[param] = None
-			if param in self.__cache_scaled:  # Clear cache if present.
-				del self.__cache_scaled[param]
+			self.__clear_cache(param)
 			if isinstance(val, (types.FunctionType, str)):
-				self.__parameters[param] = self.__check_function(param, self.__get_function(val))
+				self.__parameters[param] = functions[param] if param in functions else self.__check_function(param, self.__get_function(val))
 				self.__spec({param: self.__get_unit('')})
 			elif isinstance(val, (list, tuple)) and isinstance(val[0], (types.FunctionType, str)):
-				self.__parameters[param] = self.__check_function(param, self.__get_function(val[0]))
+				self.__parameters[param] = functions[param] if param in functions else self.__check_function(param, self.__get_function(val[0]))
 				self.__spec({param: self.__get_unit(val[1])})
 			else:
-				self.__parameters[param] = self.__get_quantity(val, param=param)
+				self.__parameters[param] = self.__store_array(self.__get_quantity(val, param=param), source=val)
 				if isinstance(self.__parameters[param], Quantity):
 					self.__spec({param: self.__parameters[param].units})
-			if param in dir(type(self)):
-				warnings.warn(errors.ParameterNameWarning("Parameter '%s' will not be accessible using the attribute notation `p.%s`, as it conflicts with a method name of Parameters." % (param, param)))
+			if param in reserved:
+				self.__warn(errors.ParameterNameWarning, "Parameter '%s' will not be accessible using the attribute notation `p.%s`, as it conflicts with a method name of Parameters." % (param, param))
+
+	def __reserved_names(self):
+		'''
+		Returns the (cached) set of attribute names of the class of this instance, which
+		cannot be accessed as parameters using attribute notation.
+		'''
+		cls = type(self)
+		if cls not in RESERVED_NAMES:
+			RESERVED_NAMES[cls] = frozenset(dir(cls))
+		return RESERVED_NAMES[cls]
+
+	def __clear_cache(self, param):
+		'''
+		Clear the cached values of the stored (non-function) parameter `param`.
+		'''
+		self.__generation += 1
+		for cache in (self.__cache_scaled, self.__cache_united, self.__cache_views):
+			if isinstance(cache, LayeredDict):  # The parent may cache its own value later
+				cache.mask(param)
+			elif param in cache:
+				del cache[param]
+
+	def __store_array(self, value, source=None):
+		'''
+		Take ownership of the array underlying an array-valued Quantity (copying it
+		only if its memory is shared with `source`), and mark it as read-only; such
+		that the stored array can be returned by reference when it is retrieved.
+		'''
+		if not isinstance(value, Quantity) or not isinstance(value.value, np.ndarray) or value.value.ndim == 0:
+			return value
+		if source is not None:
+			if isinstance(source, Quantity):
+				source = source.value
+			elif isinstance(source, tuple):
+				source = source[0]
+			if isinstance(source, np.ndarray) and np.may_share_memory(value.value, source):
+				value = Quantity(value.value.copy(), value.units, absolute=value.absolute, dispenser=self.__units)
+		value.value.flags.writeable = False
+		return value
 
 	def __update(self, kwargs):
 
@@ -967,22 +1322,53 @@ class Parameters(object):
 			if param not in self.__parameters or not (isinstance(self.__parameters.get(param), types.FunctionType) and param in self.__get_pam_deps(param)):
 				self.__set({param: kwargs[param]})
 
+	def update_many(self, parameters, validate='once'):
+		'''
+		update_many(parameters, validate='once')
+
+		:param parameters: A dictionary of parameter values (including functions) with names as keys.
+		:type parameters: dict
+		:param validate: Either 'once', in which case all functions are validated in a single
+			pass over the graph of function parameters before any are set; or 'each', in which case
+			each function is validated (along with the functions upon which it depends) as it is set.
+		:type validate: str
+
+		:returns: A reference to the parent :class:`Parameters` instance.
+
+		This method sets many parameters at once without interpretation (as for the left shift
+		operator), and is the preferred way to load large parameter profiles. When `validate`
+		is 'once', the cost of validation is linear in the size of the graph of function parameters,
+		and a recursive definition is detected before any parameters are changed.
+
+		>>> p.update_many({'x': 1, 'y': 'x^2', 'z': lambda y: 2 * y})
+		'''
+		if validate not in ('once', 'each'):
+			raise ValueError("Validation mode must be either 'once' or 'each', not '%s'." % validate)
+		if not isinstance(parameters, dict):
+			raise errors.ParametersException("Parameters must be provided as a dictionary, not '%s'." % type(parameters))
+		self.__set(parameters, validate=validate)
+		return self
+
 	def __and__(self, other):
 		if not isinstance(other, dict):
 			raise errors.ParametersException("The binary and operator is used to set the unit specification for parameters; and requires a dictionary of units.")
 		for param, units in other.items():
 			if isinstance(self.__parameters.get(param), Quantity):
-				self.__parameters[self.__get_pam_name(param)] = self.__get_param(self.__get_pam_united_name(param))(units)
+				self.__parameters[self.__get_pam_name(param)] = self.__store_array(self.__get_param(self.__get_pam_united_name(param))(units))
 		self.__spec(other)
 
 	def __spec(self, kwargs):
 		''' Set units for parameters. '''
 		for arg in kwargs:
+			self.__clear_cache(arg)
 			self.__parameters_spec[arg] = self.__get_unit(kwargs[arg])
 			if self.__parameters.get(arg) is not None:
+				if isinstance(self.__parameters[arg], Quantity) and isinstance(self.__parameters, LayeredDict) and not self.__parameters.is_local(arg):
+					self.__parameters[arg] = copy.copy(self.__parameters[arg])  # The Quantity is shared with the parent
 				self.__parameters[arg].units = self.__parameters_spec[arg]
 
 	def __remove(self, param):
+		self.__clear_cache(param)
 		if param in self.__parameters:
 			del self.__parameters[param]
 		if param in self.__parameters_spec:
@@ -1025,7 +1411,7 @@ class Parameters(object):
 			return expr
 		return self.__sympy_to_function(expr)
 
-	def __check_function(self, param, f, forbidden=None):
+	def __check_function(self, param, f, forbidden=None, recurse=True):
 
 		_param = '_' + param
 
@@ -1039,6 +1425,9 @@ class Parameters(object):
 		if param not in inspection.args and _param not in inspection.args and inspection.defaults != None:
 			raise ValueError("Cannot add parameter function that provides default values for parameters in '%s'." % param)
 
+		if not recurse:
+			return f
+
 		args = list(self.__function_getargs(f))
 
 		if param in args:
@@ -1058,6 +1447,43 @@ class Parameters(object):
 
 		return f
 
+	def __check_function_graph(self, functions, kwargs={}):
+		'''
+		Check that setting the function parameters in `functions` (along with the other
+		parameters in `kwargs`) would not result in recursion, using a single depth-first
+		search over the graph of function parameters.
+		'''
+		def deps(param):
+			if param in functions:
+				f = functions[param]
+			elif param in kwargs:
+				return []
+			else:
+				f = self.__parameters.get(param)
+			if type(f) is not types.FunctionType:
+				return []
+			return [dep for dep in map(self.__get_pam_name, self.__function_getargs(f)) if dep != param]
+
+		visiting, visited = set(), set()
+		for root in functions:
+			if root in visited:
+				continue
+			visiting.add(root)
+			stack = [(root, iter(deps(root)))]
+			while len(stack) > 0:
+				param, children = stack[-1]
+				for child in children:
+					if child in visiting:
+						raise errors.ParameterRecursionError("Adding function would result in recursion with function '%s'" % child)
+					if child not in visited:
+						visiting.add(child)
+						stack.append((child, iter(deps(child))))
+						break
+				else:
+					stack.pop()
+					visiting.remove(param)
+					visited.add(param)
+
 	def __function_getargs(self, f):  # faster than inspect.getargspec(f).args
 		return f.__code__.co_varnames[:f.__code__.co_argcount]
 
@@ -1070,6 +1496,34 @@ class Parameters(object):
 
 		return scaling
 
+	def __get_scaling_basis(self):
+		'''
+		Returns a tuple of the dimensions of the unit dispenser and a vector of the
+		scales of those dimensions (as floats relative to the unit dispenser), such
+		that the scaling of any unit is the product of the scales raised to the powers
+		of its dimensions, divided by the relative size of the unit. Returns None if
+		some scale cannot be represented as a positive float (such as an array
+		scale), in which case scalings must be computed using :class:`Quantity` objects.
+		'''
+		if self.__scaling_basis is None:
+			dims = tuple(self.__units.dimensions)
+			scales = []
+			for dim in dims:
+				scale = self.__scalings.get(dim)
+				if scale is None:
+					scales.append(self.__units.basis()[dim].rel)
+					continue
+				try:
+					scales.append(float(scale.value) * scale.units.rel)
+				except TypeError:
+					scales = None
+					break
+			if scales is None or not all(scale > 0 for scale in scales):
+				self.__scaling_basis = False
+			else:
+				self.__scaling_basis = (dims, dict(zip(dims, scales)), np.array(scales))
+		return self.__scaling_basis or None
+
 	def __unit_scaling(self, unit):
 		'''
 		Returns the float that corresponds to the relative scaling of the
@@ -1081,12 +1535,38 @@ class Parameters(object):
 		if unit in self.__scaling_cache:
 			return self.__scaling_cache[unit]
 
-		scale = self.__basis_scale(unit)
-		scaling = scale.value * scale.units.scale(unit)
+		basis = self.__get_scaling_basis()
+		if basis is None:
+			scale = self.__basis_scale(unit)
+			scaling = scale.value * scale.units.scale(unit)
+		else:
+			units = self.__get_unit(unit)
+			scaling = 1.
+			for dim, power in units.dimensions.items():
+				scaling *= basis[1][dim] ** power
+			scaling /= units.rel
 
 		self.__scaling_cache[unit] = scaling
 		return scaling
 
+	def __unit_scalings(self, units):
+		'''
+		Returns an array of the scalings of the provided units, as for `__unit_scaling`,
+		computing all uncached scalings together from the scaling basis.
+		'''
+		basis = self.__get_scaling_basis()
+		pending = [unit for unit in units if unit not in self.__scaling_cache]
+		if basis is None or len(pending) < 2:
+			return np.array([self.__unit_scaling(unit) for unit in units])
+
+		dims, _, scales = basis
+		objects = [self.__get_unit(unit) for unit in pending]
+		powers = np.array([[units_.dimensions.get(dim, 0) for dim in dims] for units_ in objects], dtype=float)
+		rels = np.array([units_.rel for units_ in objects])
+		for unit, scaling in zip(pending, np.prod(scales ** powers, axis=1) / rels):
+			self.__scaling_cache[unit] = float(scaling)
+		return np.array([self.__scaling_cache[unit] for unit in units])
+
 	################ EXPOSE PARAMETERS #########################################
 	def __call__(self, *args, **kwargs):
 		if args:
@@ -1314,6 +1794,7 @@ class Parameters(object):
 
 			if self.__parameters_bounds is None:
 				self.__parameters_bounds = {}
+			self.__clear_cache(key)
 			self.__parameters_bounds[key] = Bounds(key, self.units(key), bounds_new, error=error, clip=clip, inclusive=inclusive)
 
 	def __check_bounds(self, bounds, value):
@@ -1335,7 +1816,7 @@ class Parameters(object):
 
 		if bounds.clip:
 			if bounds.error:
-				warnings.warn(errors.ParameterOutsideBoundsWarning("Value %s for '%s' outside of bounds %s. Clipping to nearest allowable value." % (value, bounds.param, bounds.bounds)))
+				self.__warn(errors.ParameterOutsideBoundsWarning, "Value %s for '%s' outside of bounds %s. Clipping to nearest allowable value." % (value, bounds.param, bounds.bounds))
 			blist = []
 			for bound in bounds.bounds:
 				blist.extend(bound)
@@ -1348,7 +1829,7 @@ class Parameters(object):
 		elif bounds.error:
 			raise errors.ParameterOutsideBoundsError("Value %s for '%s' outside of bounds %s" % (value, bounds.param, bounds.bounds))
 
-		warnings.warn(errors.ParameterOutsideBoundsWarning("Value %s for '%s' outside of bounds %s. Using value anyway." % (value, bounds.param, bounds.bounds)))
+		self.__warn(errors.ParameterOutsideBoundsWarning, "Value %s for '%s' outside of bounds %s. Using value anyway." % (value, bounds.param, bounds.bounds))
 		return value
 
 	################## RANGE UTILITY #######################################
@@ -1392,6 +1873,20 @@ class Parameters(object):
 		>>> p.range( 'y', x = (0,10,2) )
 		[0.,100.]
 
+		When exploring many parameters at once, rather than taking a cartesian product of
+		ranges, the parameters can be sampled jointly from the box spanned by their ranges
+		using one of the samplers: 'random' (uniformly at random), 'lhs' (a Latin hypercube),
+		'halton' or 'sobol' (low discrepancy quasi-random sequences). All parameters in the
+		same call whose ranges use the same such sampler are sampled together, and must
+		request the same number of points. The random samplers accept an optional seed, as
+		in (*<start>*, *<stop>*, *<count>*, *<seed>*, *<sampler>*). For example:
+
+		>>> p.range( 'x', 'y', x=(0,1,100,'sobol'), y=((1,'ms'),(10,'ms'),100,'sobol') )
+		{'x':[0.,0.5,0.75,...], 'y':[...]}
+
+		Passed as a single level of the ranges of a :class:`RangesIterator`, these allow
+		high dimensional spaces to be explored using far fewer points than a grid.
+
 		It is also possible to determine multiple parameters at once.
 
 		>>> p.range( ‘x’, ‘y’, x=(0,10,2) )
@@ -1422,8 +1917,9 @@ class Parameters(object):
 		# Note: It is not necessary to worry about clashes at this
 		#       stage. They will be detected in the self.__get() method.
 		count = None
+		joint = self.__range_joint(ranges, params=static)
 		for param, pam_range in ranges.items():
-			pam_range = self.__range_interpret(param, pam_range, params=static)
+			pam_range = joint[param] if param in joint else self.__range_interpret(param, pam_range, params=static)
 			if isinstance(pam_range, (list, np.ndarray)):
 				lists[param] = pam_range
 				count = len(pam_range) if count is None else count
@@ -1474,6 +1970,10 @@ class Parameters(object):
 					logged = np.logspace(1, 10, count)
 					return (logged[::-1] - logged[0]) * (end - start) / logged[-1] + start
 				return logspace
+			elif sampler in JOINT_SAMPLERS:
+				def sample(start, end, count, seed=None):
+					return start + (end - start) * JOINT_SAMPLERS[sampler](int(count), 1, seed=seed)[:, 0]
+				return sample
 			else:
 				raise ValueError("Unknown sampler: %s" % sampler)
 		elif type(sampler) == types.FunctionType:
@@ -1495,26 +1995,284 @@ class Parameters(object):
 
 			sampler = self.__range_sampler(sampler)
 
-			for i, arg in enumerate(args):
-				if isinstance(arg, (tuple, str, Quantity)):
-					pars = {param: arg}
-					if type(params) is dict:
-						pars.update(params)
-					args[i] = self.__get([self.__get_pam_scaled_name(param)], pars)
-
 			# Note: param keyword cannot appear in params without keyword repetition in self.range.
-			return sampler(*args)
+			return sampler(*self.__range_args(param, args, params))
 		return pam_range
 
+	def __range_args(self, param, args, params=None):
+		args = list(args)
+		for i, arg in enumerate(args):
+			if isinstance(arg, (tuple, str, Quantity)):
+				pars = {param: arg}
+				if type(params) is dict:
+					pars.update(params)
+				args[i] = self.__get([self.__get_pam_scaled_name(param)], pars)
+		return args
+
+	def __range_joint(self, ranges, params=None):
+		'''
+		Return a dictionary of the values of the parameters in `ranges` whose range
+		specifications use one of the `JOINT_SAMPLERS`; where parameters using the same
+		sampler are sampled jointly from the box spanned by their ranges.
+		'''
+		groups = {}
+		for param, pam_range in ranges.items():
+			if isinstance(pam_range, tuple) and len(pam_range) >= 4 and isinstance(pam_range[-1], str) and pam_range[-1] in JOINT_SAMPLERS:
+				groups.setdefault(pam_range[-1], []).append(param)
+
+		values = {}
+		for sampler, group in groups.items():
+			group = sorted(group)  # Assign dimensions deterministically
+			bounds = []
+			counts = set()
+			seed = None
+			for param in group:
+				args = self.__range_args(param, ranges[param][:-1], params)
+				if len(args) not in (3, 4):
+					raise ValueError("Range specifications using the '%s' sampler must be of the form (<start>, <stop>, <count>[, <seed>], '%s'), not: %s." % (sampler, sampler, ranges[param]))
+				bounds.append((args[0], args[1]))
+				counts.add(int(args[2]))
+				if len(args) == 4 and seed is None:
+					seed = args[3]
+			if len(counts) != 1:
+				raise ValueError("Parameters sampled jointly using the '%s' sampler must have the same count: %s." % (sampler, ', '.join(group)))
+
+			points = JOINT_SAMPLERS[sampler](counts.pop(), len(group), seed=seed)
+			for i, param in enumerate(group):
+				start, end = bounds[i]
+				values[param] = start + (end - start) * points[:, i]
+		return values
+
+	################## TABULATION ##########################################
+	def tabulate(self, param, kind='linear', **ranges):
+		'''
+		tabulate(param, kind='linear', **ranges)
+
+		:param param: The name of the function parameter to tabulate.
+		:type param: str
+		:param kind: The kind of interpolation to use; either 'linear' or 'cubic'.
+		:type kind: str
+		:param ranges: A single range specification for the independent parameter (as in :func:`range`).
+		:type ranges: dict
+
+		:returns: A reference to the parent :class:`Parameters` instance.
+
+		When a function parameter is expensive to evaluate, and is polled often as
+		a function of a single other parameter (such as time in an integrator), it can be
+		replaced by a precomputed table of its values, which is interpolated upon lookup.
+		For example:
+
+		>>> p << {'pulse': lambda t, amplitude: amplitude * expensive_envelope(t)}
+		>>> p.tabulate('pulse', t=(0, (1, 'ms'), 1001), kind='cubic')
+		>>> p('pulse', t=(0.5, 'ms'))
+
+		Lookups are vectorised over array values of the independent parameter, and cost a
+		`numpy.searchsorted` rather than a call to the original function. The tabulated values
+		are stored non-dimensionally, and so lookups respect the units of the parameter. If
+		any of the other inputs of the original function (including those reached through
+		other function parameters) are changed, or the scaling of the parameters is changed,
+		the table is rebuilt upon the next lookup. If any of these inputs are instead
+		temporarily overridden (as in :python:`p('pulse', amplitude=2)`), the original function
+		is evaluated in place of the table. Values outside of the tabulated range are
+		extrapolated.
+
+		To restore the original function, use :func:`untabulate`.
+		'''
+		if len(ranges) != 1:
+			raise ValueError("Exactly one independent parameter must be specified in order to tabulate '%s'." % param)
+		wrt, pam_range = ranges.items()[0]
+		wrt = self.__get_pam_name(wrt)
+
+		function = self.__parameters.get(param)
+		if param in self.__tables and self.__tables[param][1] is function:
+			function = self.__tables[param][0].function
+		if type(function) is not types.FunctionType:
+			raise errors.ParameterInvalidError("Only function parameters can be tabulated, and '%s' is not a function parameter." % param)
+
+		deps = [dep for dep in self.__function_getargs(function) if self.__get_pam_name(dep) != param]
+		if wrt not in [self.__get_pam_name(dep) for dep in deps]:
+			raise errors.ParameterInvalidError("Function parameter '%s' does not depend on '%s'." % (param, wrt))
+
+		# Collect the names of all parameters upon which the function depends (other than `wrt`).
+		inputs = set()
+		pending = [self.__get_pam_name(dep) for dep in deps]
+		while len(pending) > 0:
+			name = pending.pop()
+			if name == wrt or name == param or name in inputs:
+				continue
+			inputs.add(name)
+			value = self.__parameters.get(name)
+			if type(value) is types.FunctionType:
+				pending.extend(self.__get_pam_name(dep) for dep in self.__function_getargs(value))
+		inputs = sorted(inputs)
+
+		def evaluate_at(value):
+			kwargs = {wrt: value}
+			self.__process_override(kwargs)
+			params = self.__get_params(deps, kwargs)
+			return self.__get_quantity(function(*[params[self.__get_pam_name(dep)] for dep in deps]), scaled=True)
+
+		def evaluate(grid):
+			try:  # Attempt a vectorised evaluation, which succeeds for most numpy-based functions
+				values = np.asarray(evaluate_at(grid))
+				if values.shape[:1] == grid.shape:
+					return values
+			except Exception:
+				pass
+			return np.array([evaluate_at(value) for value in grid])
+
+		def state():
+			return [self.__parameters.get(name) for name in inputs] + [self.__parameters_spec.get(param), self.__scaling_cache]
+
+		grid = np.asarray(self.__range_interpret(wrt, pam_range), dtype=float)
+		tabulated = TabulatedFunction(function, grid, evaluate, state, convert=lambda value: self.__get_quantity(value, scaled=True), kind=kind)
+
+		# Parameter functions must be genuine functions with named arguments. The lookup
+		# retains all of the arguments of the original function, so that dependencies
+		# are tracked as before, and so that it can be replaced by the original function
+		# when any of its other inputs are overridden (see `__eval_function`).
+		wrt_arg = [dep for dep in deps if self.__get_pam_name(dep) == wrt][0]
+		lookup = eval("lambda %s: tabulated(%s)" % (', '.join(deps), wrt_arg), {'tabulated': tabulated})
+
+		spec = self.__parameters_spec.get(param)
+		self.__set({param: (lookup, spec if spec is not None else '')})
+		self.__tables[param] = (tabulated, lookup, frozenset(inputs))
+		return self
+
+	def untabulate(self, *params):
+		'''
+		untabulate(*params)
+
+		:param params: The names of the tabulated parameters to restore.
+		:type params: tuple of str
+
+		:returns: A reference to the parent :class:`Parameters` instance.
+
+		Restore the original functions of parameters tabulated using :func:`tabulate`.
+		'''
+		for param in params:
+			tabulated, lookup, _ = self.__tables.pop(param, (None, None, None))
+			if tabulated is not None and self.__parameters.get(param) is lookup:
+				spec = self.__parameters_spec.get(param)
+				self.__set({param: (tabulated.function, spec if spec is not None else '')})
+		return self
+
+	################## ARRAY PARAMETERS ####################################
+	def __get_array_param(self, param):
+		value = self.__parameters.get(param)
+		if not isinstance(value, Quantity) or not isinstance(value.value, np.ndarray) or value.value.ndim == 0:
+			raise errors.ParameterInvalidError("Parameter '%s' is not an array-valued parameter." % param)
+		return value
+
+	def view(self, param, units=None):
+		'''
+		view(param, units=None)
+
+		:param param: The name of an array-valued parameter.
+		:type param: str
+		:param units: The units in which to view the parameter (or None for the non-dimensional value).
+		:type units: str or Units or None
+
+		:returns: A read-only numpy array of the values of the parameter.
+
+		Array-valued parameters are stored only once; and their non-dimensional values
+		are cached (sharing the stored array where the unit scaling is trivial). Views
+		in other units are computed upon first request, and then cached until the
+		parameter is next changed, such that repeated access does not allocate memory.
+
+		>>> p(field=(np.linspace(0, 1, 10**6), 'mT'))
+		>>> p.view('field', 'T')
+		array([ 0.00000000e+00, ... ,  1.00000000e-03])
+
+		Since the returned arrays are shared, they cannot be modified. To update
+		array-valued parameters in place, use :func:`assign`.
+		'''
+		value = self.__get_array_param(param)
+		if units is None:
+			return self.__get_param(param, default_scaled=True)
+
+		units = self.__get_unit(units)
+		views = self.__cache_views.setdefault(param, {})
+		if units not in views:
+			array = value.value if units == value.units else value(units).value
+			if array is not value.value:
+				array.flags.writeable = False
+			views[units] = array
+		return views[units]
+
+	def assign(self, param, value, index=Ellipsis, units=None):
+		'''
+		assign(param, value, index=Ellipsis, units=None)
+
+		:param param: The name of an array-valued parameter.
+		:type param: str
+		:param value: The new value(s) to assign.
+		:type value: number, numpy.ndarray or Quantity
+		:param index: The index (as accepted by numpy) of the elements to update (by default, all elements).
+		:type index: object
+		:param units: The units of `value` (or None if `value` is non-dimensional or a Quantity).
+		:type units: str or Units or None
+
+		:returns: A reference to the parent :class:`Parameters` instance.
+
+		Update the elements of an array-valued parameter in place, without allocating
+		a new array. Cached non-dimensional values are updated in place, and cached
+		views in other units are discarded.
+
+		>>> p.assign('field', 0.5, index=slice(0, 100), units='mT')
+
+		If the array is shared with a saved "with" context, it is copied before the
+		first assignment, so that the saved value is restored upon exiting the context.
+		'''
+		stored = self.__get_array_param(param)
+
+		if units is not None:
+			value = Quantity(value, units, dispenser=self.__units)
+		if not isinstance(value, Quantity):
+			value = Quantity(np.asarray(value) * self.__unit_scaling(stored.units), stored.units, dispenser=self.__units)
+		value = self.__get_quantity(value if value.units == stored.units else value(stored.units), param=param)
+
+		try:
+			contexts = self.__context_save
+		except AttributeError:
+			contexts = []
+		if any(context['parameters'].get(param) is stored for context in contexts) or (isinstance(self.__parameters, LayeredDict) and not self.__parameters.is_local(param)):
+			stored = self.__parameters[param] = self.__store_array(Quantity(stored.value.copy(), stored.units, absolute=stored.absolute, dispenser=self.__units))
+			self.__clear_cache(param)
+		self.__cache_united.pop(param, None)
+
+		stored.value.flags.writeable = True
+		try:
+			stored.value[index] = value.value
+		finally:
+			stored.value.flags.writeable = False
+
+		scaled = self.__cache_scaled.get(param)
+		if scaled is not None and scaled is not stored.value:
+			scaled.flags.writeable = True
+			try:
+				scaled[index] = value.value / self.__unit_scaling(stored.units)
+			finally:
+				scaled.flags.writeable = False
+		# Cached function values and tables may depend on the previous (identical) array
+		self.__generation += 1
+		self.__cache_views.pop(param, None)
+		for cached in self.__cache_funcs:
+			self.__cache_funcs[cached] = None
+		for tabulated, _, _ in self.__tables.values():
+			tabulated.invalidate()
+
+		return self
+
 	################## Function iteration ##################################
-	def ranges_iterator(self, ranges, params={}, masks=None, function=None, param_args=(), function_args=(), function_kwargs={}, nprocs=None, distributed=False, ranges_eval=None, progress=True):
+	def ranges_iterator(self, ranges, params={}, masks=None, function=None, param_args=(), function_args=(), function_kwargs={}, nprocs=None, distributed=False, ranges_eval=None, progress=True, checkpoint=None, cache=None, executor=None, telemetry=None, batch=None, cost_model=None):
 		'''
-		ranges_iterator(ranges, params={}, masks=None, function=None, function_args=(), function_kwargs={}, nprocs=None, ranges_eval=None, progress=True)
+		ranges_iterator(ranges, params={}, masks=None, function=None, function_args=(), function_kwargs={}, nprocs=None, ranges_eval=None, progress=True, checkpoint=None, cache=None, executor=None, telemetry=None, batch=None, cost_model=None)
 
 		This method is shorthand for:
 
 		>>> RangesIterator(parameters=self, ranges=ranges, params=params, masks=masks, function=function, \
-						function_kwargs=function_kwargs, nprocs=nprocs, ranges_eval=ranges_eval, progress=progress)
+						function_kwargs=function_kwargs, nprocs=nprocs, ranges_eval=ranges_eval, progress=progress, checkpoint=checkpoint, cache=cache, executor=executor, telemetry=telemetry, batch=batch, cost_model=cost_model)
 
 		The :class:`RangesIterator` object allows you to iterate over nested parameter
 		ranges, which is useful when you want to sweep out a multidimensional parameter
@@ -1524,7 +2282,7 @@ class Parameters(object):
 		For more information, please refer to the :class:`RangesIterator` documentation.
 		'''
 		return RangesIterator(parameters=self, ranges=ranges, params=params, masks=masks, function=function, function_args=function_args, \
-						function_kwargs=function_kwargs, nprocs=nprocs, distributed=distributed, ranges_eval=ranges_eval, progress=progress)
+						function_kwargs=function_kwargs, nprocs=nprocs, distributed=distributed, ranges_eval=ranges_eval, progress=progress, checkpoint=checkpoint, cache=cache, executor=executor, telemetry=telemetry, batch=batch, cost_model=cost_model)
 
 	################## CONVERT UTILITY #####################################
 	def asvalue(self, **kwargs):
@@ -1711,6 +2469,121 @@ class Parameters(object):
 
 		raise errors.ExpressionOptimisationError("No way to optimise parameter expression: %s ." % param)
 
+	def specialize(self, *params, **overrides):
+		'''
+		specialize(*params, wrt=(), **overrides)
+
+		:param params: The names of the parameters required of the specialized instance (by default, all parameters).
+		:type params: tuple of str
+		:param wrt: The parameters with respect to which the specialized instance should remain variable.
+		:type wrt: str or tuple of str
+		:param overrides: Parameter overrides to apply before specialization.
+		:type overrides: dict
+
+		:returns: A new :class:`Parameters` instance.
+
+		This method returns a new :class:`Parameters` instance, sharing the unit dispenser
+		and scalings of this one, in which every parameter that is constant with respect to
+		the parameters in `wrt` (as determined by :func:`is_constant`, subject to
+		`overrides`) has been evaluated and stored as a constant. Function parameters which
+		do depend upon `wrt` are retained, but with their constant arguments substituted,
+		such that the evaluation of a specialized parameter only resolves the parameters in
+		`wrt`. Parameters which are not needed to evaluate those listed in `params` are
+		dropped. This is useful in performance critical contexts, such as numerical
+		integration, where a few parameters vary and the rest are fixed.
+
+		For example:
+
+		>>> p(x=2, y='x^2', z='y*t', t=0)
+		>>> q = p.specialize('z', wrt='t')
+		>>> list(q)
+		['t', 'z']
+		>>> q('z', t=2)
+		8
+
+		Note that functions with arguments that have been substituted can no longer be inverted;
+		and that the specialized instance does not reflect any subsequent changes to this one.
+		'''
+		wrt = overrides.pop('wrt', ())
+		if isinstance(wrt, str):
+			wrt = (wrt,)
+		wrt = tuple(self.__get_pam_name(param) for param in wrt)
+
+		names = set(self.__parameters.keys()).union(overrides.keys())
+		targets = [self.__get_pam_name(param) for param in params] if len(params) > 0 else sorted(names)
+		for target in targets:
+			if target not in names:
+				raise errors.ParameterInvalidError("There is no parameter named '%s' to specialize." % target)
+
+		values = overrides.copy()
+		self.__process_override(values)
+
+		definitions = {}
+		bounds = {}
+		pending = list(targets)
+		while len(pending) > 0:
+			name = pending.pop()
+			if name in definitions or name not in names:
+				continue
+
+			if name not in wrt and self.is_constant(name, *wrt, **overrides):
+				definitions[name] = self.__get_param(self.__get_pam_united_name(name), values)
+				continue
+
+			value = overrides[name] if name in overrides else self.__parameters[name]
+			spec = self.__parameters_spec.get(name)
+			if isinstance(value, (list, tuple)) and isinstance(value[0], (types.FunctionType, str)):
+				value, spec = value
+			if isinstance(value, (types.FunctionType, str)):
+				function, deps = self.__specialize_function(name, self.__get_function(value), wrt, overrides, values)
+				definitions[name] = (function, spec if spec is not None else '')
+				pending.extend(deps)
+			else:
+				definitions[name] = self.__get_param(self.__get_pam_united_name(name), values)
+			if self.__parameters_bounds is not None and name in self.__parameters_bounds:
+				bounds[name] = self.__parameters_bounds[name]
+
+		specialized = Parameters(dispenser=self.__units, default_scaled=self.__default_scaled, validation=self.__validation)
+		if len(self.__scalings) > 0:
+			specialized.scaling(**self.__scalings)
+		specialized << definitions
+		for name, bound in bounds.items():
+			specialized.set_bounds({name: bound.bounds}, error=bound.error, clip=bound.clip, inclusive=bound.inclusive)
+		return specialized
+
+	def __specialize_function(self, param, function, wrt, overrides, values):
+		'''
+		Return a function equivalent to `function` (the definition of `param`), but with all arguments
+		which are constant with respect to `wrt` substituted; along with the names of the remaining
+		arguments.
+		'''
+		args = self.__function_getargs(function)
+		constants = {}
+		kept = []
+		for i, arg in enumerate(args):
+			dep = self.__get_pam_name(arg)
+			if dep == param:  # The self-reference used for inversion
+				continue
+			if dep in wrt or not self.is_constant(dep, *wrt, **overrides):
+				kept.append(arg)
+			else:
+				constants[i] = self.__get_param(arg, values)
+
+		if len(constants) == 0:
+			return function, [self.__get_pam_name(arg) for arg in kept]
+
+		# Generate a function with the remaining arguments as its signature, so that its
+		# dependencies can be introspected in the usual way.
+		namespace = {'__function__': function}
+		call = []
+		for i, arg in enumerate(args[:len(kept) + len(constants)]):
+			if i in constants:
+				namespace['__constant%d__' % i] = constants[i]
+				call.append('__constant%d__' % i)
+			else:
+				call.append(arg)
+		return eval("lambda %s: __function__(%s)" % (', '.join(kept), ', '.join(call)), namespace), [self.__get_pam_name(arg) for arg in kept]
+
 	def is_resolvable(self, *args, **params):
 		'''
 		is_resolvable(*args, **params)
@@ -1914,6 +2787,40 @@ class Parameters(object):
 		s = text.split('_')
 		return '_{'.join(s) + '}' * (len(s) - 1)
 
+	################## TABULAR DATA ########################################
+
+	def read_table(self, source, delimiter=',', chunksize=65536, scaled=True):
+		'''
+		read_table(source, delimiter=',', chunksize=65536, scaled=True)
+
+		:param source: The filename of a delimited text or `.npy` file, or a structured array.
+		:type source: str or numpy.ndarray
+		:param delimiter: The delimiter of the columns in text files.
+		:type delimiter: str
+		:param chunksize: The (maximum) number of rows to read at once.
+		:type chunksize: int
+		:param scaled: `True` if the values should be non-dimensionalised, and `False` otherwise.
+		:type scaled: bool
+
+		:returns: A :class:`TableReader` instance.
+
+		This method is shorthand for:
+
+		>>> TableReader(source, self, delimiter=delimiter, chunksize=chunksize, scaled=scaled)
+
+		which streams tabular data whose column headers carry units (such as
+		`freq (GHz)`) into this :class:`Parameters` instance, converting each column
+		with a single scaling. For example:
+
+		>>> p.read_table('spectrum.csv').update()
+		>>> p('freq')
+		array([ ... ])
+
+		For more information, please refer to the :class:`TableReader` documentation.
+		'''
+		from .utility.tables import TableReader
+		return TableReader(source, self, delimiter=delimiter, chunksize=chunksize, scaled=scaled)
+
 	################## LOAD / SAVE PROFILES ################################
 
 	@classmethod
@@ -1950,7 +2857,7 @@ class Parameters(object):
 		for unit in getattr(profile, "units_custom", []):
 			p + unit
 
-		p << getattr(profile, "parameters", {})
+		p.update_many(getattr(profile, "parameters", {}))
 
 		p.cache(**getattr(profile, "parameters_cache", {}))
 
@@ -0,0 +1,253 @@
+from timeit import default_timer as timer
+
+
+class CountingDict(dict):
+	'''
+	A dictionary which counts the lookups made using `in` and `[]`, such that
+	the hit rate of a cache stored in it can be measured.
+	'''
+
+	def __init__(self, data, counts):
+		dict.__init__(self, data)
+		self.counts = counts
+		self.__stored = None
+
+	def __setitem__(self, key, value):
+		# Caches often look up a value immediately after storing it, which should
+		# not be counted as a hit.
+		self.__stored = key
+		dict.__setitem__(self, key, value)
+
+	def __contains__(self, key):
+		if dict.__contains__(self, key):
+			self.counts['hits'] += 1
+			return True
+		self.counts['misses'] += 1
+		return False
+
+	def __getitem__(self, key):
+		try:
+			value = dict.__getitem__(self, key)
+		except KeyError:
+			self.counts['misses'] += 1
+			raise
+		if key == self.__stored:
+			self.__stored = None
+		else:
+			self.counts['hits'] += 1
+		return value
+
+
+class ProfileReport(object):
+	'''
+	ProfileReport(phases, parameters, caches)
+
+	The results of profiling a :class:`Parameters` instance (see :func:`Parameters.profile`).
+
+	:param phases: A dictionary of statistics for each phase of parameter resolution.
+	:type phases: dict
+	:param parameters: A dictionary of statistics for each parameter retrieved.
+	:type parameters: dict
+	:param caches: A dictionary of hit and miss counts for each internal cache.
+	:type caches: dict
+
+	Statistics for phases and parameters are dictionaries with keys:
+		- `calls`: The number of calls.
+		- `time`: The total time in seconds spent in calls (including nested phases).
+		- `self`: The total time in seconds spent in calls (excluding nested phases).
+
+	For parameters that are functions of other parameters, the `self` time of
+	the 'function' phase is approximately the time spent in the user's function.
+	'''
+
+	SORT_KEYS = ('time', 'self', 'calls', 'name')
+
+	def __init__(self, phases, parameters, caches):
+		self.phases = phases
+		self.parameters = parameters
+		self.caches = caches
+
+	def hit_rate(self, cache):
+		'''
+		hit_rate(cache)
+
+		:param cache: The name of the cache.
+		:type cache: str
+
+		:returns: The fraction of lookups in the cache which were hits (or None if there were no lookups).
+		'''
+		counts = self.caches[cache]
+		total = counts['hits'] + counts['misses']
+		return float(counts['hits']) / total if total > 0 else None
+
+	def __sorted(self, stats, sort):
+		if sort not in self.SORT_KEYS:
+			raise ValueError("Profile reports can only be sorted by one of: %s." % ', '.join(self.SORT_KEYS))
+		if sort == 'name':
+			return sorted(stats.items())
+		return sorted(stats.items(), key=lambda item: item[1][sort], reverse=True)
+
+	def table(self, sort='time', limit=None):
+		'''
+		table(sort='time', limit=None)
+
+		:param sort: The statistic by which to sort phases and parameters; one of 'time', 'self', 'calls' or 'name'.
+		:type sort: str
+		:param limit: The maximum number of parameters to show.
+		:type limit: None or int
+
+		:returns: A string containing a formatted table of the profiling results.
+		'''
+		lines = ["%-32s %10s %12s %12s" % ("Phase", "Calls", "Time (ms)", "Self (ms)")]
+		for name, stats in self.__sorted(self.phases, sort):
+			lines.append("%-32s %10d %12.3f %12.3f" % (name, stats['calls'], stats['time'] * 1e3, stats['self'] * 1e3))
+
+		lines += ["", "%-32s %10s %12s %12s" % ("Parameter", "Calls", "Time (ms)", "Self (ms)")]
+		for name, stats in self.__sorted(self.parameters, sort)[:limit]:
+			lines.append("%-32s %10d %12.3f %12.3f" % (name, stats['calls'], stats['time'] * 1e3, stats['self'] * 1e3))
+
+		lines += ["", "%-32s %10s %12s %12s" % ("Cache", "Hits", "Misses", "Hit rate")]
+		for name, counts in sorted(self.caches.items()):
+			rate = self.hit_rate(name)
+			lines.append("%-32s %10d %12d %12s" % (name, counts['hits'], counts['misses'], '-' if rate is None else '%.1f%%' % (rate * 100)))
+
+		return '\n'.join(lines)
+
+	def __str__(self):
+		return self.table()
+
+	def __repr__(self):
+		return '<ProfileReport: %d phases, %d parameters>' % (len(self.phases), len(self.parameters))
+
+
+class ParametersProfiler(object):
+	'''
+	ParametersProfiler(parameters)
+
+	A context manager which profiles the resolution of parameters by a :class:`Parameters`
+	instance, and which is normally created using :func:`Parameters.profile`. While
+	active, the internal methods of the :class:`Parameters` instance (and the lookups
+	of its dispenser) are wrapped so as to record the number of calls and the time
+	spent in each phase, and the hit rates of the internal caches. Upon exiting,
+	the wrappers are removed, such that there is no overhead when profiling is
+	not active.
+	'''
+
+	# Pairs of phase names and the names of the Parameters methods which implement them.
+	PHASES = [
+		('get_param', '_Parameters__get_param'),
+		('get_quantity', '_Parameters__get_quantity'),
+		('unit_scaling', '_Parameters__unit_scaling'),
+		('function', '_Parameters__eval_function'),
+		('process_override', '_Parameters__process_override'),
+		('check_bounds', '_Parameters__check_bounds'),
+		('check_bounds', '_Parameters__forward_check_bounds'),
+		('eval', '_Parameters__eval'),
+		('sympy', '_Parameters__sympy_to_function'),
+		('set', '_Parameters__set'),
+		('get_pam_deps', '_Parameters__get_pam_deps'),
+		('get_pam_sups', '_Parameters__get_pam_sups'),
+	]
+
+	def __init__(self, parameters):
+		self.parameters = parameters
+		self.report = None
+
+	def __enter__(self):
+		p = self.parameters
+		self.__dispenser = p._Parameters__units
+		self.__phases = {}
+		self.__params = {}
+		self.__caches = dict((name, {'hits': 0, 'misses': 0}) for name in ('cache_scaled', 'cache_united', 'cache_deps', 'cache_sups', 'cache_funcs', 'scaling_cache', 'units_cache', 'conversions_cache'))
+		self.__stack = []
+		self.__installed = []
+
+		probes = {
+			'_Parameters__get_pam_deps': ('cache_deps', lambda param: param in p._Parameters__cache_deps),
+			'_Parameters__get_pam_sups': ('cache_sups', lambda param: param in p._Parameters__cache_sups),
+			'_Parameters__unit_scaling': ('scaling_cache', lambda unit: unit in p._Parameters__scaling_cache),
+		}
+
+		for phase, attr in self.PHASES:
+			self.__install(p, attr, self.__wrap(phase, getattr(p, attr), probe=probes.get(attr), parameter=(attr == '_Parameters__get_param')))
+		self.__install(p, '_Parameters__cache_func_handler', self.__wrap_func_cache(p._Parameters__cache_func_handler))
+		self.__install(self.__dispenser, 'conversion_map', self.__wrap('conversion_map', self.__dispenser.conversion_map, probe=('conversions_cache', self.__conversion_cached)))
+		self.__ensure_counting()
+		return self
+
+	def __exit__(self, type, value, traceback):
+		for obj, attr in self.__installed:
+			delattr(obj, attr)
+		self.__installed = []
+
+		p = self.parameters
+		for attr in ('_Parameters__cache_scaled', '_Parameters__cache_united'):
+			if isinstance(getattr(p, attr), CountingDict):
+				setattr(p, attr, dict(getattr(p, attr)))
+		if isinstance(self.__dispenser._UnitDispenser__cache, CountingDict):
+			self.__dispenser._UnitDispenser__cache = dict(self.__dispenser._UnitDispenser__cache)
+
+		self.report = ProfileReport(self.__phases, self.__params, self.__caches)
+
+	def __install(self, obj, attr, wrapper):
+		setattr(obj, attr, wrapper)
+		self.__installed.append((obj, attr))
+
+	def __ensure_counting(self):
+		'''
+		Ensure that the dictionary caches which are looked up directly are counting
+		lookups (they may have been replaced by fresh dictionaries since the last call).
+		'''
+		p = self.parameters
+		for attr, name in (('_Parameters__cache_scaled', 'cache_scaled'), ('_Parameters__cache_united', 'cache_united')):
+			if type(getattr(p, attr)) is not CountingDict:
+				setattr(p, attr, CountingDict(getattr(p, attr), self.__caches[name]))
+		if type(self.__dispenser._UnitDispenser__cache) is not CountingDict:
+			self.__dispenser._UnitDispenser__cache = CountingDict(self.__dispenser._UnitDispenser__cache, self.__caches['units_cache'])
+
+	def __conversion_cached(self, unit_from, unit_to, absolute=False, context=False):
+		dispenser = self.__dispenser
+		if context is False:
+			context = dispenser._context_current[0] if dispenser._context_current is not False else None
+		try:
+			return dispenser._UnitDispenser__conversions_cache[context][dispenser(unit_from)][dispenser(unit_to)][absolute] is not None
+		except Exception:
+			return False
+
+	def __record(self, stats, key, elapsed, exclusive):
+		entry = stats.get(key)
+		if entry is None:
+			entry = stats[key] = {'calls': 0, 'time': 0., 'self': 0.}
+		entry['calls'] += 1
+		entry['time'] += elapsed
+		entry['self'] += exclusive
+
+	def __wrap(self, phase, method, probe=None, parameter=False):
+		stack = self.__stack
+
+		def wrapper(*args, **kwargs):
+			self.__ensure_counting()
+			if probe is not None:
+				self.__caches[probe[0]]['hits' if probe[1](*args, **kwargs) else 'misses'] += 1
+
+			stack.append(0.)
+			start = timer()
+			try:
+				return method(*args, **kwargs)
+			finally:
+				elapsed = timer() - start
+				exclusive = elapsed - stack.pop()
+				if len(stack) > 0:
+					stack[-1] += elapsed
+				self.__record(self.__phases, phase, elapsed, exclusive)
+				if parameter:
+					self.__record(self.__params, args[0] if isinstance(args[0], str) else '<%s>' % type(args[0]).__name__, elapsed, exclusive)
+		return wrapper
+
+	def __wrap_func_cache(self, method):
+		def wrapper(param, value=None, params=None):
+			result = method(param, value=value, params=params)
+			if value is None and param in self.parameters._Parameters__cache_funcs:
+				self.__caches['cache_funcs']['hits' if result is not None else 'misses'] += 1
+			return result
+		return wrapper
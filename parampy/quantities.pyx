@@ -207,6 +207,12 @@ class Quantity(object):
 		'''
 		return self(self.units.basis())
 
+	def __reduce__(self):
+		# The units and dispenser are pickled compactly by reference (see
+		# `Units.__reduce__` and `UnitDispenser.__reduce__`); and numpy values using
+		# their own (contiguous buffer) representation.
+		return (type(self), (self.value, self.units, self.absolute, self.dispenser))
+
 	def _new(self, value, units, dispenser=None, absolute=False):
 		return Quantity(value, units, dispenser=self.dispenser if dispenser is None else dispenser, absolute=absolute)
 
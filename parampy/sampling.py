@@ -0,0 +1,141 @@
+import numpy as np
+
+# Joe and Kuo's direction numbers (new-joe-kuo-6.21201) for dimensions 2 onwards, as
+# (s, a, (m_1, ..., m_s)) tuples; where s is the degree of the primitive polynomial, a encodes
+# its interior coefficients, and m_i are the initial direction numbers. The first dimension
+# is the van der Corput sequence in base 2.
+SOBOL_DIRECTIONS = [
+	(1, 0, (1,)),
+	(2, 1, (1, 3)),
+	(3, 1, (1, 3, 1)),
+	(3, 2, (1, 1, 1)),
+	(4, 1, (1, 1, 3, 3)),
+	(4, 4, (1, 3, 5, 13)),
+	(5, 2, (1, 1, 5, 5, 17)),
+	(5, 4, (1, 1, 5, 5, 5)),
+	(5, 7, (1, 1, 7, 11, 19)),
+	(5, 11, (1, 1, 5, 1, 1)),
+	(5, 13, (1, 1, 1, 3, 11)),
+	(5, 14, (1, 3, 5, 5, 31)),
+	(6, 1, (1, 3, 3, 9, 7, 49)),
+	(6, 13, (1, 1, 1, 15, 21, 21)),
+	(6, 16, (1, 3, 1, 13, 27, 49)),
+	(6, 19, (1, 1, 1, 15, 7, 5)),
+	(6, 22, (1, 3, 1, 15, 13, 25)),
+	(6, 25, (1, 1, 5, 5, 19, 61)),
+	(7, 1, (1, 3, 7, 11, 23, 15, 103)),
+	(7, 4, (1, 3, 7, 13, 13, 15, 69)),
+]
+
+SOBOL_BITS = 32
+
+
+def _primes(count):
+	primes = []
+	candidate = 2
+	while len(primes) < count:
+		if all(candidate % prime for prime in primes if prime * prime <= candidate):
+			primes.append(candidate)
+		candidate += 1
+	return primes
+
+
+def _random_state(seed):
+	return seed if isinstance(seed, np.random.RandomState) else np.random.RandomState(seed)
+
+
+def uniform(count, dims, seed=None):
+	'''
+	uniform(count, dims, seed=None)
+
+	:returns: An array of shape `(count, dims)` of points drawn independently and uniformly
+		from the unit hypercube.
+	'''
+	return _random_state(seed).uniform(size=(count, dims))
+
+
+def latin_hypercube(count, dims, seed=None):
+	'''
+	latin_hypercube(count, dims, seed=None)
+
+	:returns: An array of shape `(count, dims)` of points in the unit hypercube forming a
+		Latin hypercube; such that, along each dimension, exactly one point lies in each of
+		the `count` equal strata. Points are placed uniformly at random within their strata.
+	'''
+	random = _random_state(seed)
+	points = np.empty((count, dims))
+	for dim in range(dims):
+		points[:, dim] = (random.permutation(count) + random.uniform(size=count)) / count
+	return points
+
+
+def halton(count, dims, seed=None):
+	'''
+	halton(count, dims, seed=None)
+
+	:returns: An array of shape `(count, dims)` of the first `count` points (after the origin)
+		of the Halton sequence, which uses the radical inverse in the `i`th prime base along
+		the `i`th dimension. The sequence is deterministic, and so `seed` is ignored.
+	'''
+	points = np.empty((count, dims))
+	for dim, base in enumerate(_primes(dims)):
+		n = np.arange(1, count + 1)
+		value = np.zeros(count)
+		factor = 1. / base
+		while np.any(n > 0):
+			n, digit = divmod(n, base)
+			value += digit * factor
+			factor /= base
+		points[:, dim] = value
+	return points
+
+
+def sobol(count, dims, seed=None):
+	'''
+	sobol(count, dims, seed=None)
+
+	:returns: An array of shape `(count, dims)` of the first `count` points (starting at the
+		origin) of the Sobol sequence, using the direction numbers of Joe and Kuo. At most
+		`len(SOBOL_DIRECTIONS) + 1` dimensions are supported. The sequence is deterministic,
+		and so `seed` is ignored.
+	'''
+	if dims > len(SOBOL_DIRECTIONS) + 1:
+		raise ValueError("Sobol sampling supports at most %d dimensions." % (len(SOBOL_DIRECTIONS) + 1))
+	if count > 2 ** SOBOL_BITS:
+		raise ValueError("Sobol sampling supports at most 2^%d points." % SOBOL_BITS)
+
+	directions = np.zeros((dims, SOBOL_BITS), dtype=np.uint64)
+	directions[0] = [1 << (SOBOL_BITS - 1 - i) for i in range(SOBOL_BITS)]
+	for dim in range(1, dims):
+		s, a, m = SOBOL_DIRECTIONS[dim - 1]
+		v = [m[i] << (SOBOL_BITS - 1 - i) for i in range(s)]
+		for i in range(s, SOBOL_BITS):
+			value = v[i - s] ^ (v[i - s] >> s)
+			for k in range(1, s):
+				if (a >> (s - 1 - k)) & 1:
+					value ^= v[i - k]
+			v.append(value)
+		directions[dim] = v
+
+	# Gray code construction: the nth point differs from the previous one by the direction
+	# number indexed by the position of the lowest zero bit of n - 1.
+	points = np.empty((count, dims))
+	state = np.zeros(dims, dtype=np.uint64)
+	for n in range(count):
+		points[n] = state
+		c = 0
+		while (n >> c) & 1:
+			c += 1
+		if c < SOBOL_BITS:
+			state ^= directions[:, c]
+	return points / 2. ** SOBOL_BITS
+
+
+# Samplers which draw points jointly from a box spanned by the ranges of several
+# parameters (see `Parameters.range`).
+JOINT_SAMPLERS = {
+	'random': uniform,
+	'lhs': latin_hypercube,
+	'halton': halton,
+	'sobol': sobol,
+}
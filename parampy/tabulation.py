@@ -0,0 +1,134 @@
+import numpy as np
+
+
+class Table(object):
+	'''
+	Table(x, y, kind='linear')
+
+	:class:`Table` interpolates precomputed (non-dimensional) values `y` at the
+	sorted sample points `x`. Evaluation is vectorised over array inputs, and
+	costs a single `numpy.searchsorted` plus a polynomial evaluation per point.
+
+	:param x: The sample points (which must be strictly increasing).
+	:type x: numpy.ndarray
+	:param y: The values at the sample points, with the first axis corresponding to `x`.
+	:type y: numpy.ndarray
+	:param kind: The kind of interpolation; either 'linear' or 'cubic' (a not-a-knot cubic spline).
+	:type kind: str
+
+	Points outside of the range of `x` are extrapolated using the polynomial of
+	the nearest interval.
+
+	>>> table = Table([0, 1, 2], [0, 1, 4])
+	>>> table(1.5)
+	2.5
+	'''
+
+	def __init__(self, x, y, kind='linear'):
+		x = np.asarray(x, dtype=float)
+		y = np.asarray(y)
+		if x.ndim != 1 or len(x) < 2:
+			raise ValueError("Tables require at least two sample points.")
+		if np.any(np.diff(x) <= 0):
+			raise ValueError("Table sample points must be strictly increasing.")
+		if y.shape[:1] != x.shape:
+			raise ValueError("Table values must have the same length as the sample points.")
+
+		self.x = x
+		self.y = y
+		self.kind = kind
+
+		if kind == 'linear':
+			self.__coefficients = [np.diff(y, axis=0) / self.__expand(np.diff(x), y.ndim), y[:-1]]
+		elif kind == 'cubic':
+			from scipy.interpolate import CubicSpline
+			self.__coefficients = list(CubicSpline(x, y, axis=0).c)
+		else:
+			raise ValueError("Unknown interpolation kind: %s" % kind)
+
+	def __expand(self, a, ndim):
+		return a.reshape(a.shape + (1,) * (ndim - 1))
+
+	def __call__(self, t):
+		t = np.asarray(t, dtype=float)
+		i = np.clip(np.searchsorted(self.x, t, side='right') - 1, 0, len(self.x) - 2)
+		dt = self.__expand(t - self.x[i], self.y.ndim)
+
+		# Horner evaluation of the interval polynomials
+		result = self.__coefficients[0][i]
+		for c in self.__coefficients[1:]:
+			result = result * dt + c[i]
+		return result if result.ndim > 0 else result[()]
+
+
+class TabulatedFunction(object):
+	'''
+	TabulatedFunction(function, x, evaluate, state, convert=None, kind='linear')
+
+	A callable which replaces a function parameter with a :class:`Table` of its values,
+	and which is normally created using :func:`Parameters.tabulate`. Before every
+	lookup, the current state of the inputs of the original function is compared (by
+	identity) with the state when the table was built; and if it has changed, the table
+	is rebuilt.
+
+	:param function: The original function parameter.
+	:type function: function
+	:param x: The (non-dimensional) values of the independent parameter at which to tabulate.
+	:type x: numpy.ndarray
+	:param evaluate: A callable which takes an array of values of the independent parameter
+		and returns an array of the (non-dimensional) values of the function.
+	:type evaluate: callable
+	:param state: A callable which returns a list of objects representing the current state
+		of the inputs of the function.
+	:type state: callable
+	:param convert: An (optional) callable which converts the value of the independent
+		parameter passed to the table into a non-dimensional value.
+	:type convert: callable
+	:param kind: The kind of interpolation (see :class:`Table`).
+	:type kind: str
+	'''
+
+	def __init__(self, function, x, evaluate, state, convert=None, kind='linear'):
+		self.function = function
+		self.x = np.asarray(x, dtype=float)
+		self.kind = kind
+		self.__evaluate = evaluate
+		self.__state = state
+		self.__convert = convert
+		self.table = None
+		self.rebuild()
+
+	def rebuild(self):
+		'''
+		rebuild()
+
+		Re-evaluate the function at all sample points.
+		'''
+		self.__snapshot = self.__state()
+		self.table = Table(self.x, self.__evaluate(self.x), kind=self.kind)
+
+	def invalidate(self):
+		'''
+		invalidate()
+
+		Force the table to be rebuilt upon the next lookup; for example, when an input
+		has been modified in place.
+		'''
+		self.__snapshot = None
+
+	@property
+	def stale(self):
+		'''
+		`True` if the inputs of the function have changed since the table was built.
+		'''
+		if self.__snapshot is None:
+			return True
+		state = self.__state()
+		return len(state) != len(self.__snapshot) or any(a is not b for a, b in zip(state, self.__snapshot))
+
+	def __call__(self, t):
+		if self.stale:
+			self.rebuild()
+		if self.__convert is not None:
+			t = self.__convert(t)
+		return self.table(t)
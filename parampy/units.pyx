@@ -1,10 +1,35 @@
 from fractions import Fraction
-import re, types, inspect
+import copy, re, types, inspect, uuid, weakref
 
 from . import errors
 from .text import colour_text
 
 
+# The UnitDispenser instances known to this process (including those inherited from
+# the parent of a forked process), keyed by their registry ID. Pickled dispensers are
+# resolved against this registry when they are unpickled (see `resolve_dispenser`).
+DISPENSERS = weakref.WeakValueDictionary()
+SHARED_DISPENSERS = {}
+
+
+def resolve_dispenser(registry_id, cls):
+	'''
+	Return the dispenser with the provided registry ID if it is known to this process,
+	and otherwise a dispenser of type `cls` which is shared by all dispensers of that type
+	that are unpickled in this process (and which is constructed upon first use). A
+	`TypeError` is raised if the dispenser with the provided registry ID is not of type `cls`.
+	'''
+	dispenser = DISPENSERS.get(registry_id)
+	if dispenser is not None and type(dispenser) is not cls:
+		raise TypeError("Dispenser with registry ID '%s' is of type %s, not %s." % (registry_id, type(dispenser).__name__, cls.__name__))
+	if dispenser is None:
+		dispenser = SHARED_DISPENSERS.get(cls)
+		if dispenser is None:
+			dispenser = SHARED_DISPENSERS[cls] = cls()
+		DISPENSERS[registry_id] = dispenser
+	return dispenser
+
+
 class Unit(object):
 	'''
 	Unit (name,abbr=None,rel=1.0,prefixable=True,plural=None,dimensions={},base_unit=None)
@@ -197,9 +222,20 @@ class UnitDispenser(object):
 		Which is shorthand for:
 
 		>>> ud('km')
+
+	Pickling:
+		Dispensers are pickled by reference, as their registry ID (see :func:`registry_id`)
+		and type, so that :class:`Units` and :class:`Quantity` objects can be pickled
+		without also pickling the full table of units. When unpickled in the same process
+		(or a process forked from it), the original dispenser is used. Otherwise, a dispenser
+		of the same type is constructed (once per process, and shared). Note that units
+		added to a dispenser after its construction are therefore only available when
+		unpickling in the same (or a forked) process.
 	'''
 
 	def __init__(self):
+		self.__register()
+
 		self._dimensions = {}
 		self._units = {}
 		self._prefixes = []
@@ -216,6 +252,35 @@ class UnitDispenser(object):
 		self.init_prefixes()
 		self.init_units()
 
+	@property
+	def registry_id(self):
+		'''
+		A string identifying this dispenser, which is unique across processes and hosts.
+		'''
+		return self.__registry_id
+
+	def __register(self):
+		self.__registry_id = uuid.uuid4().hex
+		DISPENSERS[self.__registry_id] = self
+
+	def __reduce__(self):
+		return (resolve_dispenser, (self.__registry_id, type(self)))
+
+	# Pickling is by reference (see `__reduce__`), but copies must be distinct dispensers
+	# (so that, for example, `Parameters` contexts can restore the current units context).
+	def __copy__(self):
+		dispenser = type(self).__new__(type(self))
+		dispenser.__dict__.update(self.__dict__)
+		dispenser.__register()
+		return dispenser
+
+	def __deepcopy__(self, memo):
+		dispenser = type(self).__new__(type(self))
+		memo[id(self)] = dispenser
+		dispenser.__dict__.update(copy.deepcopy(self.__dict__, memo))
+		dispenser.__register()
+		return dispenser
+
 	############# SETUP ROUTINES ###########################################
 	def init_prefixes(self):
 		'''
@@ -846,6 +911,44 @@ class Units(object):
 
 		raise errors.UnitInvalidError("Unrecognised unit description %s" % units)
 
+	def __deepcopy__(self, memo):
+		# Copy attributes directly, since `__reduce__` requires a fully constructed dispenser.
+		# The hash is set first, since the copy may be used as a key (such as in the caches of
+		# the dispenser) before its other attributes have been copied.
+		units = type(self).__new__(type(self))
+		memo[id(self)] = units
+		units.__hash = self.__hash
+		units.__dict__.update(copy.deepcopy(self.__dict__, memo))
+		return units
+
+	def __reduce__(self):
+		# Units are pickled as a canonical string representation, which is resolved
+		# (through its cache) by the dispenser, which itself is pickled by reference.
+		if self.__dispenser is None:
+			return (Units, (self.units,))
+		return (self.__dispenser, (self.__canonical(),))
+
+	def __canonical(self):
+		'''
+		Return a representation of these units which can be interpreted by the dispenser;
+		a string if all powers are integers, and otherwise a dictionary of unit names to powers.
+		'''
+		items = sorted(self.__units.items())
+		if any(Fraction(power).denominator != 1 for _, power in items):
+			return dict((unit.name, str(power)) for unit, power in items)
+
+		output = []
+		for unit, power in items:
+			token = unit.abbr if isinstance(unit.abbr, str) else unit.name
+			if power > 0:
+				output.append(token if power == 1 else "%s^%s" % (token, power))
+		output = "*".join(output)
+		for unit, power in items:
+			token = unit.abbr if isinstance(unit.abbr, str) else unit.name
+			if power < 0:
+				output += "/%s" % token if power == -1 else "/%s^%s" % (token, -power)
+		return output
+
 	def __repr__(self):
 		return str(self)
 
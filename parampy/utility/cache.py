@@ -0,0 +1,277 @@
+import os
+import hashlib
+import tempfile
+import types
+import cPickle as pickle
+
+import numpy as np
+
+from ..quantities import Quantity
+
+
+class ResultCache(object):
+	'''
+	ResultCache(path=None, max_size=2**30)
+
+	:class:`ResultCache` is a content-addressed on-disk cache of the results of
+	function evaluations, which allows results to be shared between overlapping
+	parameter sweeps (including sweeps run in different processes or sessions).
+	It is normally used via the `cache` argument of :class:`RangesIterator`.
+
+	:param path: The directory in which to store cached results. If not specified,
+		`~/.cache/parampy` is used.
+	:type path: None or str
+	:param max_size: The maximum total size in bytes of the cached results. When this is
+		exceeded, the least recently used results are evicted.
+	:type max_size: int
+
+	Results are keyed on a stable hash of the function's identity (its module, name,
+	bytecode and constants, and `__version__` attribute if present), of its configuration
+	(the contents of its closure, its default arguments, and the state of the instance to
+	which it is bound or of the callable object itself), and of the arguments passed to it.
+	Functions whose configuration cannot be hashed are only cached if they have a
+	`__version__` attribute. Incrementing the `__version__` attribute of a function is therefore
+	a simple way to invalidate previously cached results:
+
+	>>> def f(params):
+			pass
+	>>> f.__version__ = 2
+	'''
+
+	def __init__(self, path=None, max_size=2**30):
+		self.path = path if path is not None else os.path.join(os.path.expanduser('~'), '.cache', 'parampy')
+		self.max_size = max_size
+		self.__size = None
+
+	@property
+	def path(self):
+		'''
+		The directory in which results are cached.
+		'''
+		return self.__path
+	@path.setter
+	def path(self, path):
+		if not os.path.exists(path):
+			os.makedirs(path)
+		self.__path = path
+
+	############# KEY GENERATION ###########################################
+
+	def key(self, function, params, args=(), kwargs={}):
+		'''
+		key(function, params, args=(), kwargs={})
+
+		:param function: The function being evaluated.
+		:type function: callable
+		:param params: The parameter context passed to the function.
+		:type params: dict
+		:param args: The additional positional arguments passed to the function.
+		:type args: tuple
+		:param kwargs: The additional keyword arguments passed to the function.
+		:type kwargs: dict
+
+		:returns: A hexadecimal string which uniquely identifies the evaluation.
+		'''
+		h = hashlib.sha1()
+		self.__hash(h, self.__function_identity(function))
+		self.__hash(h, params)
+		self.__hash(h, tuple(args))
+		self.__hash(h, kwargs)
+		return h.hexdigest()
+
+	def __function_identity(self, function):
+		identity = [getattr(function, '__module__', None), getattr(function, '__name__', type(function).__name__), getattr(function, '__version__', None)]
+		state = []
+		if isinstance(function, types.MethodType):
+			identity.append(type(function.im_self).__name__ if function.im_self is not None else None)
+			state.append(function.im_self)
+			function = function.im_func
+		elif not isinstance(function, (types.FunctionType, types.BuiltinFunctionType, type)):
+			# A callable object, which is identified by its class and its state
+			identity.append(type(function).__name__)
+			state.append(function)
+			function = getattr(type(function).__call__, 'im_func', None)
+		code = getattr(function, '__code__', None)
+		if code is not None:
+			identity.append(code)
+		if isinstance(function, types.FunctionType):
+			state.append(function.func_defaults)
+			state.append(tuple(cell.cell_contents for cell in function.__closure__ or ()))
+
+		# Functions which are configured by bound instances, closures or defaults are
+		# distinguished by the content of that configuration. If it cannot be hashed,
+		# the function may only be cached if its `__version__` identifies it.
+		h = hashlib.sha1()
+		try:
+			self.__hash(h, state, stack=(id(function),))
+		except Exception as e:
+			if identity[2] is None:
+				raise ValueError("Results of `%s` cannot be cached, since the state of its bound instance, closure or default arguments could not be hashed (%s). Set its `__version__` attribute to cache it anyway." % (identity[1], e))
+		else:
+			identity.append(h.hexdigest())
+		return tuple(identity)
+
+	def __hash(self, h, obj, stack=()):
+		'''
+		Update hash `h` with a representation of `obj` which is stable between
+		processes and sessions. `stack` holds the ids of the functions and objects
+		currently being hashed, so that reference cycles are not followed.
+		'''
+		if isinstance(obj, dict):
+			h.update('{')
+			for key in sorted(obj, key=str):
+				self.__hash(h, key, stack)
+				self.__hash(h, obj[key], stack)
+			h.update('}')
+		elif isinstance(obj, (list, tuple)):
+			h.update('%s(' % type(obj).__name__)
+			for item in obj:
+				self.__hash(h, item, stack)
+			h.update(')')
+		elif isinstance(obj, np.ndarray):
+			h.update('ndarray:%s:%s:' % (obj.dtype.str, obj.shape))
+			h.update(np.ascontiguousarray(obj).tostring())
+		elif isinstance(obj, (bool, np.bool_)):
+			h.update('bool:%r;' % bool(obj))
+		elif isinstance(obj, (int, long, np.integer)):
+			h.update('int:%r;' % int(obj))
+		elif isinstance(obj, (float, np.floating)):
+			h.update('float:%r;' % float(obj))
+		elif isinstance(obj, (complex, np.complexfloating)):
+			h.update('complex:%r;' % complex(obj))
+		elif isinstance(obj, (str, unicode)) or obj is None:
+			h.update('%s:%r;' % (type(obj).__name__, obj))
+		elif isinstance(obj, types.CodeType):
+			h.update('code(')
+			h.update(obj.co_code)
+			self.__hash(h, obj.co_consts, stack)
+			h.update(')')
+		elif isinstance(obj, Quantity):
+			h.update('Quantity(')
+			self.__hash(h, obj.value, stack)
+			h.update(str(obj.units))
+			h.update(')')
+		elif id(obj) in stack:
+			h.update('cycle;')
+		elif isinstance(obj, (types.FunctionType, types.MethodType)):
+			h.update('function(')
+			self.__hash(h, self.__function_identity(obj), stack + (id(obj),))
+			h.update(')')
+		elif isinstance(obj, (type, types.ClassType, types.ModuleType, types.BuiltinFunctionType)):
+			h.update('%s:%s.%s;' % (type(obj).__name__, getattr(obj, '__module__', None), obj.__name__))
+		elif hasattr(obj, '__getstate__') or hasattr(obj, '__dict__'):
+			h.update('%s.%s(' % (type(obj).__module__, type(obj).__name__))
+			self.__hash(h, obj.__getstate__() if hasattr(obj, '__getstate__') else vars(obj), stack + (id(obj),))
+			h.update(')')
+		else:
+			h.update(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+
+	############# STORAGE ##################################################
+
+	def __file(self, key):
+		return os.path.join(self.path, key[:2], key)
+
+	def get(self, key):
+		'''
+		get(key)
+
+		:param key: A key as generated by :func:`key`.
+		:type key: str
+
+		:returns: A two-tuple of a boolean indicating whether the key was found, and the cached result (or None).
+		'''
+		filename = self.__file(key)
+		try:
+			with open(filename, 'rb') as f:
+				result = pickle.load(f)
+		except (IOError, EOFError, pickle.UnpicklingError):
+			return False, None
+		try:
+			os.utime(filename, None)  # Mark as recently used
+		except OSError:
+			pass
+		return True, result
+
+	def set(self, key, result):
+		'''
+		set(key, result)
+
+		:param key: A key as generated by :func:`key`.
+		:type key: str
+		:param result: The (picklable) result to store.
+		:type result: object
+
+		Store a result in the cache, evicting least recently used results if
+		the cache grows larger than :python:`max_size`.
+		'''
+		filename = self.__file(key)
+		if not os.path.exists(os.path.dirname(filename)):
+			try:
+				os.makedirs(os.path.dirname(filename))
+			except OSError:  # Possibly created concurrently
+				pass
+
+		# Write to a temporary file and then rename to avoid partially written results
+		fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename))
+		with os.fdopen(fd, 'wb') as f:
+			pickle.dump(result, f, pickle.HIGHEST_PROTOCOL)
+		replaced = os.path.getsize(filename) if os.path.exists(filename) else 0
+		os.rename(tmp, filename)
+
+		if self.__size is not None:
+			self.__size += os.path.getsize(filename) - replaced
+		if self.size > self.max_size:
+			self.evict()
+
+	def __files(self):
+		for directory, _, filenames in os.walk(self.path):
+			for filename in filenames:
+				yield os.path.join(directory, filename)
+
+	@property
+	def size(self):
+		'''
+		The (approximate) total size in bytes of the cached results.
+		'''
+		if self.__size is None:
+			self.__size = sum(os.path.getsize(filename) for filename in self.__files())
+		return self.__size
+
+	def evict(self, size=None):
+		'''
+		evict(size=None)
+
+		:param size: The size in bytes to which the cache should be reduced. If not
+			specified, :python:`max_size` is used.
+		:type size: None or int
+
+		Remove the least recently used results from the cache until its total size
+		is no greater than :python:`size`.
+		'''
+		size = self.max_size if size is None else size
+		entries = []
+		for filename in self.__files():
+			try:
+				stat = os.stat(filename)
+			except OSError:
+				continue
+			entries.append((stat.st_mtime, stat.st_size, filename))
+
+		total = sum(entry[1] for entry in entries)
+		for _, filesize, filename in sorted(entries):
+			if total <= size:
+				break
+			try:
+				os.remove(filename)
+				total -= filesize
+			except OSError:
+				pass
+		self.__size = total
+
+	def clear(self):
+		'''
+		clear()
+
+		Remove all results from the cache.
+		'''
+		self.evict(size=0)
@@ -0,0 +1,256 @@
+import os
+import types
+import cPickle as pickle
+
+import numpy as np
+
+
+def describe(obj):
+	'''
+	Return a string describing `obj` (such as the ranges or parameter context of a sweep)
+	which is stable between processes and sessions; where functions and classes are
+	described by their module and name, and numpy arrays by their contents.
+	'''
+	if isinstance(obj, dict):
+		return '{%s}' % ', '.join('%s: %s' % (describe(key), describe(value)) for key, value in sorted(obj.items(), key=lambda item: str(item[0])))
+	if isinstance(obj, (list, tuple)):
+		return '%s(%s)' % (type(obj).__name__, ', '.join(describe(item) for item in obj))
+	if isinstance(obj, np.ndarray):
+		return 'array(%s)' % describe(obj.tolist())
+	if isinstance(obj, (float, np.floating)):
+		return repr(float(obj))
+	if isinstance(obj, (types.FunctionType, types.MethodType, types.BuiltinFunctionType, type, types.ClassType)):
+		return '<%s.%s>' % (getattr(obj, '__module__', None), obj.__name__)
+	description = repr(obj)
+	if ' at 0x' in description:  # The default representation, which is not stable
+		return '<%s.%s>' % (type(obj).__module__, type(obj).__name__)
+	return description
+
+
+class SweepCheckpoint(object):
+	'''
+	SweepCheckpoint(path, sync=False)
+
+	:class:`SweepCheckpoint` is an append-only on-disk store of the results of a
+	parameter sweep, which allows an interrupted sweep to be resumed without
+	recomputing the indices that were already completed. It is normally used via the
+	`checkpoint` argument of :class:`RangesIterator`, but can also be used directly
+	to stream the stored results from disk.
+
+	:param path: The directory in which to store the checkpoint (created if necessary).
+	:type path: str
+	:param sync: `True` if every record should be synced to disk using `os.fsync` before
+		being considered complete, and `False` otherwise.
+	:type sync: bool
+
+	The directory contains:
+		- `ranges_eval.npy`: The coordinates of the sweep, as generated by :func:`RangesIterator.ranges_expand`.
+		- `sweep.txt`: A description of the ranges and parameter context of the sweep (see :func:`describe`),
+		  which is used to check that a resumed sweep is the same as the original.
+		- `results.dat`: A stream of pickled two-tuples of indices and results.
+		- `results.idx`: One line per completed record, indicating the indices of the record
+		  and its location in `results.dat`. A record is only considered complete once its line
+		  has been written, so that a record that was only partially written when the
+		  sweep was interrupted is discarded upon resuming.
+
+	Results are never held in memory by the checkpoint, and so can be
+	streamed from disk using:
+
+	>>> for indices, result in checkpoint.results():
+			# Do something here
+
+	Or assembled into an (optionally memory mapped) array using :func:`assemble`.
+	'''
+
+	def __init__(self, path, sync=False):
+		self.path = path
+		self.sync = sync
+
+		self.__records = None
+		self.__f_results = None
+		self.__f_index = None
+
+	@property
+	def path(self):
+		'''
+		The directory in which the checkpoint is stored.
+		'''
+		return self.__path
+	@path.setter
+	def path(self, path):
+		if not os.path.exists(path):
+			os.makedirs(path)
+		self.__path = path
+
+	def __file(self, name):
+		return os.path.join(self.path, name)
+
+	@property
+	def ranges_eval(self):
+		'''
+		The ranges_eval stored in this checkpoint, or None if no sweep has yet been started.
+		'''
+		if os.path.exists(self.__file('ranges_eval.npy')):
+			return np.load(self.__file('ranges_eval.npy'))
+		return None
+	@ranges_eval.setter
+	def ranges_eval(self, ranges_eval):
+		np.save(self.__file('ranges_eval.npy'), ranges_eval)
+
+	@property
+	def sweep(self):
+		'''
+		The description of the sweep stored in this checkpoint, or None if no sweep has yet
+		been started (or the checkpoint predates such descriptions).
+		'''
+		if os.path.exists(self.__file('sweep.txt')):
+			with open(self.__file('sweep.txt'), 'r') as f:
+				return f.read()
+		return None
+	@sweep.setter
+	def sweep(self, sweep):
+		with open(self.__file('sweep.txt'), 'w') as f:
+			f.write(sweep)
+
+	def __load(self):
+		if self.__records is not None:
+			return
+
+		self.__records = {}
+		end = 0
+		if os.path.exists(self.__file('results.idx')):
+			with open(self.__file('results.idx'), 'r') as f:
+				for line in f:
+					if not line.endswith('\n'):  # Incomplete record
+						break
+					offset, length, indices = line.split()
+					offset, length = int(offset), int(length)
+					self.__records[tuple(int(i) for i in indices.split(','))] = offset
+					end = max(end, offset + length)
+
+		# Discard any partially written results, and any incomplete index line
+		if os.path.exists(self.__file('results.dat')):
+			with open(self.__file('results.dat'), 'r+b') as f:
+				f.truncate(end)
+		if os.path.exists(self.__file('results.idx')):
+			with open(self.__file('results.idx'), 'r+b') as f:
+				content = f.read()
+				f.truncate(content.rfind('\n') + 1)
+
+	@property
+	def completed(self):
+		'''
+		The set of indices for which results have been stored.
+		'''
+		self.__load()
+		return set(self.__records)
+
+	def __len__(self):
+		self.__load()
+		return len(self.__records)
+
+	def __contains__(self, indices):
+		self.__load()
+		return tuple(indices) in self.__records
+
+	def append(self, indices, result):
+		'''
+		append(indices, result)
+
+		:param indices: The indices of the result in the sweep.
+		:type indices: tuple
+		:param result: The (picklable) result to store.
+		:type result: object
+
+		Append a result to the store.
+		'''
+		self.__load()
+		if self.__f_results is None:
+			self.__f_results = open(self.__file('results.dat'), 'ab')
+			self.__f_index = open(self.__file('results.idx'), 'a')
+
+		self.__f_results.seek(0, os.SEEK_END)
+		offset = self.__f_results.tell()
+		pickle.dump((tuple(indices), result), self.__f_results, pickle.HIGHEST_PROTOCOL)
+		self.__flush(self.__f_results)
+
+		self.__f_index.write("%d %d %s\n" % (offset, self.__f_results.tell() - offset, ','.join(str(i) for i in indices)))
+		self.__flush(self.__f_index)
+
+		self.__records[tuple(indices)] = offset
+
+	def __flush(self, f):
+		f.flush()
+		if self.sync:
+			os.fsync(f.fileno())
+
+	def results(self):
+		'''
+		results()
+
+		:returns: A generator of two-tuples of indices and results, as read from disk.
+		'''
+		self.__load()
+		if len(self.__records) == 0:
+			return
+		if self.__f_results is not None:
+			self.__f_results.flush()
+		with open(self.__file('results.dat'), 'rb') as f:
+			for offset in sorted(self.__records.values()):
+				f.seek(offset)
+				yield pickle.load(f)
+
+	def assemble(self, shape=(), dtype=float, filename=None, fill=None, output=None):
+		'''
+		assemble(shape=(), dtype=float, filename=None, fill=None, output=None)
+
+		:param shape: The shape of each stored result.
+		:type shape: tuple or int
+		:param dtype: The numpy dtype of the results.
+		:type dtype: numpy.dtype or type
+		:param filename: An (optional) filename at which to store the output using `numpy.memmap`.
+		:type filename: None or str
+		:param fill: The value used for indices which have not been computed. Defaults
+			to `nan` for floating point and complex types, and `0` otherwise.
+		:type fill: object
+		:param output: An (optional) existing array into which results should be written,
+			in which case the previous arguments are ignored.
+		:type output: numpy.ndarray
+
+		:returns: A numpy.ndarray (or numpy.memmap) of shape `ranges_eval.shape + shape` populated
+			with the results stored in this checkpoint.
+
+		Results are streamed from disk one at a time, so if `filename` is provided,
+		results need never fit in memory.
+		'''
+		if output is None:
+			if isinstance(shape, int):
+				shape = (shape,)
+			shape = self.ranges_eval.shape + tuple(shape)
+			if filename is not None:
+				output = np.memmap(filename, dtype=dtype, mode='w+', shape=shape)
+			else:
+				output = np.zeros(shape, dtype=dtype)
+			if fill is None:
+				fill = np.nan if np.issubdtype(output.dtype, np.inexact) else 0
+			output.fill(fill)
+
+		for indices, result in self.results():
+			output[indices] = result
+
+		if isinstance(output, np.memmap):
+			output.flush()
+
+		return output
+
+	def close(self):
+		'''
+		close()
+
+		Close any files opened for appending by this checkpoint.
+		'''
+		if self.__f_results is not None:
+			self.__f_results.close()
+			self.__f_index.close()
+			self.__f_results = None
+			self.__f_index = None
@@ -0,0 +1,198 @@
+import heapq
+
+import numpy as np
+
+from .telemetry import TelemetrySink
+
+
+class CostModel(object):
+	'''
+	CostModel(degree=1, ridge=1e-3)
+
+	:class:`CostModel` learns the cost (wall time) of evaluating the function of a
+	sweep as a function of the values of the swept parameters, from the observed
+	durations of previously evaluated tasks. It is normally used via the `cost_model`
+	argument of :class:`RangesIterator`, which uses its predictions to dispatch the most
+	expensive tasks first, and to estimate the wall time of a sweep (see
+	:func:`RangesIterator.estimate`).
+
+	:param degree: The degree of the polynomial (in each of the swept parameters) used to
+		model the logarithm of the duration of a task.
+	:type degree: int
+	:param ridge: The strength of the regularisation of the fit, which keeps the model
+		well-behaved when there are few observations.
+	:type ridge: float
+
+	The logarithm of the duration is modelled (rather than the duration itself) so
+	that predictions are always positive, and so that costs which grow rapidly with a
+	parameter (such as the size of a matrix) are captured by low order polynomials. To
+	avoid wild extrapolation, predictions are restricted to within an order of magnitude
+	of the range of observed durations.
+
+	For example:
+
+	>>> model = CostModel()
+	>>> model.observe(ranges_eval[(0,)], 0.1)
+	>>> model.observe(ranges_eval[(1,)], 2.0)
+	>>> model.predict(ranges_eval)  # The predicted duration of every configuration in ranges_eval
+
+	Observations are associated with the names of the swept parameters, and are
+	discarded if a sweep over a different set of parameters is observed.
+	'''
+
+	EXTRAPOLATION = np.log(10.)
+
+	def __init__(self, degree=1, ridge=1e-3):
+		self.degree = degree
+		self.ridge = ridge
+		self.reset()
+
+	def reset(self):
+		'''
+		reset()
+
+		Discard all observations.
+		'''
+		self.names = None
+		self.__values = []
+		self.__durations = []
+		self.__fit = None
+
+	@property
+	def observations(self):
+		'''
+		The number of parameter configurations for which durations have been observed.
+		'''
+		return len(self.__durations)
+
+	def __rows(self, values):
+		return np.array([[float(np.real(row[name])) for name in self.names] for row in values], dtype=float).reshape(len(values), len(self.names))
+
+	def observe(self, values, duration):
+		'''
+		observe(values, duration)
+
+		:param values: A structured array of one or more parameter configurations (such as
+			entries of a `ranges_eval`) which were evaluated together.
+		:type values: numpy.ndarray
+		:param duration: The wall time in seconds taken to evaluate them.
+		:type duration: float
+
+		Record the duration of a task. If the task evaluated multiple configurations, the
+		duration is shared equally between them.
+		'''
+		values = np.atleast_1d(values)
+		if len(values) == 0:
+			return
+		if values.dtype.names != self.names:
+			self.reset()
+			self.names = values.dtype.names
+		share = max(float(duration) / len(values), 1e-9)
+		self.__values.extend(self.__rows(values).tolist())
+		self.__durations.extend([share] * len(values))
+		self.__fit = None
+
+	def __features(self, X, mean, scale):
+		Z = (X - mean) / scale
+		return np.hstack([np.ones((X.shape[0], 1))] + [Z ** k for k in range(1, self.degree + 1)])
+
+	def __get_fit(self):
+		if self.__fit is None:
+			X = np.array(self.__values, dtype=float)
+			y = np.log(self.__durations)
+			mean = X.mean(axis=0)
+			scale = X.std(axis=0)
+			scale[scale == 0] = 1.
+			F = self.__features(X, mean, scale)
+			coefficients = np.linalg.solve(F.T.dot(F) + self.ridge * len(y) * np.eye(F.shape[1]), F.T.dot(y))
+			self.__fit = (mean, scale, coefficients, y.min() - self.EXTRAPOLATION, y.max() + self.EXTRAPOLATION)
+		return self.__fit
+
+	def predict(self, values):
+		'''
+		predict(values)
+
+		:param values: A structured array of parameter configurations.
+		:type values: numpy.ndarray
+
+		:returns: An array of the predicted duration in seconds of each configuration, or None if
+			there are no observations for the parameters of `values`.
+		'''
+		values = np.atleast_1d(values)
+		if self.observations == 0 or values.dtype.names != self.names:
+			return None
+		mean, scale, coefficients, lower, upper = self.__get_fit()
+		return np.exp(np.clip(self.__features(self.__rows(values), mean, scale).dot(coefficients), lower, upper))
+
+	def sink(self, ranges_eval, batch=False):
+		'''
+		sink(ranges_eval, batch=False)
+
+		:param ranges_eval: The `ranges_eval` into which the indices of tasks point.
+		:type ranges_eval: numpy.ndarray
+		:param batch: `True` if each task evaluates a batch of indices.
+		:type batch: bool
+
+		:returns: A :class:`TelemetrySink` which records the duration of every task in this model.
+		'''
+		return CostModelSink(self, ranges_eval, batch=batch)
+
+
+class CostModelSink(TelemetrySink):
+	'''
+	CostModelSink(model, ranges_eval, batch=False)
+
+	A :class:`TelemetrySink` which records the duration of each task in a :class:`CostModel`
+	(see :func:`CostModel.sink`).
+	'''
+
+	def __init__(self, model, ranges_eval, batch=False):
+		self.model = model
+		self.ranges_eval = ranges_eval
+		self.batch = batch
+
+	def task(self, stats):
+		indices = stats['indices'] if self.batch else [stats['indices']]
+		self.model.observe(self.ranges_eval[tuple(np.array(indices).T)], stats['duration'])
+
+
+def lpt_order(costs):
+	'''
+	Return the positions of `costs` in the order in which they should be dispatched
+	according to the longest-processing-time-first rule (the most expensive first).
+	'''
+	return np.argsort(-np.asarray(costs), kind='mergesort')
+
+
+def cost_chunks(costs, size):
+	'''
+	Return a list of lists of positions in `costs`, grouped into chunks of at most `size`
+	positions in longest-processing-time-first order, such that expensive positions are
+	placed in small chunks and cheap positions in large ones. Each chunk is filled until
+	its cost would exceed that of a chunk of `size` positions of average cost.
+	'''
+	costs = np.asarray(costs, dtype=float)
+	target = costs.sum() / int(np.ceil(len(costs) / float(size)))
+	chunks = []
+	chunk, chunk_cost = [], 0.
+	for position in lpt_order(costs):
+		if len(chunk) > 0 and (len(chunk) >= size or chunk_cost + costs[position] > target * (1 + 1e-9)):
+			chunks.append(chunk)
+			chunk, chunk_cost = [], 0.
+		chunk.append(position)
+		chunk_cost += costs[position]
+	if len(chunk) > 0:
+		chunks.append(chunk)
+	return chunks
+
+
+def lpt_makespan(costs, workers):
+	'''
+	Return the total wall time taken to evaluate tasks with the provided `costs` on
+	`workers` workers, if the tasks are dispatched in longest-processing-time-first order
+	to whichever worker is next free.
+	'''
+	finish = [0.] * max(1, workers)
+	for cost in np.sort(np.asarray(costs, dtype=float))[::-1]:
+		heapq.heapreplace(finish, finish[0] + cost)
+	return max(finish)
@@ -0,0 +1,771 @@
+import collections
+import multiprocessing
+import os
+import Queue
+import resource
+import socket
+import sys
+import threading
+import time
+import traceback
+import types
+import warnings
+from multiprocessing.connection import Listener, Client
+
+from .. import errors
+
+
+def task_stats(worker, start):
+	'''
+	Return a dictionary of statistics for a task evaluated by `worker`, which started
+	at time `start` (see :class:`Telemetry`).
+	'''
+	end = time.time()
+	return {'worker': worker, 'start': start, 'duration': end - start, 'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+
+
+def evaluate(function, args, kwargs, worker=None):
+	'''
+	Evaluate `function` with the provided `args` and `kwargs`, returning a three-tuple
+	of a boolean indicating success, either the result or the formatted traceback, and
+	a dictionary of statistics about the evaluation (see :class:`Telemetry`).
+	'''
+	start = time.time()
+	try:
+		success, value = True, function(*args, **kwargs)
+	except Exception:
+		success, value = False, traceback.format_exc()
+	return success, value, task_stats(worker, start)
+
+
+def worker_count(count=None):
+	'''
+	Return the number of workers to use given a count which is either None (use
+	all CPUs), positive (use that many workers) or negative (leave that many CPUs free).
+	'''
+	if count is None:
+		return multiprocessing.cpu_count()
+	if count < 0:
+		return max(1, multiprocessing.cpu_count() + count)
+	return count
+
+
+def merge_kwargs(base, kwargs):
+	'''
+	Return the keyword arguments `base` updated by `kwargs`, where if both provide a
+	dictionary for the same keyword (such as `params`), the dictionaries are merged.
+	'''
+	merged = base.copy()
+	for key, value in kwargs.items():
+		if isinstance(value, dict) and isinstance(merged.get(key), dict):
+			nested = merged[key].copy()
+			nested.update(value)
+			value = nested
+		merged[key] = value
+	return merged
+
+
+def _identical(a, b):
+	'''
+	Return `True` if `a` and `b` are the same object, are methods of the same function
+	bound to the same object, or are tuples or dictionaries with identical items
+	(comparing nested dictionaries in the same way).
+	'''
+	if a is b:
+		return True
+	if isinstance(a, types.MethodType) and isinstance(b, types.MethodType):
+		return a.im_func is b.im_func and a.im_self is b.im_self
+	if isinstance(a, tuple) and isinstance(b, tuple):
+		return len(a) == len(b) and all(_identical(x, y) for x, y in zip(a, b))
+	if isinstance(a, dict) and isinstance(b, dict):
+		return len(a) == len(b) and all(key in b and _identical(value, b[key]) for key, value in a.items())
+	return False
+
+
+class ContextFunction(object):
+	'''
+	ContextFunction(function, args=(), kwargs={})
+
+	A callable which evaluates `function` with the positional arguments of each
+	call followed by `args`, and with the keyword arguments `kwargs` updated by those
+	of each call (see :func:`merge_kwargs`). Executors use this to bind the context
+	common to all tasks to the function, so that it is transferred to each worker
+	only once, and tasks carry only what differs between them. Instances are
+	picklable if `function` and the context are picklable.
+	'''
+
+	def __init__(self, function, args=(), kwargs={}):
+		self.function = function
+		self.args = tuple(args)
+		self.kwargs = kwargs
+
+	def __call__(self, *args, **kwargs):
+		return self.function(*(args + self.args), **merge_kwargs(self.kwargs, kwargs))
+
+
+def _get(queue, timeout=1.):
+	'''
+	Block until an item is available in `queue`. In Python 2, a blocking `get`
+	without a timeout cannot be interrupted, and so we poll instead.
+	'''
+	while True:
+		try:
+			return queue.get(timeout=timeout)
+		except Queue.Empty:
+			pass
+
+
+class Executor(object):
+	'''
+	Executor(function=None, **kwargs)
+
+	:class:`Executor` is the interface implemented by the backends which evaluate
+	the function of a :class:`RangesIterator` for each of its parameter configurations.
+	Its use looks like:
+
+	>>> executor = ThreadExecutor(function=f, nthreads=4)
+	>>> executor.submit((0,), args=(), kwargs={'params': {'x': 1}})
+	>>> executor.submit((1,), args=(), kwargs={'params': {'x': 2}})
+	>>> for indices, result in executor.iterate():
+			# Do something here
+	>>> executor.shutdown()
+
+	:func:`iterate` yields two-tuples of indices and results in the order in which tasks
+	complete, and returns once all submitted tasks have completed. If a task raises an
+	exception, a :class:`TaskExecutionError` is raised. Executors can be reused for
+	multiple rounds of submission and iteration, and can be used as context managers, in
+	which case :func:`shutdown` is called upon exiting the context.
+
+	:param function: The function to evaluate for each task.
+	:type function: callable
+	:param kwargs: Keyword arguments passed on to the `init` method of subclasses.
+	:type kwargs: dict
+
+	If the `telemetry` attribute is set to a :class:`Telemetry` instance, the statistics
+	of each task are recorded in it as the task's result is yielded.
+
+	Arguments common to all tasks (such as the base parameter context of a sweep)
+	should be set as the :func:`context` of the executor, rather than being passed with
+	every task. The context is transferred to each worker only once, and merged with
+	the arguments of each task in the worker.
+
+	Subclasses should implement `init`, `submit` and `iterate`, and if necessary
+	`shutdown`. Subclasses should evaluate the function returned by `_bound_function`
+	(which binds the context to the function), call `_track` upon submission of a task,
+	and pass the outcome of each task through `_result`. Subclasses which must act
+	when the function or context changes can override `_changed`. The class attribute `shared_memory` should be `True` if tasks are
+	evaluated in a thread or forked process of the current process, such that
+	memory allocated as shared before iteration is visible to the function.
+	'''
+
+	shared_memory = False
+
+	def __init__(self, function=None, **kwargs):
+		self.function = function
+		self.context = None
+		self.telemetry = None
+		self._submitted = {}
+		self.init(**kwargs)
+
+	def init(self):
+		pass
+
+	@property
+	def function(self):
+		'''
+		The function evaluated for each task.
+
+		You can change the function using:
+
+		>>> executor.function = <callable>
+
+		Setting the current function again (as happens when an executor is reused for
+		multiple sweeps) has no effect, so that workers need not be restarted or updated.
+		'''
+		return self._function
+	@function.setter
+	def function(self, function):
+		changed = not hasattr(self, '_function') or not _identical(function, self._function)
+		self._function = function
+		if changed:
+			self._changed()
+
+	@property
+	def context(self):
+		'''
+		A two-tuple of the positional and keyword arguments common to all tasks (or None).
+		The positional arguments of each task are followed by those of the context, and
+		the keyword arguments of each task update those of the context (where dictionaries
+		provided for the same keyword are merged; see :func:`merge_kwargs`).
+
+		You can change the context using:
+
+		>>> executor.context = (<args>, <kwargs>)
+
+		Setting a context whose items are identical to those of the current context has
+		no effect, so that workers need not be restarted or updated.
+		'''
+		return self._context
+	@context.setter
+	def context(self, context):
+		if context is not None:
+			context = (tuple(context[0]), dict(context[1]))
+		changed = not _identical(context, getattr(self, '_context', None))
+		self._context = context
+		if changed:
+			self._changed()
+
+	def _changed(self):
+		self._bound = None
+
+	def _bound_function(self):
+		'''
+		Return the function with the current context bound to it (see :class:`ContextFunction`).
+		The same object is returned until the function or context changes.
+		'''
+		if self._bound is None:
+			self._bound = self.function if self.context is None else ContextFunction(self.function, *self.context)
+		return self._bound
+
+	def submit(self, indices, args=(), kwargs={}):
+		'''
+		submit(indices, args=(), kwargs={})
+
+		:param indices: The indices used to identify the task.
+		:type indices: tuple
+		:param args: The positional arguments to pass to the function.
+		:type args: tuple
+		:param kwargs: The keyword arguments to pass to the function.
+		:type kwargs: dict
+
+		Submit a task for evaluation.
+		'''
+		raise NotImplementedError
+
+	def iterate(self):
+		'''
+		iterate()
+
+		:returns: A generator of two-tuples of indices and results for all submitted tasks, in order of completion.
+		'''
+		raise NotImplementedError
+
+	def shutdown(self):
+		'''
+		shutdown()
+
+		Release all resources (such as worker processes) held by this executor.
+		'''
+		pass
+
+	def map(self, tasks):
+		'''
+		map(tasks)
+
+		:param tasks: A sequence of three-tuples of indices, args and kwargs.
+		:type tasks: iterable
+
+		:returns: A list of two-tuples of indices and results, in order of completion.
+		'''
+		for indices, args, kwargs in tasks:
+			self.submit(indices, args, kwargs)
+		return list(self.iterate())
+
+	def _track(self, indices):
+		if self.telemetry is not None:
+			self._submitted[indices] = time.time()
+
+	def _result(self, indices, success, value, stats=None):
+		if not success:
+			raise errors.TaskExecutionError("Task with indices %s failed with:\n%s" % (indices, value), failures={indices: value})
+		if self.telemetry is not None:
+			submitted = self._submitted.pop(indices, None)
+			if stats is not None and submitted is not None:
+				stats['wait'] = max(0., stats['start'] - submitted)
+			self.telemetry.record(indices, stats)
+		return (indices, value)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, type, value, traceback):
+		self.shutdown()
+
+
+class SerialExecutor(Executor):
+	'''
+	SerialExecutor(function=None)
+
+	An :class:`Executor` which evaluates tasks one at a time in the current thread.
+	'''
+
+	shared_memory = True
+
+	def init(self):
+		self.__tasks = collections.deque()
+
+	def submit(self, indices, args=(), kwargs={}):
+		self._track(indices)
+		self.__tasks.append((indices, args, kwargs))
+
+	def iterate(self):
+		while len(self.__tasks) > 0:
+			indices, args, kwargs = self.__tasks.popleft()
+			yield self._result(indices, *evaluate(self._bound_function(), args, kwargs, worker=os.getpid()))
+
+
+class ThreadExecutor(Executor):
+	'''
+	ThreadExecutor(function=None, nthreads=None)
+
+	An :class:`Executor` which evaluates tasks in a pool of threads. This is useful
+	when the function spends most of its time waiting on I/O (such as on external
+	solvers or files), or in code which releases the GIL (such as many numpy operations).
+
+	:param nthreads: The number of threads (see :func:`worker_count`).
+	:type nthreads: None or int
+	'''
+
+	shared_memory = True
+
+	def init(self, nthreads=None):
+		self.nthreads = worker_count(nthreads)
+		self.__tasks = Queue.Queue()
+		self.__results = Queue.Queue()
+		self.__threads = []
+		self.__pending = 0
+
+	def __work(self):
+		while True:
+			task = self.__tasks.get()
+			if task is None:
+				break
+			indices, args, kwargs = task
+			self.__results.put((indices,) + evaluate(self._bound_function(), args, kwargs, worker=threading.current_thread().name))
+
+	def submit(self, indices, args=(), kwargs={}):
+		while len(self.__threads) < self.nthreads:
+			thread = threading.Thread(target=self.__work)
+			thread.daemon = True
+			thread.start()
+			self.__threads.append(thread)
+		self._track(indices)
+		self.__tasks.put((indices, args, kwargs))
+		self.__pending += 1
+
+	def iterate(self):
+		while self.__pending > 0:
+			result = _get(self.__results)
+			self.__pending -= 1
+			yield self._result(*result)
+
+	def shutdown(self):
+		for _ in self.__threads:
+			self.__tasks.put(None)
+		for thread in self.__threads:
+			thread.join()
+		self.__threads = []
+
+
+def _process_worker(function, q_in, q_out):
+	warnings.simplefilter("ignore")
+	worker = os.getpid()
+	while True:
+		task = q_in.get()
+		if task is None:
+			break
+		indices, args, kwargs = task
+		q_out.put((indices,) + evaluate(function, args, kwargs, worker=worker))
+
+
+class ProcessExecutor(Executor):
+	'''
+	ProcessExecutor(function=None, nprocs=None)
+
+	An :class:`Executor` which evaluates tasks in a pool of persistent forked
+	worker processes. The function and context are inherited by the workers when they
+	are forked, and so need not be picklable (though the arguments and results of tasks
+	must be). If the function or context is changed, the workers are restarted.
+
+	:param nprocs: The number of worker processes (see :func:`worker_count`).
+	:type nprocs: None or int
+	'''
+
+	shared_memory = True
+
+	def init(self, nprocs=None):
+		self.nprocs = worker_count(nprocs)
+		self.__tasks = []
+		self.__procs = []
+		self.__procs_function = None
+
+	def __start(self):
+		function = self._bound_function()
+		if len(self.__procs) > 0 and self.__procs_function is function:
+			return
+		self.shutdown()
+		self.__q_in = multiprocessing.Queue()
+		self.__q_out = multiprocessing.Queue()
+		for _ in range(self.nprocs):
+			proc = multiprocessing.Process(target=_process_worker, args=(function, self.__q_in, self.__q_out))
+			proc.daemon = True
+			proc.start()
+			self.__procs.append(proc)
+		self.__procs_function = function
+
+	def submit(self, indices, args=(), kwargs={}):
+		self._track(indices)
+		self.__tasks.append((indices, args, kwargs))
+
+	def iterate(self):
+		if len(self.__tasks) == 0:
+			return
+		self.__start()
+
+		pending = len(self.__tasks)
+		for task in self.__tasks:
+			self.__q_in.put(task)
+		self.__tasks = []
+
+		while pending > 0:
+			try:
+				result = self.__q_out.get(timeout=1.)
+			except Queue.Empty:
+				for proc in self.__procs:
+					if proc.exitcode is not None:
+						self.shutdown()
+						raise errors.TaskExecutionError("Worker process %d exited unexpectedly with code %s." % (proc.pid, proc.exitcode))
+				continue
+			pending -= 1
+			yield self._result(*result)
+
+	def shutdown(self):
+		for proc in self.__procs:
+			if proc.is_alive():
+				self.__q_in.put(None)
+		for proc in self.__procs:
+			proc.join(1.)
+			if proc.is_alive():
+				proc.terminate()
+		self.__procs = []
+		self.__procs_function = None
+
+
+class AsyncExecutor(Executor):
+	'''
+	AsyncExecutor(function=None, nprocs=None, spawnonce=True, timeout=None, retries=0, speculative=None)
+
+	An :class:`Executor` which evaluates tasks using :class:`AsyncParallelMap`. This
+	is the default backend when :class:`RangesIterator` is used with multiple processes.
+
+	:param nprocs: The number of processes (see :func:`worker_count`).
+	:type nprocs: None or int
+	:param spawnonce: Whether a new process should be forked for each task.
+	:type spawnonce: bool
+	:param timeout: The number of seconds after which a running task is killed and treated
+		as having failed (or None for no limit).
+	:type timeout: None or float
+	:param retries: The number of times a failed (or timed out) task is resubmitted to a
+		fresh worker process.
+	:type retries: int
+	:param speculative: If not None, re-execute in-flight tasks which have been running for
+		more than this multiple of the median task duration once no tasks remain to be
+		dispatched, using whichever result arrives first.
+	:type speculative: None or float
+
+	Mitigating stragglers in this way is useful when the tail of a sweep is dominated by a
+	few hung or slow evaluations. For example:
+
+	>>> executor = AsyncExecutor(nprocs=8, timeout=600, retries=2, speculative=3)
+	>>> RangesIterator(p, ranges, function=f, executor=executor)
+
+	Tasks which still fail are reported, once all other results have been yielded, by a
+	:class:`TaskExecutionError` whose `failures` attribute maps their indices to the reason
+	for their failure.
+	'''
+
+	shared_memory = True
+
+	def init(self, nprocs=None, spawnonce=True, timeout=None, retries=0, speculative=None):
+		self.nprocs = nprocs
+		self.spawnonce = spawnonce
+		self.timeout = timeout
+		self.retries = retries
+		self.speculative = speculative
+		self.__tasks = []
+
+	def submit(self, indices, args=(), kwargs={}):
+		self.__tasks.append((indices, args, kwargs))
+
+	def iterate(self):
+		from .symmetric import AsyncParallelMap
+		tasks, self.__tasks = self.__tasks, []
+		if len(tasks) == 0:
+			return
+		apm = AsyncParallelMap(self._bound_function(), progress=False, nprocs=self.nprocs, spawnonce=self.spawnonce,
+								timeout=self.timeout, retries=self.retries, speculative=self.speculative)
+		for indices, result in apm.iterate(tasks):
+			yield self._result(indices, True, result)
+
+
+class DispyExecutor(Executor):
+	'''
+	DispyExecutor(function=None, retries=0, **cluster_opts)
+
+	An :class:`Executor` which evaluates tasks on dispynode servers using
+	:class:`DistributedParallelMap`. The `dispy` module is required. Since dispy
+	transfers the arguments of each job separately, the context is merged into the
+	arguments of each task before submission.
+
+	:param retries: The number of times a failed job is resubmitted.
+	:type retries: int
+	:param cluster_opts: Keyword arguments to pass on to `dispy.JobCluster`.
+	:type cluster_opts: dict
+	'''
+
+	def init(self, retries=0, **cluster_opts):
+		self.retries = retries
+		self.cluster_opts = cluster_opts
+		self.__tasks = []
+
+	def submit(self, indices, args=(), kwargs={}):
+		self.__tasks.append((indices, args, kwargs))
+
+	def iterate(self):
+		from .symmetric import DistributedParallelMap
+		tasks, self.__tasks = self.__tasks, []
+		if len(tasks) == 0:
+			return
+		if self.context is not None:
+			args, kwargs = self.context
+			tasks = [(indices, task_args + args, merge_kwargs(kwargs, task_kwargs)) for indices, task_args, task_kwargs in tasks]
+		dpm = DistributedParallelMap(self.function, progress=False, retries=self.retries, **self.cluster_opts)
+		for indices, result in dpm.iterate(tasks):
+			yield self._result(indices, True, result)
+
+
+def serve(address, authkey):
+	'''
+	serve(address, authkey)
+
+	:param address: The (host, port) address of a :class:`ClusterExecutor` coordinator.
+	:type address: tuple
+	:param authkey: The authentication key shared with the coordinator.
+	:type authkey: str
+
+	Run a worker daemon, which connects to a :class:`ClusterExecutor` coordinator
+	and evaluates tasks until the coordinator shuts down. This can also be started
+	from the command line using:
+
+	$ python2 -m parampy.utility.executors <host>:<port> <authkey>
+	'''
+	conn = Client(tuple(address), authkey=authkey)
+	worker = '%s:%d' % (socket.gethostname(), os.getpid())
+	function = None
+	function_error = None
+	try:
+		while True:
+			try:
+				message = conn.recv()
+			except (EOFError, IOError):
+				break
+			except Exception:  # Most likely the function could not be unpickled
+				function, function_error = None, traceback.format_exc()
+				continue
+
+			if message[0] == 'function':
+				function, function_error = message[1], None
+			elif message[0] == 'task':
+				indices, args, kwargs = message[1:]
+				if function_error is not None:
+					conn.send((indices, False, function_error, None))
+				else:
+					conn.send((indices,) + evaluate(function, args, kwargs, worker=worker))
+			else:
+				break
+	finally:
+		conn.close()
+
+
+class ClusterExecutor(Executor):
+	'''
+	ClusterExecutor(function=None, address=('localhost', 0), authkey=None, workers=0, connect_timeout=60.)
+
+	An :class:`Executor` which acts as a coordinator for worker daemons (see :func:`serve`)
+	running on any number of hosts, which connect to it over TCP. Tasks are handed out to
+	workers as they become free, and tasks held by a worker which disconnects are
+	handed to another worker. Since the function (along with the context) is sent to
+	each worker once, it must be picklable (i.e. defined at the top level of an
+	importable module).
+
+	:param address: The (host, port) address on which to listen for workers. If the port
+		is `0`, a free port is chosen, and can be read from :python:`executor.address`.
+	:type address: tuple
+	:param authkey: The authentication key which workers must present. If not specified,
+		a random key is generated, and can be read from :python:`executor.authkey`.
+	:type authkey: None or str
+	:param workers: The number of worker daemons to spawn on the local host.
+	:type workers: int
+	:param connect_timeout: The number of seconds for which tasks may wait while no workers
+		are connected (such as before any have connected, or after all have disconnected),
+		after which the outstanding tasks are abandoned and a :class:`TaskExecutionError` is raised.
+	:type connect_timeout: float
+
+	For example, to run a sweep on two remote hosts:
+
+	>>> executor = ClusterExecutor(address=('0.0.0.0', 6000), authkey='secret')
+	>>> RangesIterator(p, ranges, function=f, executor=executor)
+
+	And then on each of the remote hosts:
+
+	$ python2 -m parampy.utility.executors <coordinator host>:6000 secret
+	'''
+
+	def init(self, address=('localhost', 0), authkey=None, workers=0, connect_timeout=60.):
+		self.connect_timeout = connect_timeout
+		self.authkey = authkey if authkey is not None else os.urandom(16).encode('hex')
+		self.__listener = Listener(tuple(address), authkey=self.authkey)
+		self.__tasks = Queue.Queue()
+		self.__results = Queue.Queue()
+		self.__pending = 0
+		self.__connections = 0
+		self.__connections_lock = threading.Lock()
+		self.__local = []
+
+		thread = threading.Thread(target=self.__accept)
+		thread.daemon = True
+		thread.start()
+
+		self.spawn_local(workers)
+
+	@property
+	def address(self):
+		'''
+		The (host, port) address on which the coordinator is listening for workers.
+		'''
+		return self.__listener.address
+
+	def _changed(self):
+		Executor._changed(self)
+		self._function_version = getattr(self, '_function_version', 0) + 1
+
+	def spawn_local(self, count):
+		'''
+		spawn_local(count)
+
+		:param count: The number of worker daemons to spawn.
+		:type count: int
+
+		Spawn worker daemons on the local host, which is useful for testing, and for making
+		use of the coordinating host.
+		'''
+		for _ in range(count):
+			proc = multiprocessing.Process(target=serve, args=(self.address, self.authkey))
+			proc.daemon = True
+			proc.start()
+			self.__local.append(proc)
+
+	def __accept(self):
+		while True:
+			try:
+				conn = self.__listener.accept()
+			except Exception:
+				break
+			with self.__connections_lock:
+				self.__connections += 1
+			thread = threading.Thread(target=self.__handle, args=(conn,))
+			thread.daemon = True
+			thread.start()
+
+	def __handle(self, conn):
+		version = None
+		try:
+			while True:
+				task = self.__tasks.get()
+				if task is None:
+					conn.send(('stop',))
+					break
+				try:
+					if version != self._function_version:
+						version = self._function_version
+						conn.send(('function', self._bound_function()))
+					conn.send(('task',) + task)
+					result = conn.recv()
+				except (EOFError, IOError):  # Worker disconnected; requeue task for another worker
+					self.__tasks.put(task)
+					break
+				except Exception:  # Most likely, the function could not be pickled
+					result = (task[0], False, traceback.format_exc(), None)
+				self.__results.put(result)
+		finally:
+			with self.__connections_lock:
+				self.__connections -= 1
+			conn.close()
+
+	def submit(self, indices, args=(), kwargs={}):
+		self._track(indices)
+		self.__tasks.put((indices, args, kwargs))
+		self.__pending += 1
+
+	def iterate(self):
+		disconnected = None
+		while self.__pending > 0:
+			try:
+				result = self.__results.get(timeout=min(1., self.connect_timeout))
+			except Queue.Empty:
+				with self.__connections_lock:
+					connections = self.__connections
+				if connections > 0:
+					disconnected = None
+				elif disconnected is None:
+					disconnected = time.time()
+				elif time.time() - disconnected > self.connect_timeout:
+					self.__abandon()
+					raise errors.TaskExecutionError("No workers have been connected to the coordinator at %s:%s for %g seconds." % (tuple(self.address) + (self.connect_timeout,)))
+				continue
+			self.__pending -= 1
+			yield self._result(*result)
+
+	def __abandon(self):
+		'''
+		Discard all tasks which have not yet been handed to a worker.
+		'''
+		while True:
+			try:
+				self.__tasks.get_nowait()
+			except Queue.Empty:
+				break
+		self.__pending = 0
+
+	def shutdown(self):
+		with self.__connections_lock:
+			connections = self.__connections
+		for _ in range(connections):
+			self.__tasks.put(None)
+		try:
+			self.__listener.close()
+		except Exception:
+			pass
+		for proc in self.__local:
+			proc.join(1.)
+			if proc.is_alive():
+				proc.terminate()
+		self.__local = []
+
+
+EXECUTORS = {
+	'serial': SerialExecutor,
+	'thread': ThreadExecutor,
+	'process': ProcessExecutor,
+	'async': AsyncExecutor,
+	'dispy': DispyExecutor,
+	'cluster': ClusterExecutor,
+}
+
+
+if __name__ == '__main__':
+	if len(sys.argv) != 3:
+		sys.stderr.write("Usage: python2 -m parampy.utility.executors <host>:<port> <authkey>\n")
+		sys.exit(1)
+	host, port = sys.argv[1].rsplit(':', 1)
+	serve((host, int(port)), sys.argv[2])
@@ -4,11 +4,23 @@
 
 #WARNING: This module is currently under development.
 
-import Queue
+import collections
 import multiprocessing, traceback, logging, resource
 import sys, gc
+import select
+import time
 import warnings
 import datetime
+import threading
+
+import numpy as np
+
+from .. import errors
+
+try:
+	import dispy
+except ImportError:
+	dispy = None
 
 heap = None
 def set_heap(hp):
@@ -25,22 +37,49 @@ def error(msg, *args):
 def warn(msg, *args):
 	return multiprocessing.get_logger().warn(msg, *args)
 
+def shared_array(shape, dtype=float, filename=None):
+	'''
+	Return a numpy array which is shared with any processes forked after its
+	creation, so that writes made in child processes are visible in the parent.
+	If `filename` is provided, the array is backed by a `numpy.memmap` at that
+	location; otherwise it is backed by anonymous shared memory.
+	'''
+	if filename is not None:
+		return np.memmap(filename, dtype=dtype, mode='w+', shape=shape)
+	dtype = np.dtype(dtype)
+	size = int(np.prod(shape)) * dtype.itemsize
+	buffer = multiprocessing.RawArray('b', max(size, 1))
+	return np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+def evaluate(f, args, kwargs):
+	'''
+	Evaluate `f` with the provided `args` and `kwargs`, returning a two-tuple of a
+	boolean indicating success and either the result or the formatted traceback.
+	'''
+	try:
+		return True, f(*args, **kwargs)
+	except Exception:
+		return False, traceback.format_exc()
+
+def send_result(conn, k, success, value):
+	try:
+		conn.send((k, success, value))
+	except Exception:  # Most likely, the result could not be pickled
+		conn.send((k, False, traceback.format_exc()))
+
 def spawn(f):
-	def fun(q_in, q_out):
+	def fun(conn):
 		warnings.simplefilter("ignore")
 		initial_memory_usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
 		while True:
-			i, args, kwargs = q_in.get()
-			if i is None:
-				break
-
 			try:
-				r = f(*args, **kwargs)
-			except Exception as e:
-				error(traceback.format_exc())
-				raise e
+				k, args, kwargs = conn.recv()
+			except EOFError:
+				break
+			if k is None:
+				break
 
-			q_out.put((i, r))
+			send_result(conn, k, *evaluate(f, args, kwargs))
 
 			gc.collect()
 
@@ -50,22 +89,33 @@ def spawn(f):
 	return fun
 
 def spawnonce(f):
-	def fun(q_in, q_out):
+	def fun(conn, task):
 		warnings.simplefilter("ignore")
+		k, args, kwargs = task
+		send_result(conn, k, *evaluate(f, args, kwargs))
 
-		i, args, kwargs = q_in.get()
-		if i is None:
-			return
-
-		r = None
-		try:
-			r = f(*args, **kwargs)
-		except Exception as e:
-			error(traceback.format_exc())
-			raise e
-
-		q_out.put((i, r))
+	return fun
 
+def failure_error(failures, total):
+	'''
+	Return a :class:`TaskExecutionError` reporting the `failures` (a dictionary mapping
+	indices to descriptions of failures) of a map over `total` tasks.
+	'''
+	return errors.TaskExecutionError("%d of %d tasks failed (with indices %s). The first failure was:\n%s" % (
+		len(failures), total, ', '.join(str(indices) for indices in failures), failures.values()[0]), failures=failures)
+
+def with_base_kwargs(f, base_kwargs):
+	'''
+	Return a function which calls `f` with the keyword arguments `base_kwargs` updated
+	by those of each call. Since worker processes are forked, `base_kwargs` is inherited
+	by the workers rather than being sent with every task.
+	'''
+	if base_kwargs is None:
+		return f
+	def fun(*args, **kwargs):
+		merged = base_kwargs.copy()
+		merged.update(kwargs)
+		return f(*args, **merged)
 	return fun
 
 class ParallelMap(object):
@@ -138,153 +188,287 @@ class ParallelMap(object):
 	def iterate(self, X, count_offset=None,count_total=None,start_time=None, base_kwargs=None):
 		pass
 	
-class AsyncParallelMap(ParallelMap):
+class Worker(object):
+	'''
+	A worker process of an :class:`AsyncParallelMap`, along with the connection used to
+	communicate with it, and the task (if any) which it is currently evaluating.
+	'''
+
+	def __init__(self, process, conn):
+		self.process = process
+		self.conn = conn
+		self.task = None
+		self.started = None
+
+	def stop(self):
+		if self.process.is_alive():
+			self.process.terminate()
+		self.process.join(1.)
+		self.conn.close()
 
-	def init(self, nprocs=None, spawnonce=True):
+class AsyncParallelMap(ParallelMap):
+	'''
+	AsyncParallelMap(f, progress=False, nprocs=None, spawnonce=True, timeout=None, retries=0, speculative=None)
+
+	Evaluates `f` for each task in at most `nprocs` forked worker processes, which are
+	either forked anew for every task (if `spawnonce` is `True`) or persist between tasks.
+	Each worker is handed one task at a time, so that it is always known which task a worker
+	is evaluating, and a worker which hangs or dies affects only that task.
+
+	:param timeout: The number of seconds for which a task may run before its worker is killed
+		and the task is treated as having failed; or None if tasks may run indefinitely.
+	:type timeout: None or float
+	:param retries: The number of times a task which fails (or times out) is resubmitted to a
+		fresh worker before it is reported as failed.
+	:type retries: int
+	:param speculative: If not None, once there are no more tasks waiting to be dispatched,
+		idle workers re-execute the in-flight tasks which have been running for more than
+		`speculative` times the median duration of the completed tasks (longest running
+		first). The first result to arrive is used, and the other copy is killed.
+	:type speculative: None or float
+
+	Tasks which fail after all retries are recorded in the `failures` dictionary, which
+	maps their indices to a description of the failure (such as the traceback). Once all
+	other tasks have completed (and their results have been yielded), a
+	:class:`TaskExecutionError` is raised with the same `failures`.
+	'''
+
+	POLL_INTERVAL = 0.05
+
+	def init(self, nprocs=None, spawnonce=True, timeout=None, retries=0, speculative=None):
 		multiprocessing.log_to_stderr(logging.WARN)
 		if nprocs is None:
 			self.nprocs = multiprocessing.cpu_count()
 		else:
 			self.nprocs = multiprocessing.cpu_count() + nprocs if nprocs < 0 else nprocs
-		self.proc = []
+		if timeout is not None and timeout <= 0:
+			raise ValueError("`timeout` must be None or a positive number of seconds.")
+		if int(retries) != retries or retries < 0:
+			raise ValueError("`retries` must be a non-negative integer.")
+		if speculative is not None and speculative <= 0:
+			raise ValueError("`speculative` must be None or a positive number.")
+		self.workers = []
 		self.spawnonce = spawnonce
-
-	def _reset(self):
-		self.q_in = multiprocessing.Queue(1 if not spawnonce else self.nprocs)
-		self.q_out = multiprocessing.Queue()
-
-		while len(self.proc) > 0:
-			self.proc.pop().terminate()
-		if not self.spawnonce:
-			self.proc = [multiprocessing.Process(target=spawn(self.f), args=(self.q_in, self.q_out)) for _ in range(self.nprocs)]
-			for p in self.proc:
-				p.daemon = True
-				p.start()
-
-	def __sweep_results(self,timeout=0.01):
-		while True:
-			try:
-				yield self.q_out.get(timeout=timeout)
-				self.count += 1
-			except Queue.Empty:
-				break
-			except:
-				break
+		self.timeout = timeout
+		self.retries = int(retries)
+		self.speculative = speculative
+		self.failures = {}
+
+	def _reset(self, base_kwargs=None):
+		self.f_base = with_base_kwargs(self.f, base_kwargs)
+		self.__stop_workers()
+		self.failures = {}
+
+	def __stop_workers(self):
+		while len(self.workers) > 0:
+			self.workers.pop().stop()
+
+	def __retire(self, worker):
+		self.workers.remove(worker)
+		worker.stop()
+
+	def __busy(self):
+		return [worker for worker in self.workers if worker.task is not None]
+
+	def __start(self, k):
+		task = (k,) + tuple(self.__tasks[k][1:])
+		if self.spawnonce:
+			conn, child_conn = multiprocessing.Pipe()
+			worker = Worker(multiprocessing.Process(target=spawnonce(self.f_base), args=(child_conn, task)), conn)
+			worker.process.daemon = False
+			worker.process.start()
+			child_conn.close()
+			self.workers.append(worker)
+		else:
+			idle = [worker for worker in self.workers if worker.task is None]
+			if len(idle) > 0:
+				worker = idle[0]
+			else:
+				conn, child_conn = multiprocessing.Pipe()
+				worker = Worker(multiprocessing.Process(target=spawn(self.f_base), args=(child_conn,)), conn)
+				worker.process.daemon = True
+				worker.process.start()
+				child_conn.close()
+				self.workers.append(worker)
+			worker.conn.send(task)
+		worker.task = k
+		worker.started = time.time()
+		self.__running[k].append(worker)
+
+	def __dispatch(self):
+		busy = len(self.__busy())
+		while len(self.__pending) > 0 and busy < self.nprocs:
+			self.__start(self.__pending.popleft())
+			busy += 1
+
+		if self.speculative is None or len(self.__pending) > 0 or len(self.__durations) == 0:
+			return
+		threshold = self.speculative * np.median(self.__durations)
+		now = time.time()
+		stragglers = sorted((worker for worker in self.__busy() if len(self.__running[worker.task]) == 1 and now - worker.started > threshold), key=lambda worker: worker.started)
+		for worker in stragglers[:max(0, self.nprocs - busy)]:
+			self.__start(worker.task)
+
+	def __receive(self):
+		'''
+		Return a list of (worker, k, success, value) outcomes of tasks which have completed,
+		failed or timed out since the last call.
+		'''
+		busy = self.__busy()
+		outcomes = []
+		try:
+			ready, _, _ = select.select([worker.conn for worker in busy], [], [], self.POLL_INTERVAL)
+		except select.error:
+			ready = []
+		for worker in busy:
+			if worker.conn in ready:
+				try:
+					outcomes.append((worker,) + worker.conn.recv())
+				except (EOFError, IOError):
+					worker.process.join(1.)
+					outcomes.append((worker, worker.task, False, "Worker process %d exited unexpectedly with code %s." % (worker.process.pid, worker.process.exitcode)))
+			elif self.timeout is not None and time.time() - worker.started > self.timeout:
+				outcomes.append((worker, worker.task, False, "Task timed out after %g seconds." % self.timeout))
+		return outcomes
 
 	def iterate(self, X, count_offset=None,count_total=None,start_time=None, base_kwargs=None):
-		self.reset(self.f,count_offset=count_offset,count_total=count_total)
+		self.reset(self.f,count_offset=count_offset,count_total=count_total,base_kwargs=base_kwargs)
 
 		self.start_time = start_time if start_time is not None else datetime.datetime.now()
 		self.count_total = count_total if count_total is not None else len(X)
-		
-		if not self.spawnonce:
-			X = X + [(None, None, None)] * self.nprocs  # add sentinels
-
-		for i, (x_indices, x_args, x_kwargs) in enumerate(X):
 
-			if self.spawnonce and self.count + self.nprocs <= i:  # Wait for processes to finish before starting new ones
-				yield self.q_out.get()
-				self.count += 1
+		self.__tasks = X
+		self.__pending = collections.deque(range(len(X)))
+		self.__running = collections.defaultdict(list)
+		self.__attempts = [0] * len(X)
+		self.__durations = []
+		done = set()
 
+		try:
+			while len(done) < len(X):
+				self.__dispatch()
+
+				for worker, k, success, value in self.__receive():
+					# Both copies of a speculatively re-executed task may complete within the same
+					# poll, in which case the worker of the second has already been retired.
+					if k in done or worker not in self.workers:
+						continue
+					duration = time.time() - worker.started
+					worker.task = None
+					self.__running[k].remove(worker)
+					if self.spawnonce or not success:
+						self.__retire(worker)  # Failed tasks are always retried on a fresh worker
+
+					if success:
+						done.add(k)
+						self.__durations.append(duration)
+						for other in self.__running.pop(k, []):
+							other.task = None
+							self.__retire(other)
+						self.count += 1
+						yield (X[k][0], value)
+					else:
+						self.__attempts[k] += 1
+						if len(self.__running[k]) > 0:  # Another copy of the task is still running
+							continue
+						if self.__attempts[k] <= self.retries:
+							self.__pending.appendleft(k)
+							continue
+						done.add(k)
+						self.failures[X[k][0]] = value
+						self.count += 1
+
+					if self.progress is not False:
+						self._print_progress()
+		finally:
+			self.__stop_workers()
+
+		if len(self.failures) > 0:
+			raise failure_error(self.failures, len(X))
+
+class DistributedParallelMap(ParallelMap):
+	'''
+	DistributedParallelMap(f, progress=False, retries=0, **cluster_opts)
+
+	Evaluates `f` for each task on dispynode servers using `dispy.JobCluster`, to which
+	`cluster_opts` are passed on. Jobs which fail (or are terminated or abandoned by their
+	node) are resubmitted up to `retries` times. Tasks which fail after all retries are
+	recorded in the `failures` dictionary (see :class:`AsyncParallelMap`), and a
+	:class:`TaskExecutionError` is raised once all other tasks have completed.
+	'''
+	
+	def init(self, retries=0, **cluster_opts):
+		if dispy is None:
+			raise RuntimeError("The `dispy` module is required for distributed iteration.")
+		if int(retries) != retries or retries < 0:
+			raise ValueError("`retries` must be a non-negative integer.")
+		self.cluster_opts = cluster_opts
+		self.retries = int(retries)
+		self.lock = threading.Condition()
+		self.failures = {}
+	
+	def _reset(self, cluster_opts=None):
+		self.cluster_opts = cluster_opts if cluster_opts is not None else self.cluster_opts
+		self.jobs = []
+		self.done = []
+		self.failures = {}
+		self.cluster = dispy.JobCluster(self.f, callback=self.__receive_callback, **self.cluster_opts)
+	
+	def __receive_callback(self, job):
+		if job.status not in (dispy.DispyJob.Finished, dispy.DispyJob.Terminated, dispy.DispyJob.Abandoned, dispy.DispyJob.Cancelled):
+			return  # The callback is also notified of intermediate changes in status
+		self.done.append(job)
+		
+		self.lock.acquire()
+		self.lock.notifyAll()
+		self.lock.release()
+	
+	def __submit(self, indices, args, kwargs, attempt=0):
+		job = self.cluster.submit(*args, **kwargs)
+		job.id = indices
+		job.task = (args, kwargs)
+		job.attempt = attempt
+		self.jobs.append(job)
+	
+	def __describe_failure(self, job):
+		return "Job failed on %s with status %s:\n%s%s" % (job.ip_addr, job.status, job.exception or '', job.stderr or '')
+	
+	def iterate(self, X, count_offset=None,count_total=None,start_time=None, base_kwargs=None):
+		self.reset(count_offset=count_offset,count_total=count_total)
+		
+		self.start_time = start_time if start_time is not None else datetime.datetime.now()
+		self.count_total = count_total if count_total is not None else len(X)
+		
+		for (x_indices, x_args, x_kwargs) in X:
 			if base_kwargs is not None:
 				kwargs = base_kwargs.copy()
 				kwargs.update(x_kwargs)
 			else:
 				kwargs = x_kwargs
-			self.q_in.put( (x_indices, x_args, kwargs) )
-			if self.spawnonce:
-				self.proc.append(multiprocessing.Process(target=spawnonce(self.f), args=(self.q_in, self.q_out)))
-				self.proc[-1].daemon = False
-				self.proc[-1].start()
-				while len(self.proc) > 2*self.nprocs:
-					p = self.proc.pop(0)
-					if not p.is_alive():
-						p.terminate()
-						del p
-
-			for result in self.__sweep_results():
-				yield result
-
-			gc.collect()
-			if self.progress is not False:
-				self._print_progress()
-
-		self.q_in.close()
-
-		while self.count < len(X) - (self.nprocs if not self.spawnonce else 0):
-			yield self.q_out.get()
-			self.count += 1
-			if self.progress is not False:
-				self._print_progress()
-
-		if not self.spawnonce:
-			[p.terminate() if p.is_alive() else False for p in self.proc]
-
-try:
-	import dispy
-	import threading
+			self.__submit(x_indices, x_args, kwargs)
 		
-	class DistributedParallelMap(ParallelMap):
+		self._print_progress()
 		
-		def init(self, **cluster_opts):
-			self.cluster_opts = cluster_opts
-			self.lock = threading.Condition()
-		
-		def _reset(self, cluster_opts=None):
-			self.cluster_opts = cluster_opts if cluster_opts is not None else self.cluster_opts
-			self.jobs = []
-			self.done = []
-			self.cluster = dispy.JobCluster(self.f, callback=self.__receive_callback, **self.cluster_opts)
+		while self.count < len(X):
+			while len(self.done) > 0:
+				job = self.done.pop()
+				if job.status == dispy.DispyJob.Finished and job.exception is None:
+					yield (job.id, job.result)
+				elif job.attempt < self.retries:
+					self.__submit(job.id, job.task[0], job.task[1], attempt=job.attempt + 1)
+					continue
+				else:
+					self.failures[job.id] = self.__describe_failure(job)
+				self.count += 1
+				self._print_progress()
+			if self.count < len(X):
+				self.lock.acquire()
+				self.lock.wait(1.) # Just in case a result slipped through while incorporated below, we wait a max of 1 second before polling again.
+				self.lock.release()
 		
-		def __receive_callback(self, job):
-			if job.result is None:
-				print
-				print "--------"
-				print "Job failed to successfully complete on %s with result:" % job.ip_addr
-				print job.result
-				print job.exception
-				print job.stdout
-				print job.stderr
-				print "-------"
-				print 
-			self.done.append(job)
-			
-			self.lock.acquire()
-			self.lock.notifyAll()
-			self.lock.release()
+		self.cluster.wait()
+		self.cluster.stats()
+		self.cluster.close()
 		
-		def iterate(self, X, count_offset=None,count_total=None,start_time=None, base_kwargs=None):
-			self.reset(count_offset=count_offset,count_total=count_total)
-			
-			self.start_time = start_time if start_time is not None else datetime.datetime.now()
-			self.count_total = count_total if count_total is not None else len(X)
-			
-			for (x_indices, x_args, x_kwargs) in X:
-				if base_kwargs is not None:
-					kwargs = base_kwargs.copy()
-					kwargs.update(x_kwargs)
-				else:
-					kwargs = x_kwargs
-				
-				job = self.cluster.submit(*x_args, **kwargs)
-				job.id = x_indices
-				self.jobs.append(job)
-			
-			self._print_progress()
-			
-			while self.count < len(X):
-				while len(self.done) > 0:
-					job = self.done.pop()
-					yield (job.id, job.result)
-					self.count += 1
-					self._print_progress()
-				if self.count < len(X):
-					self.lock.acquire()
-					self.lock.wait(1.) # Just in case a result slipped through while incorporated below, we wait a max of 1 second before polling again.
-					self.lock.release()
-			
-			self.cluster.wait()
-			self.cluster.stats()
-			self.cluster.close()
-except:
-	pass
+		if len(self.failures) > 0:
+			raise failure_error(self.failures, len(X))
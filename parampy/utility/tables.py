@@ -0,0 +1,208 @@
+import itertools
+import re
+
+import numpy as np
+
+
+class TableReader(object):
+	'''
+	TableReader(source, parameters, delimiter=',', chunksize=65536, scaled=True)
+
+	:class:`TableReader` streams the columns of tabular data whose column headers carry
+	units (such as `freq (GHz)` or `power [mW]`) into a form which can be used
+	directly by a :class:`Parameters` instance. It is normally created using
+	:func:`Parameters.read_table`.
+
+	:param source: The filename of a delimited text file (whose first line is the header) or of
+		a `.npy` file containing a structured array (whose field names are the headers); or
+		a structured `numpy.ndarray`.
+	:type source: str or numpy.ndarray
+	:param parameters: The :class:`Parameters` instance used to interpret the units.
+	:type parameters: Parameters
+	:param delimiter: The delimiter of the columns in text files.
+	:type delimiter: str
+	:param chunksize: The (maximum) number of rows to read at once.
+	:type chunksize: int
+	:param scaled: `True` if the values should be non-dimensionalised, and `False` if they
+		should be left in the units of the header.
+	:type scaled: bool
+
+	The units of each header are parsed exactly once, and each chunk of a column is then
+	converted using a single multiplication by the scaling of its units. Columns
+	without units are assumed to be non-dimensional already. Only one chunk of the source
+	is held in memory at a time while iterating (`.npy` files are memory mapped), and so
+	arbitrarily large files can be processed using:
+
+	>>> reader = p.read_table('data.csv')
+	>>> reader.units
+	{'freq': 'GHz', 'power': 'mW'}
+	>>> for chunk in reader:
+			# chunk is a dictionary of (non-dimensional) column arrays, such as {'freq': array([...]), 'power': array([...])}
+
+	For files that fit into memory, the columns can instead be set as (array) values
+	of parameters using :func:`update`; or used as the coordinates of a one
+	dimensional parameter sweep using :func:`ranges_eval`:
+
+	>>> reader.update()  # Equivalent to p(freq=(<freq column>, 'GHz'), power=(<power column>, 'mW'))
+	>>> ranges_eval = reader.ranges_eval()
+	>>> iterator = p.ranges_iterator([{'freq': None, 'power': None}], ranges_eval=ranges_eval, function=f)
+	'''
+
+	HEADER = re.compile(r'^\s*(?P<name>[^\(\[]*?)\s*(?:[\(\[]\s*(?P<units>[^\)\]]*?)\s*[\)\]])?\s*$')
+
+	def __init__(self, source, parameters, delimiter=',', chunksize=65536, scaled=True):
+		self.source = source
+		self.parameters = parameters
+		self.delimiter = delimiter
+		self.chunksize = chunksize
+		self.scaled = scaled
+
+		self.__headers = None
+
+	@property
+	def chunksize(self):
+		'''
+		The (maximum) number of rows read at once.
+		'''
+		return self.__chunksize
+	@chunksize.setter
+	def chunksize(self, chunksize):
+		if int(chunksize) != chunksize or chunksize < 1:
+			raise ValueError("`chunksize` must be a positive integer.")
+		self.__chunksize = int(chunksize)
+
+	def __is_text(self):
+		return isinstance(self.source, str) and not self.source.endswith('.npy')
+
+	def __array(self):
+		if isinstance(self.source, np.ndarray):
+			return self.source
+		return np.load(self.source, mmap_mode='r')
+
+	def __parse_header(self, header):
+		match = self.HEADER.match(header)
+		if match is None or not match.group('name'):
+			raise ValueError("Could not interpret column header '%s'." % header)
+		return match.group('name'), match.group('units') or None
+
+	@property
+	def headers(self):
+		'''
+		A list of (name, units) two-tuples for each column, where units is `None` for
+		columns without units.
+		'''
+		if self.__headers is None:
+			if self.__is_text():
+				with open(self.source) as f:
+					fields = f.readline().rstrip('\r\n').split(self.delimiter)
+			else:
+				fields = self.__array().dtype.names
+				if fields is None:
+					raise ValueError("Arrays must be structured arrays, with the column headers as field names.")
+			self.__headers = [self.__parse_header(field) for field in fields]
+		return self.__headers
+
+	@property
+	def columns(self):
+		'''
+		A list of the names of the columns.
+		'''
+		return [name for name, _ in self.headers]
+
+	@property
+	def units(self):
+		'''
+		A dictionary of the units of each column (or `None` for columns without units).
+		'''
+		return dict(self.headers)
+
+	def __scalings(self, scaled):
+		'''
+		The factor by which each column must be multiplied, or None if it must not be converted.
+		'''
+		scalings = []
+		for name, units in self.headers:
+			if not scaled or units is None:
+				scalings.append(None)
+			else:
+				scalings.append(1. / self.parameters.unit_scaling(units))
+		return scalings
+
+	def __raw_chunks(self):
+		'''
+		Yield a list of the (unconverted) column arrays of each chunk of the source.
+		'''
+		if self.__is_text():
+			with open(self.source) as f:
+				f.readline()
+				while True:
+					lines = list(itertools.islice(f, self.chunksize))
+					if len(lines) == 0:
+						return
+					data = np.loadtxt(lines, delimiter=self.delimiter, ndmin=2)
+					if data.shape[1] != len(self.headers):
+						raise ValueError("Expected %d columns, but found %d." % (len(self.headers), data.shape[1]))
+					yield [data[:, i] for i in range(data.shape[1])]
+		else:
+			array = self.__array()
+			fields = array.dtype.names
+			for start in xrange(0, len(array), self.chunksize):
+				chunk = array[start:start + self.chunksize]
+				yield [np.array(chunk[field]) for field in fields]
+
+	def __iter__(self):
+		return self.__chunks(self.scaled)
+
+	def __chunks(self, scaled):
+		names = self.columns
+		scalings = self.__scalings(scaled)
+		for columns in self.__raw_chunks():
+			chunk = {}
+			for name, scaling, column in zip(names, scalings, columns):
+				if scaling is not None:
+					column = np.multiply(column, scaling, out=column if column.dtype.kind in 'fc' else None)
+				chunk[name] = column
+			yield chunk
+
+	def read(self):
+		'''
+		read()
+
+		:returns: A dictionary of the full (converted) arrays of each column.
+		'''
+		return self.__read(self.scaled)
+
+	def __read(self, scaled):
+		chunks = list(self.__chunks(scaled))
+		if len(chunks) == 0:
+			return dict((name, np.array([])) for name in self.columns)
+		return dict((name, np.concatenate([chunk[name] for chunk in chunks])) for name in self.columns)
+
+	def update(self):
+		'''
+		update()
+
+		Set the parameters named by the columns to the (array) values of the columns,
+		in the units of the headers.
+
+		:returns: A reference to the :class:`Parameters` instance.
+		'''
+		columns = self.__read(scaled=False)
+		values = {}
+		for name, units in self.headers:
+			values[name] = columns[name] if units is None else (columns[name], units)
+		return self.parameters.update_many(values)
+
+	def ranges_eval(self):
+		'''
+		ranges_eval()
+
+		:returns: A one dimensional structured array of the non-dimensional values of each
+			column, which can be passed as the `ranges_eval` of a :class:`RangesIterator`
+			sweeping over the rows of the table.
+		'''
+		columns = self.__read(scaled=True)
+		ranges_eval = np.zeros(len(columns[self.columns[0]]), dtype=[(name, float) for name in self.columns])
+		for name in self.columns:
+			ranges_eval[name] = columns[name]
+		return ranges_eval
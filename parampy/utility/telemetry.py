@@ -0,0 +1,293 @@
+import datetime
+import json
+import sys
+import time
+
+import numpy as np
+
+
+class Telemetry(object):
+	'''
+	Telemetry(sinks=(), interval=1.)
+
+	:class:`Telemetry` collects statistics about the tasks evaluated during a sweep,
+	and periodically delivers summaries of them to a set of sinks. It is normally used
+	via the `telemetry` argument of :class:`RangesIterator`:
+
+	>>> histogram = HistogramSink()
+	>>> iterator = RangesIterator(p, ranges, function=f, telemetry=Telemetry(sinks=[histogram, JSONLinesSink('sweep.jsonl')]))
+
+	:param sinks: The sinks to which task records and summaries should be delivered.
+	:type sinks: list of TelemetrySink
+	:param interval: The minimum time in seconds between summaries (a summary is
+		always delivered once all tasks are complete).
+	:type interval: float
+
+	For every task, the executor reports:
+		- `worker`: An identifier of the worker (thread or process) which evaluated the task.
+		- `start`: When the task started (as a unix timestamp).
+		- `duration`: The wall time in seconds taken to evaluate the task.
+		- `wait`: The time in seconds between submission of the task and the start of its evaluation.
+		- `maxrss`: The memory high-water mark of the worker process (in KB).
+
+	Note that the `start` and `wait` values are only meaningful when the workers share
+	a clock with the current process. Executors which do not report statistics (such as
+	the 'async' and 'dispy' executors) only contribute to the completion counts.
+
+	Summaries are dictionaries with keys:
+		- `total`: The total number of tasks in the current run.
+		- `completed`: The number of tasks completed.
+		- `start_time`: When the run started (as a `datetime.datetime` object).
+		- `elapsed`: The number of seconds since the run started.
+		- `throughput`: The number of tasks completed per second.
+		- `eta`: The estimated number of seconds until the run is complete (or None).
+		- `mean_duration`: The mean wall time of the completed tasks (or None).
+		- `mean_wait`: The mean queue wait of the completed tasks (or None).
+		- `workers`: The number of distinct workers which have completed tasks.
+		- `maxrss`: The largest memory high-water mark of any worker (in KB, or None).
+	'''
+
+	def __init__(self, sinks=(), interval=1.):
+		self.sinks = list(sinks)
+		self.interval = interval
+		self.start(0)
+
+	def start(self, total, sinks=()):
+		'''
+		start(total, sinks=())
+
+		:param total: The total number of tasks to be evaluated.
+		:type total: int
+		:param sinks: Additional sinks to use for this run only.
+		:type sinks: list of TelemetrySink
+
+		Reset the statistics at the beginning of a run.
+		'''
+		self.total = total
+		self.completed = 0
+		self.workers = {}
+		self.__sinks = self.sinks + list(sinks)
+		self.__start_time = datetime.datetime.now()
+		self.__start = time.time()
+		self.__last_update = None
+		self.__duration = 0.
+		self.__wait = 0.
+		self.__measured = 0
+
+	def record(self, indices, stats=None):
+		'''
+		record(indices, stats=None)
+
+		:param indices: The indices of the completed task.
+		:type indices: tuple
+		:param stats: The statistics reported for the task (or None).
+		:type stats: dict
+
+		Record the completion of a task.
+		'''
+		self.completed += 1
+		if stats is not None:
+			stats['indices'] = indices
+			self.__measured += 1
+			self.__duration += stats['duration']
+			self.__wait += stats.get('wait', 0)
+
+			worker = self.workers.get(stats['worker'])
+			if worker is None:
+				worker = self.workers[stats['worker']] = {'tasks': 0, 'busy': 0., 'maxrss': 0}
+			worker['tasks'] += 1
+			worker['busy'] += stats['duration']
+			worker['maxrss'] = max(worker['maxrss'], stats['maxrss'])
+
+			for sink in self.__sinks:
+				sink.task(stats)
+
+		now = time.time()
+		if self.completed >= self.total or self.__last_update is None or now - self.__last_update >= self.interval:
+			self.__last_update = now
+			summary = self.summary(now)
+			for sink in self.__sinks:
+				sink.update(summary)
+			if self.completed >= self.total:
+				for sink in self.__sinks:
+					sink.finish(summary)
+
+	def summary(self, now=None):
+		'''
+		summary()
+
+		:returns: A dictionary summarising the current run (see above).
+		'''
+		elapsed = (now if now is not None else time.time()) - self.__start
+		throughput = self.completed / elapsed if elapsed > 0 else 0.
+		return {
+			'total': self.total,
+			'completed': self.completed,
+			'start_time': self.__start_time,
+			'elapsed': elapsed,
+			'throughput': throughput,
+			'eta': (self.total - self.completed) / throughput if throughput > 0 else None,
+			'mean_duration': self.__duration / self.__measured if self.__measured > 0 else None,
+			'mean_wait': self.__wait / self.__measured if self.__measured > 0 else None,
+			'workers': len(self.workers),
+			'maxrss': max(worker['maxrss'] for worker in self.workers.values()) if len(self.workers) > 0 else None,
+		}
+
+
+class TelemetrySink(object):
+	'''
+	TelemetrySink()
+
+	The base class of sinks which receive records from :class:`Telemetry`. Subclasses
+	may implement any of:
+		- `task(stats)`: Called with the statistics of every task (when available).
+		- `update(summary)`: Called with (rate-limited) summaries of the run.
+		- `finish(summary)`: Called with the final summary of the run.
+	'''
+
+	def task(self, stats):
+		pass
+
+	def update(self, summary):
+		pass
+
+	def finish(self, summary):
+		pass
+
+
+class CallbackSink(TelemetrySink):
+	'''
+	CallbackSink(callback, tasks=False)
+
+	A :class:`TelemetrySink` which passes summaries (and optionally task statistics) to a callback.
+
+	:param callback: A callable which takes a single dictionary argument.
+	:type callback: callable
+	:param tasks: `True` if the callback should also be called with the statistics of every task.
+	:type tasks: bool
+	'''
+
+	def __init__(self, callback, tasks=False):
+		self.callback = callback
+		self.tasks = tasks
+
+	def task(self, stats):
+		if self.tasks:
+			self.callback(stats)
+
+	def update(self, summary):
+		self.callback(summary)
+
+
+class JSONLinesSink(TelemetrySink):
+	'''
+	JSONLinesSink(f, tasks=True)
+
+	A :class:`TelemetrySink` which appends records to a file as lines of JSON. Every
+	record has an `event` key, which is one of 'task', 'update' or 'finish'.
+
+	:param f: A filename or file-like object.
+	:type f: str or file
+	:param tasks: `True` if the statistics of every task should be written, and `False` if
+		only the summaries should be written.
+	:type tasks: bool
+	'''
+
+	def __init__(self, f, tasks=True):
+		self.f = open(f, 'a') if isinstance(f, str) else f
+		self.tasks = tasks
+
+	def __write(self, event, record):
+		record = dict(record, event=event)
+		if 'start_time' in record:
+			record['start_time'] = record['start_time'].isoformat()
+		self.f.write(json.dumps(record, default=str) + '\n')
+
+	def task(self, stats):
+		if self.tasks:
+			self.__write('task', stats)
+
+	def update(self, summary):
+		self.__write('update', summary)
+		self.f.flush()
+
+	def finish(self, summary):
+		self.__write('finish', summary)
+		self.f.flush()
+
+
+class HistogramSink(TelemetrySink):
+	'''
+	HistogramSink(bins=None)
+
+	A :class:`TelemetrySink` which accumulates in-memory histograms of task durations
+	and queue waits, from which approximate percentiles can be extracted:
+
+	>>> histogram.percentile(95)
+	0.0125
+
+	:param bins: The edges of the histogram bins in seconds. Defaults to 10 logarithmically
+		spaced bins per decade from 1 microsecond to 10000 seconds.
+	:type bins: None or numpy.ndarray
+	'''
+
+	def __init__(self, bins=None):
+		self.bins = np.logspace(-6, 4, 101) if bins is None else np.asarray(bins)
+		self.durations = np.zeros(len(self.bins) + 1, dtype=int)
+		self.waits = np.zeros(len(self.bins) + 1, dtype=int)
+
+	def task(self, stats):
+		self.durations[np.searchsorted(self.bins, stats['duration'])] += 1
+		if 'wait' in stats:
+			self.waits[np.searchsorted(self.bins, stats['wait'])] += 1
+
+	def percentile(self, q, kind='duration'):
+		'''
+		percentile(q, kind='duration')
+
+		:param q: The percentile to compute (between 0 and 100).
+		:type q: float
+		:param kind: Either 'duration' or 'wait'.
+		:type kind: str
+
+		:returns: The upper edge of the bin containing the `q`th percentile (or None if no tasks have been recorded).
+		'''
+		counts = self.durations if kind == 'duration' else self.waits
+		if counts.sum() == 0:
+			return None
+		index = np.searchsorted(np.cumsum(counts), q / 100. * counts.sum())
+		return self.bins[min(index, len(self.bins) - 1)]
+
+
+class ProgressSink(TelemetrySink):
+	'''
+	ProgressSink(stream=sys.stderr)
+
+	A :class:`TelemetrySink` which writes a progress line (including throughput,
+	worker memory usage and time remaining) to a stream.
+	'''
+
+	def __init__(self, stream=sys.stderr):
+		self.stream = stream
+
+	def update(self, summary):
+		total = summary['total']
+		progress = float(summary['completed']) / total if total > 0 else 1.
+
+		self.stream.write("\r %3d%% | %d of %d | %.1f tasks/s" % (progress * 100, summary['completed'], total, summary['throughput']))
+		if summary['maxrss'] is not None:
+			self.stream.write(" | Worker memory: %.2f MB" % (summary['maxrss'] / 1024.))
+		if summary['eta'] is not None and progress < 1:
+			delta = datetime.timedelta(seconds=summary['eta'])
+			self.stream.write(" | Remaining: %02dd:%02dh:%02dm:%02ds" % (
+					delta.days,
+					delta.seconds / 3600,
+					delta.seconds / 60 % 60,
+					delta.seconds % 60
+				)
+			)
+		self.stream.flush()
+
+	def finish(self, summary):
+		self.stream.write('\n')
+		self.stream.flush()
@@ -1,15 +1,31 @@
-import timeit
+import cPickle as pickle
 import cProfile as profile
+import copy
 import math
+import os
+import shutil
+import tempfile
+import threading
+import time
 import numpy as np
 
 import warnings
 warnings.filterwarnings("ignore")
 
 from parampy import Parameters,SIUnitDispenser,Quantity,SIQuantity,Unit, UnitDispenser, Units, errors
+from parampy.iteration import RangesIterator
+from parampy.units import resolve_dispenser
+from parampy.utility.symmetric import AsyncParallelMap
+from parampy.utility.executors import SerialExecutor, ThreadExecutor, ProcessExecutor, AsyncExecutor, ClusterExecutor
+from parampy.utility.cache import ResultCache
+from parampy.utility.costs import cost_chunks, lpt_makespan
+from parampy.utility.telemetry import Telemetry, CallbackSink, HistogramSink
 
 ###################### UNIT TESTS ##############################################
 import unittest
+import StringIO
+import benchmarks
+from benchmarks import sweeps
 
 class TestUnit(unittest.TestCase):
 
@@ -67,6 +83,27 @@ class TestQuantity(unittest.TestCase):
 
 		self.assertRaises( errors.UnitConversionError, np.tan, SIQuantity(1,'m') )
 
+	def test_pickle(self):
+		q = SIQuantity(1.5, 'nm/s')
+		s = pickle.dumps(q, 2)
+		self.assertTrue(len(s) < 256)
+		self.assertEqual(pickle.loads(s), q)
+		self.assertTrue(pickle.loads(s).dispenser is q.dispenser)
+		self.assertTrue(pickle.loads(pickle.dumps(q.units, 2)) is q.dispenser('nm/s'))
+
+		a = pickle.loads(pickle.dumps(SIQuantity(np.arange(3.), 'kg*m^2/s^2', absolute=True, dispenser=q.dispenser), 2))
+		self.assertEqual((a.value.tolist(), a.units, a.absolute), ([0,1,2], q.dispenser('kg*m^2/s^2'), True))
+		self.assertEqual(str(pickle.loads(pickle.dumps(q.dispenser('m')**0.5, 2))), 'm^1/2')
+
+		self.assertTrue(resolve_dispenser('unknown', SIUnitDispenser) is resolve_dispenser('unknown', SIUnitDispenser))
+		self.assertNotEqual(q.dispenser.registry_id, SIUnitDispenser().registry_id)
+		self.assertRaises(TypeError, resolve_dispenser, q.dispenser.registry_id, UnitDispenser)
+
+		for copied in (copy.copy(q.dispenser), copy.deepcopy(q.dispenser)):
+			self.assertFalse(copied is q.dispenser)
+			self.assertNotEqual(copied.registry_id, q.dispenser.registry_id)
+			self.assertEqual(str(copied('nm/s')), 'nm/s')
+
 class TestParameters(unittest.TestCase):
 
 	def setUp(self):
@@ -199,6 +236,216 @@ class TestParameters(unittest.TestCase):
 	# 	self.assertRaises(errors.ParameterNotInvertableError, self.p, J_1=1)
 	# 	self.assertEqual(self.p('_J_1',J_1=1),1.)
 
+	def test_profile(self):
+		self.p.scaling(length=(1,'nm'))
+		self.p(x=(2,'m'))
+		self.p << {'y': lambda x: x**2}
+		self.p.cache(y=True)
+		with self.p.profile() as profiler:
+			for _ in range(3):
+				self.p('y')
+				self.p._x
+		report = profiler.report
+		self.assertEqual(report.parameters['y']['calls'], 3)
+		self.assertEqual(report.phases['function']['calls'], 3)
+		self.assertEqual(report.caches['cache_funcs'], {'hits': 2, 'misses': 1})
+		self.assertEqual(report.caches['cache_scaled'], {'hits': 2, 'misses': 1})
+		self.assertEqual(report.hit_rate('cache_scaled'), 2/3.)
+		self.assertEqual(report.caches['scaling_cache']['misses'], 1)
+		self.assertTrue('get_quantity' in report.table(sort='self'))
+		self.assertFalse('_Parameters__get_quantity' in self.p.__dict__)
+		self.assertEqual(type(self.p._Parameters__cache_scaled), dict)
+
+	def test_tabulate(self):
+		calls = []
+		def pulse(_t, _a):
+			calls.append(_t)
+			return _a * np.sin(_t)
+		self.p(a=2)
+		self.p << {'y': (pulse, 'm')}
+		self.p.tabulate('y', t=(0, 3, 301), kind='cubic')
+		self.assertEqual(len(calls), 1)  # Vectorised evaluation
+		self.assertAlmostEqual(self.p('y', t=1.0).value, 2 * np.sin(1.0), places=6)
+		self.assertEqual(self.p('y', t=1.0).units, self.p('y', t=0.5).units)
+		self.assertTrue(np.allclose(self.p('_y', t=np.array([0.5, 1.5])), 2 * np.sin([0.5, 1.5]), atol=1e-6))
+		self.assertEqual(len(calls), 1)
+
+		self.p.a = 3
+		self.assertAlmostEqual(self.p('_y', t=1.0), 3 * np.sin(1.0), places=6)
+		self.assertEqual(len(calls), 2)
+
+		# Overriding inputs other than the independent parameter bypasses the table
+		self.assertEqual(self.p('_y', t=1.0, a=5), 5 * np.sin(1.0))
+		self.assertEqual(len(calls), 3)
+		self.assertAlmostEqual(self.p('_y', t=1.0), 3 * np.sin(1.0), places=6)
+		self.assertEqual(len(calls), 3)
+
+		self.p << {'z': lambda _t: _t ** 2 if np.isscalar(_t) else None}
+		self.p.tabulate('z', t=[0, 1, 2])
+		self.assertEqual(self.p('_z', t=1.5), 2.5)
+
+		self.p.untabulate('y')
+		self.assertEqual(self.p('_y', t=1.0), 3 * np.sin(1.0))
+
+	def test_nondimensionalise(self):
+		self.p.scaling(length=(1,'nm'), time=(2,'s'))
+		table = [(1,'nm'), (2,'m'), (3,'m/s'), (4,'eV'), (5,'')]
+		expected = [self.p.convert(value, unit) for value, unit in table]
+		self.p.scaling(mass=(1,'g'))
+		self.assertEqual(list(self.p.nondimensionalise(table)), [value * 1e3 if unit == 'eV' else value for value, unit in zip(expected, zip(*table)[1])])
+		self.assertEqual(self.p.nondimensionalise([1, 2], 'nm').tolist(), [1., 2.])
+		self.assertEqual(self.p.unit_scaling('km'), 1e-12)
+		self.assertRaises(ValueError, self.p.nondimensionalise, [1, 2], ['m'])
+
+	def test_read_table(self):
+		path = tempfile.mkdtemp()
+		try:
+			filename = os.path.join(path, 'table.csv')
+			with open(filename, 'w') as f:
+				f.write("freq (GHz), power [mW],n\n1,2,3\n4,5,6\n7,8,9\n")
+			self.p.scaling(time=(1,'ns'))
+			reader = self.p.read_table(filename, chunksize=2)
+			self.assertEqual(reader.units, {'freq': 'GHz', 'power': 'mW', 'n': None})
+			self.assertEqual([len(chunk['freq']) for chunk in reader], [2, 1])
+			self.assertTrue(np.allclose(reader.read()['freq'], [1., 4., 7.]))
+			self.assertEqual(reader.ranges_eval()['n'].tolist(), [3., 6., 9.])
+
+			reader.update()
+			self.assertEqual(self.p.freq.value.tolist(), [1., 4., 7.])
+			self.assertEqual(str(self.p.units('power')), 'mW')
+
+			array = np.zeros(3, dtype=[('x (m)', int), ('y', float)])
+			array['x (m)'] = [1, 2, 3]
+			self.p.scaling(length=(1,'cm'))
+			self.assertTrue(np.allclose(self.p.read_table(array, chunksize=2).read()['x'], [100., 200., 300.]))
+		finally:
+			shutil.rmtree(path)
+
+	def test_fork(self):
+		self.p(x=1, y=(2,'m'), a=np.arange(3.))
+		self.p << {'z': lambda x, y: x * y}
+		self.assertEqual(self.p('z'), SIQuantity(2,'m'))
+
+		f = self.p.fork(x=3)
+		self.assertTrue(f.parent is self.p)
+		self.assertEqual(f('z'), SIQuantity(6,'m'))
+		self.assertEqual(self.p('z'), SIQuantity(2,'m'))
+		self.assertEqual(f._Parameters__parameters.overrides, set(['x']))
+
+		self.p(y=(5,'m'))
+		self.assertEqual(f('z'), SIQuantity(15,'m'))
+		self.p.scaling(length=(1,'cm'))
+		self.assertEqual(f._y, 500)
+
+		f & {'y': 'km'}
+		f.assign('a', 7., index=0)
+		self.assertEqual(str(self.p.units('y')), 'm')
+		self.assertEqual(self.p._a.tolist(), [0, 1, 2])
+		self.assertEqual(f.fork(x=10)('z'), SIQuantity(0.05,'km'))
+
+		with f:
+			f(x=100)
+		self.assertEqual(f._x, 3)
+		f.forget('x')
+		self.assertRaises(errors.ParameterInvalidError, f, 'x')
+		self.assertEqual(self.p._x, 1)
+
+	def test_validation(self):
+		self.p(x=1)
+		self.p << {'w': lambda x, t: x * t}
+		self.p.bounds(w=(0, 10))
+		with warnings.catch_warnings(record=True) as caught:
+			warnings.simplefilter('always')
+			for i in range(3):
+				self.p('x')
+			self.assertEqual(len(caught), 1)
+			self.assertEqual(self.p.warning_counts.values(), [3])
+
+			self.p.set_validation('strict')
+			self.p('x')
+			self.assertEqual(len(caught), 2)
+		self.assertRaises(errors.ParameterInvalidError, self.p, scaling=1)
+		self.assertFalse('scaling' in list(self.p))
+
+		self.p.set_validation('fast')
+		self.p(**{'a%b': 1})
+		self.assertTrue('a%b' in list(self.p))
+		self.assertRaises(ValueError, self.p.set_validation, 'lenient')
+
+	def test_update_many(self):
+		chain = {'p0': 1, 'p1': 1}
+		for i in range(2, 100):
+			chain['p%d' % i] = eval('lambda p%d, p%d: p%d + p%d' % (i - 1, i - 2, i - 1, i - 2))
+		self.p.update_many(chain)
+		self.assertTrue(all('p%d' % i in self.p for i in range(100)))
+		self.assertEqual(self.p._('p5'), 8)
+
+		self.assertRaises(errors.ParameterRecursionError, self.p.update_many, {'x': lambda y: y, 'y': lambda _x: _x, 'z': 1})
+		self.assertFalse('z' in list(self.p))
+		self.assertRaises(ValueError, self.p.update_many, {'x': 1}, validate='never')
+
+	def test_specialize(self):
+		self.p(x=2, t=0, a=(1, 'm'))
+		self.p << {'y': 'x^2', 'z': 'y*t', 'b': lambda a, _t: a * _t, 'c': (lambda _b, _x: _b * _x, 'm')}
+
+		q = self.p.specialize('z', wrt='t')
+		self.assertEqual(list(q), ['t', 'z'])
+		self.assertEqual(q._('z', t=2), 8)
+		self.assertEqual(q._Parameters__parameters['z'].__code__.co_varnames, ('t',))
+
+		q = self.p.specialize('c', 'y', wrt=('t',), x=3)
+		self.assertEqual(list(q), ['b', 'c', 't', 'y'])
+		self.assertFalse(q.is_function('y'))
+		self.assertEqual(q('y'), self.p('y', x=3))
+		self.assertEqual(q('c', t=2), self.p('c', t=2, x=3))
+		self.assertEqual(str(q.units('c')), 'm')
+
+	def test_value_caches(self):
+		self.p(x=(2, 'km'))
+		self.assertTrue(self.p('x') is self.p('x'))
+		self.assertEqual(self.p('_x'), 2000)
+
+		self.p & {'x': 'm'}
+		self.assertEqual(self.p('x'), SIQuantity(2000, 'm'))
+		self.assertEqual(str(self.p('x').units), 'm')
+
+		self.p.scaling(length=(1, 'km'))
+		self.assertEqual(self.p('_x'), 2)
+
+		self.p.bounds(x=(0, (1, 'km')))
+		self.assertRaises(errors.ParameterOutsideBoundsError, self.p, 'x')
+
+		self.p(x=(3, 'm'))
+		self.assertEqual(self.p('x'), SIQuantity(3, 'm'))
+		self.p.forget('x')
+		self.assertRaises(errors.ParameterInvalidError, self.p, 'x')
+
+	def test_array_views(self):
+		field = np.linspace(0, 1, 5)
+		self.p(field=(field, 'mT'))
+		stored = self.p('field')
+		self.assertFalse(np.may_share_memory(stored.value, field))
+		self.assertTrue(field.flags.writeable)
+		self.assertRaises(ValueError, stored.value.__setitem__, 0, 1)
+
+		view = self.p.view('field', 'T')
+		self.assertTrue(view is self.p.view('field', 'T'))
+		self.assertTrue(np.allclose(view, field * 1e-3))
+		self.assertTrue(self.p.view('field', 'mT') is stored.value)
+
+		self.p.assign('field', 2, index=0, units='T')
+		self.assertTrue(self.p('field') is stored)
+		self.assertEqual(stored.value[0], 2000)
+		self.assertEqual(self.p.view('field', 'T')[0], 2)
+		self.assertEqual(self.p('_field')[0], self.p.convert((2, 'T')))
+
+		with self.p:
+			self.p.assign('field', 0, index=0, units='T')
+			self.assertEqual(self.p('field').value[0], 0)
+		self.assertEqual(self.p('field').value[0], 2000)
+
+		self.assertRaises(errors.ParameterInvalidError, self.p.assign, 'x', 1)
+
 	def test_asvalue(self):
 		self.p(x=(1,'J'))
 		self.p.scaling(mass=(-1000,'kg'))
@@ -256,6 +503,12 @@ class TestParameters(unittest.TestCase):
 			self.assertEqual(self.p._x,2)
 		self.assertEqual(self.p._x,1)
 
+		self.p._Parameters__units.add_context('myctx', {})
+		with self.p:
+			self.p.set_units_context('myctx')
+			self.assertEqual(self.p._Parameters__units.context, ('myctx', {}))
+		self.assertEqual(self.p._Parameters__units.context, None)
+
 	def test_complex(self):
 		self.p.x = 1 + 2j
 
@@ -269,6 +522,24 @@ class TestParameters(unittest.TestCase):
 		self.assertEqual(self.p.range('_x',x=['_k','2*_k','_k/2'],k=[1,3,5]),[1,6,2.5])
 		self.assertEqual(self.p.range('_x',x=['_k','2*_k','_k/2'],k=(1,3,3)),[1,4,1.5])
 
+	def test_range_samplers(self):
+		values = self.p.range('_x','_y',x=(0,1,8,'sobol'),y=(0,2,8,'sobol'))
+		self.assertEqual(values['x'], [0,0.5,0.75,0.25,0.375,0.875,0.625,0.125])
+		self.assertEqual(values['y'], [0,1,0.5,1.5,0.75,1.75,0.25,1.25])
+
+		values = self.p.range('_x','_y',x=(0,1,10,3,'lhs'),y=(2,3,10,3,'lhs'))
+		self.assertEqual(sorted(np.floor(np.array(values['x'])*10).tolist()), range(10))
+		self.assertEqual(sorted(np.floor((np.array(values['y'])-2)*10).tolist()), range(10))
+		self.assertEqual(self.p.range('_x',x=(0,1,10,3,'lhs'),y=(2,3,10,3,'lhs')), values['x'])
+
+		self.assertEqual(self.p.range('_x',x=(0,1,3,'halton')), [0.5,0.25,0.75])
+		self.assertTrue(all(0 <= x <= 1 for x in self.p.range('_x',x=(0,1,5,'random'))))
+		self.assertRaises(ValueError, self.p.range, '_x', x=(0,1,8,'sobol'), y=(0,1,7,'sobol'))
+
+		ranges_eval, indices = RangesIterator(Parameters(), [{'u':(0,1,20,'sobol'),'v':(0,1,20,'sobol'),'w':(0,1,20,'sobol')}], progress=False).ranges_expand()
+		self.assertEqual((ranges_eval.shape, len(indices)), ((20,), 20))
+		self.assertEqual(sorted(ranges_eval.dtype.names), ['u','v','w'])
+
 	def test_lambda_init(self):
 		self.p.z = 2
 		self.assertEqual( self.p('_x',x=(lambda _k:_k**2, '$'),k=2), 4)
@@ -289,6 +560,345 @@ class TestParameters(unittest.TestCase):
 		self.assertEqual(type(self.p.range(['z'],z=[0,1,2])), dict)
 
 
+class TestBenchmarks(unittest.TestCase):
+
+	def test_compare(self):
+		baseline = {'benchmarks': {'a': {'time': 1.0}, 'b': {'time': 1.0}, 'c': {'time': 1.0}}}
+		results = {'benchmarks': {'a': {'time': 1.1}, 'b': {'time': 1.5}, 'c': {'time': 0.5}, 'd': {'time': 1.0}}}
+		statuses = dict((c['name'], c['status']) for c in benchmarks.compare(results, baseline, tolerance=0.2, tolerances={'c': 0.5}))
+		self.assertEqual(statuses, {'a': 'ok', 'b': 'regressed', 'c': 'faster'})
+
+	def test_run(self):
+		results = benchmarks.run(['baseline.*', 'extraction.call'], repeat=1, min_time=0.001)
+		self.assertEqual(sorted(results['benchmarks']), ['baseline.function', 'baseline.lookup', 'extraction.call'])
+		self.assertTrue(results['benchmarks']['extraction.call']['relative'] > 0)
+
+	def test_sweeps(self):
+		stream = StringIO.StringIO()
+		results = sweeps.run_sweeps(nprocs=(2,), grids=(4,), durations=(0.,), sizes=(2,), stream=stream)['benchmarks']
+		names = ['sweep.%s.n%d.g4.d0.s2' % (backend, 1 if backend == 'serial' else 2) for backend in sweeps.BACKENDS]
+		self.assertEqual(sorted(results), sorted(names + ['expand.g4x4']))
+		self.assertTrue(all(results[name]['throughput'] > 0 for name in names))
+		self.assertEqual(len(stream.getvalue().splitlines()), len(results))
+
+class TestRangesIterator(unittest.TestCase):
+
+	def setUp(self):
+		self.p = Parameters()
+		self.p(x=1, y=2)
+		self.ranges = [{'x':(0,1,3)},{'y':(0,2,3)}]
+		self.params = {'z':3}
+
+	def function(self, params):
+		return np.array([params['x'] * params['y'], params['z']])
+
+	def test_iterate(self):
+		results = dict(RangesIterator(self.p, self.ranges, params=self.params, function=self.function, nprocs=1, progress=False))
+		self.assertEqual(len(results), 9)
+		self.assertEqual(results[(2,2)].tolist(), [2.,3.])
+
+	def test_collect(self):
+		for nprocs in (1, 2):
+			output = RangesIterator(self.p, self.ranges, params=self.params, function=self.function, nprocs=nprocs, progress=False).collect(shape=2)
+			self.assertEqual(output.shape, (3,3,2))
+			self.assertEqual(output[1,2].tolist(), [1.,3.])
+
+	def test_collect_masked(self):
+		masks = [lambda indices, ranges=None, params={}: indices[0] != 0]
+		output = RangesIterator(self.p, self.ranges, params=self.params, masks=masks, function=self.function, nprocs=1, progress=False).collect(shape=2)
+		self.assertTrue(np.all(np.isnan(output[0])))
+		self.assertFalse(np.any(np.isnan(output[1:])))
+
+	def test_checkpoint(self):
+		path = tempfile.mkdtemp()
+		try:
+			masks = [lambda indices, ranges=None, params={}: indices[0] != 0]
+			results = dict(RangesIterator(self.p, self.ranges, params=self.params, masks=masks, function=self.function, nprocs=1, progress=False, checkpoint=path))
+			self.assertEqual(len(results), 6)
+
+			iterator = RangesIterator(self.p, self.ranges, params=self.params, function=self.function, nprocs=1, progress=False, checkpoint=path)
+			self.assertEqual(sorted(dict(iterator).keys()), [(0,0),(0,1),(0,2)])
+			self.assertEqual(len(list(iterator)), 0)
+			self.assertEqual(len(iterator.checkpoint), 9)
+			self.assertFalse(np.any(np.isnan(iterator.collect(shape=2))))
+
+			# Resuming a different sweep is refused
+			for ranges, params in (([{'x':(0,1,4)},{'y':(0,2,3)}], self.params), ([{'x':(0,1,3)}], self.params), (self.ranges, {'z':4})):
+				iterator = RangesIterator(self.p, ranges, params=params, function=self.function, nprocs=1, progress=False, checkpoint=path)
+				self.assertRaises(ValueError, list, iterator)
+		finally:
+			shutil.rmtree(path)
+
+	def test_cache(self):
+		path = tempfile.mkdtemp()
+		try:
+			# The calls are recorded outside of the function, since the contents of its
+			# closure are part of its cache key.
+			calls = CACHE_CALLS
+			del calls[:]
+			iterator = RangesIterator(self.p, self.ranges, function=cached_function, nprocs=1, progress=False, cache=path)
+			first = dict(iterator)
+			self.assertEqual(len(calls), 9)
+			self.assertEqual(dict(iterator), first)
+			self.assertEqual(len(calls), 9)
+
+			iterator.ranges = [{'x':(0,1,5)},{'y':(0,2,3)}]
+			self.assertEqual(len(dict(iterator)), 15)
+			self.assertEqual(len(calls), 15)
+		finally:
+			shutil.rmtree(path)
+
+	def test_cache_function_state(self):
+		cache = ResultCache(tempfile.mkdtemp())
+		try:
+			def make(offset):
+				def function(params):
+					return params['x'] + offset
+				return function
+			class Shifted(object):
+				def __init__(self, offset):
+					self.offset = offset
+				def __call__(self, params):
+					return params['x'] + self.offset
+			def scaled(params, factor=1):
+				return params['x'] * factor
+			def scaled_twice(params, factor=2):
+				return params['x'] * factor
+			scaled_twice.__name__ = 'scaled'
+			params = {'x': 1.}
+			self.assertEqual(cache.key(make(1), params), cache.key(make(1), params))
+			self.assertNotEqual(cache.key(make(1), params), cache.key(make(2), params))
+			self.assertNotEqual(cache.key(Shifted(1), params), cache.key(Shifted(2), params))
+			self.assertNotEqual(cache.key(Shifted(1).__call__, params), cache.key(Shifted(2).__call__, params))
+			self.assertNotEqual(cache.key(scaled, params), cache.key(scaled_twice, params))
+
+			lock = threading.Lock()
+			def locked(params):
+				with lock:
+					return params['x']
+			self.assertRaises(ValueError, cache.key, locked, params)
+			locked.__version__ = 1
+			cache.key(locked, params)
+
+			# Storing a result again replaces it, rather than adding to the size of the cache
+			cache.set('a' * 40, np.zeros(100))
+			size = cache.size
+			cache.set('a' * 40, np.zeros(100))
+			self.assertEqual(cache.size, size)
+		finally:
+			shutil.rmtree(cache.path)
+
+	def test_refine(self):
+		iterator = RangesIterator(self.p, {'x':(0,1,11)}, function=lambda params: float(params['x'] > 0.33), nprocs=1, progress=False)
+		ranges_eval, results = iterator.refine(tolerance=0.5, levels=4)
+		self.assertEqual(ranges_eval.shape, (161,))
+		self.assertEqual(len(results), 15)
+		for index, result in results.items():
+			self.assertEqual(result, float(ranges_eval[index]['x'] > 0.33))
+
+	def test_executors(self):
+		for executor in ('serial', 'thread', 'process', 'async'):
+			results = dict(RangesIterator(self.p, self.ranges, params=self.params, function=self.function, nprocs=2, progress=False, executor=executor))
+			self.assertEqual(len(results), 9)
+			self.assertEqual(results[(2,1)].tolist(), [1.,3.])
+
+			output = RangesIterator(self.p, self.ranges, params=self.params, function=self.function, nprocs=2, progress=False, executor=executor).collect(shape=2)
+			self.assertEqual(output[1,2].tolist(), [1.,3.])
+
+	def test_executor_context(self):
+		submitted = []
+		class RecordingExecutor(SerialExecutor):
+			def submit(self, indices, args=(), kwargs={}):
+				submitted.append(kwargs)
+				SerialExecutor.submit(self, indices, args, kwargs)
+		results = dict(RangesIterator(self.p, self.ranges, params=self.params, function=self.function, progress=False, executor=RecordingExecutor()))
+		self.assertEqual(results[(2,1)].tolist(), [1.,3.])
+		self.assertEqual(sorted(submitted[0]['params']), ['x', 'y'])
+
+		def function(scale, params):
+			return (os.getpid(), scale * params['x'] + params['z'])
+		with ProcessExecutor(nprocs=1) as executor:
+			executor.function = function
+			rounds = []
+			for z in (3, 3, 4):
+				executor.context = ((), {'params': {'z': z}})
+				rounds.append(executor.map([((0,), (2,), {'params': {'x': 1}})])[0][1])
+		self.assertEqual(rounds[0], rounds[1])
+		self.assertEqual(rounds[2][1], 6)
+		self.assertNotEqual(rounds[2][0], rounds[0][0])
+
+		# Reusing an executor for multiple sweeps does not restart its workers
+		with ProcessExecutor(nprocs=1) as executor:
+			iterator = RangesIterator(self.p, self.ranges, function=lambda params: os.getpid(), progress=False, executor=executor)
+			pids = [set(dict(iterator).values()) for _ in range(2)]
+		self.assertEqual(pids[0], pids[1])
+
+	def test_batch(self):
+		def function(params):
+			return np.array([params['x'] + params['y'], params['x'] * params['y']]).T
+		expected = dict(RangesIterator(self.p, self.ranges, function=function, progress=False))
+		calls = []
+		def batched(params):
+			calls.append(len(params['x']))
+			return function(params)
+		results = dict(RangesIterator(self.p, self.ranges, function=batched, progress=False, batch=4, executor=SerialExecutor()))
+		self.assertEqual(sorted(results), sorted(expected))
+		for index in expected:
+			self.assertEqual(results[index].tolist(), expected[index].tolist())
+		self.assertTrue(max(calls) <= 4 and sum(calls) == len(expected))
+
+		with ThreadExecutor(nthreads=2) as executor:
+			output = RangesIterator(self.p, self.ranges, function=function, progress=False, batch=3, executor=executor).collect(shape=(2,))
+		for index in expected:
+			self.assertEqual(output[index].tolist(), expected[index].tolist())
+
+		self.assertRaises(ValueError, dict, RangesIterator(self.p, self.ranges, function=lambda params: [0], progress=False, batch=2))
+		self.assertRaises(ValueError, RangesIterator, self.p, self.ranges, batch=0)
+
+	def test_executor_errors(self):
+		def function(params):
+			raise RuntimeError("Failed")
+		for executor in (SerialExecutor(), ThreadExecutor(nthreads=2), ProcessExecutor(nprocs=2)):
+			with executor:
+				self.assertRaises(errors.TaskExecutionError, dict, RangesIterator(self.p, self.ranges, function=function, progress=False, executor=executor))
+
+	def test_executor_stragglers(self):
+		def function(params):
+			if params['x'] == 0.5 and params['y'] == 1:
+				raise RuntimeError("Failed")
+			if params['x'] == 1 and params['y'] == 2:
+				time.sleep(30)
+			return params['x'] + params['y']
+		for spawnonce in (True, False):
+			iterator = RangesIterator(self.p, self.ranges, function=function, progress=False, executor=AsyncExecutor(nprocs=2, spawnonce=spawnonce, timeout=0.5, retries=1))
+			results = {}
+			with self.assertRaises(errors.TaskExecutionError) as context:
+				for indices, result in iterator:
+					results[indices] = result
+			failures = context.exception.failures
+			self.assertEqual(sorted(failures), [(1,1), (2,2)])
+			self.assertTrue('RuntimeError' in failures[(1,1)])
+			self.assertTrue('timed out' in failures[(2,2)])
+			self.assertEqual(len(results), 7)
+
+		marker = tempfile.mktemp()
+		def straggler(params):
+			if params['x'] == 1 and params['y'] == 2 and not os.path.exists(marker):
+				open(marker, 'w').close()
+				time.sleep(30)
+			time.sleep(0.05)
+			return params['x'] + params['y']
+		try:
+			start = time.time()
+			results = dict(RangesIterator(self.p, self.ranges, function=straggler, progress=False, executor=AsyncExecutor(nprocs=2, speculative=2)))
+			self.assertEqual(results[(2,2)], 3)
+			self.assertTrue(time.time() - start < 10)
+		finally:
+			os.remove(marker)
+
+	def test_executor_speculative_tie(self):
+		# Hold back each poll until both copies of a speculatively re-executed task have
+		# completed, so that their outcomes are received together.
+		class TiedMap(AsyncParallelMap):
+			def _AsyncParallelMap__receive(self):
+				if any(len(workers) > 1 for workers in self._AsyncParallelMap__running.values()):
+					end = time.time() + 10
+					while time.time() < end and not all(worker.conn.poll() for worker in self._AsyncParallelMap__busy()):
+						time.sleep(0.01)
+				return AsyncParallelMap._AsyncParallelMap__receive(self)
+
+		def function(x):
+			if x == 1:
+				time.sleep(max(0, deadline - time.time()))
+			return x
+		for spawnonce in (True, False):
+			deadline = time.time() + 1.
+			pmap = TiedMap(function, nprocs=2, spawnonce=spawnonce, speculative=1)
+			self.assertEqual(sorted(pmap.map([(0, (0,), {}), (1, (1,), {})])), [(0, 0), (1, 1)])
+
+	def test_cost_model(self):
+		order = []
+		def function(params):
+			order.append(params['x'])
+			time.sleep(0.002 + 0.02 * params['x'])
+			return params['x']
+		iterator = RangesIterator(self.p, self.ranges, function=function, progress=False, cost_model=True, executor=SerialExecutor())
+		estimate = iterator.estimate(samples=4, workers=2, seed=1)
+		self.assertEqual((estimate['tasks'], estimate['samples'], estimate['workers']), (9, 4, 2))
+		self.assertTrue(0 < estimate['wall_time'] < estimate['cost'])
+		self.assertEqual(iterator.cost_model.observations, 4)
+
+		del order[:]
+		self.assertEqual(len(dict(iterator)), 9)
+		self.assertEqual(order, sorted(order, reverse=True))
+		self.assertEqual(iterator.cost_model.observations, 13)
+
+		self.assertEqual(cost_chunks([10, 1, 1, 1, 1, 1, 1], 4), [[0], [1, 2, 3, 4], [5, 6]])
+		self.assertEqual(lpt_makespan([3, 3, 2, 2, 2], 2), 7)
+
+	def test_thread_concurrency(self):
+		class Solver(object):
+			def __init__(self):
+				self.lock = threading.Lock()
+				self.active = self.peak = 0
+			def __call__(self, params):
+				with self.lock:
+					self.active += 1
+					self.peak = max(self.peak, self.active)
+				time.sleep(0.02)
+				with self.lock:
+					self.active -= 1
+				return (params['x'], params['y'])
+		solver = Solver()
+		iterator = RangesIterator(self.p, self.ranges, function=solver, executor='thread', nprocs=3, progress=False)
+		results = dict(iterator)
+		self.assertEqual(sorted(results), [(i, j) for i in range(3) for j in range(3)])
+		for indices, result in results.items():  # Results are yielded with the indices of their own configuration
+			self.assertEqual(result, (iterator.ranges_eval[indices]['x'], iterator.ranges_eval[indices]['y']))
+		self.assertTrue(1 < solver.peak <= 3)
+
+	def test_telemetry(self):
+		histogram = HistogramSink()
+		summaries = []
+		telemetry = Telemetry(sinks=[histogram, CallbackSink(summaries.append)], interval=0)
+		for executor in ('serial', 'thread', 'process'):
+			del summaries[:]
+			RangesIterator(self.p, self.ranges, params=self.params, function=self.function, nprocs=2, progress=False, executor=executor, telemetry=telemetry).collect(shape=2)
+			self.assertEqual(len(summaries), 9)
+			self.assertEqual(summaries[-1]['completed'], 9)
+			self.assertEqual(summaries[-1]['eta'], 0)
+			self.assertTrue(summaries[-1]['maxrss'] > 0)
+			self.assertEqual(sum(worker['tasks'] for worker in telemetry.workers.values()), 9)
+		self.assertEqual(histogram.durations.sum(), 27)
+		self.assertTrue(histogram.percentile(50) > 0)
+
+	def test_cluster_executor(self):
+		with ClusterExecutor(workers=2) as executor:
+			iterator = RangesIterator(self.p, self.ranges, params=self.params, function=cluster_function, progress=False, executor=executor)
+			results = dict(iterator)
+			self.assertEqual(len(results), 9)
+			self.assertEqual(results[(2,2)], 3)
+			self.assertEqual(iterator.collect()[1,2], 2.5)
+			self.assertEqual(len(executor.authkey), 32)
+		self.assertNotEqual(ClusterExecutor().authkey, ClusterExecutor().authkey)
+
+		# Tasks are abandoned if no workers connect
+		with ClusterExecutor(connect_timeout=0.2) as executor:
+			start = time.time()
+			self.assertRaises(errors.TaskExecutionError, executor.map, [((0,), (), {'params': {}})])
+			self.assertTrue(time.time() - start < 5)
+			self.assertEqual(list(executor.iterate()), [])
+
+
+CACHE_CALLS = []
+def cached_function(params):
+	CACHE_CALLS.append(params)
+	return params['x'] + params['y']
+
+def cluster_function(params):
+	return params['x'] + params['y'] + params['z'] - 3
+
+
 if __name__ == '__main__':
 
 	print "\n\n"
@@ -300,58 +910,5 @@ if __name__ == '__main__':
 	print "Performance Tests"
 	print "-----------------"
 	print
-	x = 1e23
-	p=Parameters()
-	p(x=x,y=2,z=3,a=1,b=2,c=3,d=2)
-	q = {'x':x}
-	#p['x'] = (0,1e24)
-
-	def timer(name,baseline,*tests):
-		print " - Speed tests for %s" % name
-		time_base = timeit.timeit("%s()"%baseline.__name__,setup="from __main__ import %s"%baseline.__name__,number=100000)
-		for test in tests:
-			time = timeit.timeit("%s()"%test.__name__,setup="from __main__ import %s"%test.__name__,number=100000)
-			print "\t%s: \t%.2fx slower than baseline" % (test.__name__,time/time_base)
-
-	def test_baseline():
-		return q['x']
-
-	def test_extract():
-		return p('x')
-
-	def test_attr():
-		return p.x
-
-	def test_override():
-		return p('x',x=1)
-
-	def test_overrides():
-		return p('x',x=1,y=2,z=3,a=1,b=2,c=3,d=2)
-
-	timer("Parameter Extraction", test_baseline, test_extract, test_attr, test_override, test_overrides)
-
-	def square(x):
-		return x**2
-	p.y = lambda x: x**2
-	p.y2 = 'x^2'
-	o = p.optimise('x^2')
-	def test_baseline2():
-		return square(q['x'])
-	def test_arg_fn():
-		return p(o)
-	def test_param_fn():
-		return p('y')
-	def test_param_fn_sympy():
-		return p('y2')
-	def test_param_fn_override():
-		return p('y',x=10)
-
-	timer("Functional Parameters", test_baseline2, test_arg_fn, test_param_fn, test_param_fn_sympy, test_param_fn_override)
-
-	p.bounds(x = (0,10))
-	def test_bounds_fn():
-		return p(x=5)
-	def test_bounds():
-		return p('y',x=5)
-
-	timer("Bounds", test_baseline2, test_bounds_fn, test_bounds)
+	import benchmarks
+	benchmarks.main([])